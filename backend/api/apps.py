@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = "api"
+
+    def ready(self) -> None:
+        # Invalidate cached catalog responses on catalog writes.
+        from api import signals  # noqa: F401
@@ -0,0 +1,123 @@
+"""Async variants of the I/O-bound read endpoints.
+
+Under ASGI (``manage.py serve_asgi`` or any ASGI server pointed at
+``api.asgi:application``) these views run on the event loop and query through
+Django's async ORM, so a worker keeps serving other requests while one waits
+on the database or on a slow client. DRF views are synchronous and run in a
+thread per request under ASGI, which is why these are plain Django views that
+return the same payloads as their DRF counterparts:
+
+* ``/api/async/healthz/`` – ``api.views.healthz``
+* ``/api/async/courses/`` – the page-number listing of ``CourseViewSet``
+* ``/api/async/profile/me/`` – ``users.views.ProfileMeView``
+
+They also work under WSGI, where Django runs them in a one-off event loop.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.compiled import compile_serializer
+from api.renderers import dumps
+from courses.serializers import CourseSerializer
+from courses.views import CourseViewSet, filter_courses
+from users.serializers import UserSerializer
+
+
+def _error(detail, status: int) -> JsonResponse:
+    # simplejwt errors already carry a DRF-style body.
+    return JsonResponse(detail if isinstance(detail, dict) else {"detail": detail}, status=status)
+
+
+def _page_link(request, page: int) -> str:
+    url = request.build_absolute_uri()
+    if page == 1:
+        return remove_query_param(url, "page")
+    return replace_query_param(url, "page", page)
+
+
+def _positive_int(value, default: int) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+async def authenticate(request):
+    """Return the active user of a valid ``Authorization: Bearer`` token, or ``None``."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    token = authentication.get_validated_token(raw_token)
+    user_id = token.get(jwt_settings.USER_ID_CLAIM)
+    if user_id is None:
+        raise AuthenticationFailed("Token contained no recognizable user identification")
+    users = get_user_model().objects.select_related("profile").prefetch_related("role_assignments")
+    try:
+        user = await users.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except get_user_model().DoesNotExist:
+        raise AuthenticationFailed("User not found")
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive")
+    return user
+
+
+@require_GET
+async def healthz(request):
+    return JsonResponse({"ok": True, "service": "dunetube-api"})
+
+
+@require_GET
+async def course_list(request):
+    """Page-number course listing with the catalog filters of ``CourseViewSet``."""
+    params = request.GET
+    page_size = drf_settings.PAGE_SIZE
+    page = _positive_int(params.get("page"), 1)
+
+    queryset = filter_courses(CourseViewSet.queryset.all(), params)
+    count = await queryset.acount()
+    pages = max((count + page_size - 1) // page_size, 1)
+    if page > pages:
+        return _error("Invalid page.", 404)
+
+    offset = (page - 1) * page_size
+    compiled = compile_serializer(CourseSerializer) if settings.COMPILED_SERIALIZERS else None
+    if compiled is not None:
+        rows = [row async for row in queryset.values(*compiled.columns)[offset : offset + page_size]]
+        results = compiled(rows)
+    else:
+        courses = [course async for course in queryset[offset : offset + page_size]]
+        results = CourseSerializer(courses, many=True).data
+    body = {
+        "count": count,
+        "next": _page_link(request, page + 1) if page < pages else None,
+        "previous": _page_link(request, page - 1) if page > 1 else None,
+        "results": results,
+    }
+    return HttpResponse(dumps(body), content_type="application/json")
+
+
+@require_GET
+async def profile_me(request):
+    try:
+        user = await authenticate(request)
+    except AuthenticationFailed as exc:
+        return _error(exc.detail, 401)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+    return JsonResponse(UserSerializer(user).data)
+
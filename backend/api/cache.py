@@ -0,0 +1,165 @@
+"""Versioned response cache for anonymous catalog reads.
+
+Cached responses are keyed on a *generation* counter plus the request path,
+normalised query parameters and negotiated media type. Any catalog write bumps
+the generation (see ``api.signals``), which orphans every older entry at once
+instead of tracking which pages a change affects; stale entries simply age out
+of the cache backend. Per-course responses (the course bundle) depend on a
+per-course generation instead, so a review on one course leaves the cached
+bundles of every other course in place.
+
+Responses carry an ``ETag`` hashed from the body and stored with it, so
+browsers and CDNs can revalidate with ``If-None-Match`` and get a ``304 Not
+Modified`` without the view running at all. The tag describes the bytes
+served, not the key, so it stays truthful even if two processes disagree
+about a generation (as they do when each has its own ``locmem`` cache).
+
+The cache alias and entry timeout come from ``settings.RESPONSE_CACHE``; the
+backing store is whatever ``CACHES`` configures (local memory, file based or a
+Redis-compatible server).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+
+CATALOG = "catalog"
+# Publisher and teacher writes, which show up inside every course's bundle.
+PUBLISHING = "publishing"
+
+# Cache version of response entries; bump it when their layout changes.
+ENTRY_VERSION = 1
+
+DEFAULT_SETTINGS = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "CACHE_CONTROL": "public, max-age=0, must-revalidate",
+}
+
+
+def cache_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "RESPONSE_CACHE", {})}
+
+
+def response_cache():
+    return caches[cache_settings()["ALIAS"]]
+
+
+def course_namespace(course_id) -> str:
+    """Generation bumped by writes to one course, its lessons or its reviews."""
+    return f"course:{course_id}"
+
+
+def _generation_key(namespace: str) -> str:
+    return f"generation:{namespace}"
+
+
+def _initial_generation() -> int:
+    # A counter restarted after eviction must not reuse a number that keys
+    # entries still inside their TIMEOUT, so it starts from the clock.
+    return time.time_ns()
+
+
+def get_generation(namespace: str = CATALOG) -> int:
+    cache = response_cache()
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        initial = _initial_generation()
+        cache.add(key, initial, timeout=None)
+        generation = cache.get(key, initial)
+    return generation
+
+
+def bump_generation(namespace: str = CATALOG) -> None:
+    cache = response_cache()
+    key = _generation_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Never read yet or evicted: restart the counter.
+        cache.add(key, _initial_generation(), timeout=None)
+
+
+def response_key(request, namespaces=(CATALOG,)) -> str:
+    """Build the cache key of ``request`` for the current generations."""
+    params = sorted((name, sorted(request.query_params.getlist(name))) for name in request.query_params)
+    generations = ".".join(f"{namespace}{get_generation(namespace)}" for namespace in namespaces)
+    # Bodies embed absolute pagination links, so the host is part of the key.
+    raw = f"{generations}|{request.get_host()}{request.path}|{params}|{request.accepted_media_type}"
+    return f"response:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def body_etag(content: bytes) -> str:
+    return quote_etag(hashlib.sha1(content).hexdigest()[:24])
+
+
+def _etag_matches(request, etag: str) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in if_none_match.split(","))
+
+
+def _decorate(response, etag: str):
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_settings()["CACHE_CONTROL"]
+    # Authenticated requests bypass the cache; keep shared caches from mixing them up.
+    patch_vary_headers(response, ["Accept", "Authorization"])
+    return response
+
+
+class CachedResponseMixin:
+    """Serve ``list``/``retrieve`` for anonymous visitors from the response cache.
+
+    ``cache_namespaces`` lists the generation counters the view depends on.
+    """
+
+    cache_actions = ("list", "retrieve")
+    cache_namespaces = (CATALOG,)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def is_cacheable(self, request) -> bool:
+        return (
+            self.action in self.cache_actions
+            and request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        key = response_key(request, self.get_cache_namespaces())
+        cache = response_cache()
+        cached = cache.get(key, version=ENTRY_VERSION)
+        if cached is not None:
+            content, content_type, etag = cached
+            if _etag_matches(request, etag):
+                return _decorate(HttpResponseNotModified(), etag)
+            return _decorate(HttpResponse(content, content_type=content_type), etag)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = cache_settings()["TIMEOUT"]
+
+            def store(rendered):
+                etag = body_etag(rendered.content)
+                cache.set(key, (rendered.content, rendered["Content-Type"], etag), timeout, version=ENTRY_VERSION)
+                _decorate(rendered, etag)
+
+            response.add_post_render_callback(store)
+        return response
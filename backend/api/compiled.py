@@ -0,0 +1,222 @@
+"""Compiled read serializers for hot list endpoints.
+
+A DRF ``ModelSerializer`` walks its field objects for every row: attribute
+lookup, ``get_attribute``, ``to_representation`` and an ``OrderedDict`` per
+object, including the nested publisher/teacher serializers. For list
+responses ``compile_serializer`` turns a serializer (as configured for the
+request, so ``?fields=``/``?expand=`` still apply) into one generated
+function that builds the same output dict straight from a ``values()`` row,
+with related columns joined in (``publisher__slug`` ...). Models are never
+instantiated.
+
+Only fields whose representation can be reproduced exactly are compiled:
+model columns (strings, numbers, booleans, JSON, ISO dates and datetimes,
+decimals as strings), primary-key relations and nested model serializers made
+of those. Anything else, such as a ``SerializerMethodField`` or a custom
+``to_representation``, makes ``compile_serializer`` return ``None``, and the
+view falls back to the regular serializer. ``tests/test_compiled_serializers.py``
+holds the contract against the DRF output.
+"""
+
+from __future__ import annotations
+
+import decimal
+from functools import lru_cache
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# Serializer fields whose representation of a database value is the value itself.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class Unsupported(Exception):
+    """The serializer has a field ``compile_serializer`` cannot reproduce."""
+
+
+class CompiledSerializer:
+    """Builds serializer output from ``values(*columns)`` rows."""
+
+    def __init__(self, columns: list[str], build: Callable[[dict, dict], dict]):
+        self.columns = columns
+        self.build = build
+
+    def __call__(self, rows) -> list[dict]:
+        build = self.build
+        env = {"tz": timezone.get_current_timezone() if settings.USE_TZ else None}
+        return [build(row, env) for row in rows]
+
+
+def _decimal(value, exponent: decimal.Decimal, context: decimal.Context) -> str | None:
+    if value is None:
+        return None
+    if not isinstance(value, decimal.Decimal):
+        value = decimal.Decimal(str(value).strip())
+    return f"{value.quantize(exponent, context=context):f}"
+
+
+def _datetime(value, env: dict, field) -> str | None:
+    if not value:
+        return None
+    tz = env["tz"]
+    if tz is not None and value.tzinfo is not None:
+        value = value.astimezone(tz)
+    else:
+        value = field.enforce_timezone(value)
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _date(value) -> str | None:
+    if not value:
+        return None
+    return value.isoformat()
+
+
+class _Compiler:
+    def __init__(self):
+        self.columns: list[str] = []
+        self.helpers: dict[str, object] = {"_decimal": _decimal, "_datetime": _datetime, "_date": _date}
+
+    def helper(self, value) -> str:
+        name = f"_h{len(self.helpers)}"
+        self.helpers[name] = value
+        return name
+
+    def column(self, path: str) -> str:
+        if path not in self.columns:
+            self.columns.append(path)
+        return f"row[{path!r}]"
+
+    def serializer(self, serializer, model, prefix: str = "") -> str:
+        if not isinstance(serializer, serializers.ModelSerializer) or serializer.Meta.model is not model:
+            raise Unsupported(serializer)
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise Unsupported(f"{type(serializer).__name__}.to_representation")
+        items = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            items.append(f"{name!r}: {self.field(field, model, prefix)}")
+        return "{" + ", ".join(items) + "}"
+
+    def field(self, field, model, prefix: str) -> str:
+        if "." in field.source or field.source == "*":
+            raise Unsupported(field.source)
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist as exc:
+            raise Unsupported(field.source) from exc
+        path = f"{prefix}{model_field.name}"
+
+        if isinstance(field, serializers.ModelSerializer):
+            if not model_field.is_relation or model_field.many_to_many or model_field.one_to_many:
+                raise Unsupported(path)
+            related = model_field.related_model
+            nested = self.serializer(field, related, prefix=f"{path}__")
+            if model_field.null:
+                return f"({nested} if {self.column(f'{path}__{related._meta.pk.name}')} is not None else None)"
+            return nested
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                raise Unsupported(path)
+            return self.column(path)
+        if model_field.is_relation:
+            raise Unsupported(path)
+
+        value = self.column(path)
+        if isinstance(field, serializers.DecimalField):
+            coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+                raise Unsupported(path)
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            if field.rounding is not None:
+                context.rounding = field.rounding
+            exponent = decimal.Decimal(".1") ** field.decimal_places
+            return f"_decimal({value}, {self.helper(exponent)}, {self.helper(context)})"
+        if isinstance(field, serializers.DateTimeField):
+            if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+                raise Unsupported(path)
+            return f"_datetime({value}, env, {self.helper(field)})"
+        if isinstance(field, serializers.DateField):
+            if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+                raise Unsupported(path)
+            return f"_date({value})"
+        if isinstance(field, serializers.JSONField):
+            if field.binary:
+                raise Unsupported(path)
+            return value
+        if isinstance(field, serializers.FloatField):
+            return f"(None if {value} is None else float({value}))"
+        if type(field).to_representation in {kind.to_representation for kind in PASSTHROUGH_FIELDS}:
+            return value
+        raise Unsupported(path)
+
+
+@lru_cache(maxsize=256)
+def _compile(serializer_class, fields: tuple[str, ...] | None, expand: tuple[str, ...] | None):
+    kwargs = {}
+    if fields is not None:
+        kwargs = {"fields": list(fields), "expand": list(expand or ())}
+    serializer = serializer_class(**kwargs)
+    compiler = _Compiler()
+    try:
+        body = compiler.serializer(serializer, serializer.Meta.model)
+    except Unsupported:
+        return None
+    namespace = dict(compiler.helpers)
+    exec(f"def build(row, env):\n    return {body}\n", namespace)
+    return CompiledSerializer(compiler.columns, namespace["build"])
+
+
+def compile_serializer(serializer_class, fields=None, expand=None) -> CompiledSerializer | None:
+    """Compile ``serializer_class`` (with the sparse selection, if any), or ``None`` if unsupported."""
+    return _compile(
+        serializer_class,
+        tuple(fields) if fields is not None else None,
+        tuple(expand) if expand is not None else None,
+    )
+
+
+class CompiledListMixin:
+    """Serve ``list`` from a compiled serializer over ``values()`` rows.
+
+    Falls back to the regular serializer when it cannot be compiled or when
+    ``settings.COMPILED_SERIALIZERS`` is off.
+    """
+
+    def get_compiled_serializer(self) -> CompiledSerializer | None:
+        if not getattr(settings, "COMPILED_SERIALIZERS", True) or self.request.method not in SAFE_METHODS:
+            return None
+        fields, expand = self.sparse_selection() if hasattr(self, "sparse_selection") else (None, None)
+        return compile_serializer(self.get_serializer_class(), fields, expand)
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Paginators read the ordering values (and "pk") off the rows.
+        ordering = [term.lstrip("-") for term in queryset.query.order_by or queryset.model._meta.ordering]
+        columns = list(dict.fromkeys([*compiled.columns, "pk", *(name for name in ordering if isinstance(name, str))]))
+        rows = queryset.values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled(page))
+        return Response(compiled(rows))
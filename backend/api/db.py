@@ -0,0 +1,162 @@
+"""Read-replica routing for catalog reads.
+
+Catalog reads (``CourseViewSet``, ``LessonViewSet`` and ``CourseReviewViewSet``
+GETs) can be served by read replicas while every write, and every other read,
+stays on ``default``. Views opt in with ``ReplicaReadMixin``, which routes the
+queries of safe requests through ``ReplicaRouter`` to a healthy replica.
+
+Configured through ``settings.REPLICA_ROUTING``::
+
+    REPLICA_ROUTING = {
+        "ALIASES": ["replica_0"],
+        "MAX_LAG": 5,
+        "LAG_CHECK_INTERVAL": 10,
+        "PIN_SECONDS": 5,
+    }
+
+Replicas further behind the primary than ``MAX_LAG`` seconds (measured at
+most every ``LAG_CHECK_INTERVAL`` seconds per process) or failing the check
+are skipped. For ``PIN_SECONDS`` after a catalog write (see ``api.signals``)
+all catalog reads go to the primary so clients read their own writes and the
+response cache is not refilled with pre-write data.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "ALIASES": [],
+    "MAX_LAG": 5,
+    "LAG_CHECK_INTERVAL": 10,
+    "PIN_SECONDS": 5,
+    "CACHE_ALIAS": "default",
+}
+PIN_KEY = "replica:primary-until"
+
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+def replica_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "REPLICA_ROUTING", {})}
+
+
+def replica_lag(alias: str) -> float:
+    """Seconds ``alias`` is behind its primary; 0 for non-PostgreSQL or caught-up replicas."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaHealth:
+    """Per-process view of which replicas are within the lag tolerance."""
+
+    def __init__(self):
+        self._checked: dict[str, tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, alias: str) -> bool:
+        config = replica_settings()
+        with self._lock:
+            checked_at, healthy = self._checked.get(alias, (None, False))
+        if checked_at is not None and time.monotonic() - checked_at < config["LAG_CHECK_INTERVAL"]:
+            return healthy
+        try:
+            lag = replica_lag(alias)
+            healthy = lag <= config["MAX_LAG"]
+            if not healthy:
+                logger.warning("Replica %s is %.1fs behind, reading from the primary", alias, lag)
+        except DatabaseError:
+            logger.exception("Replica %s failed its lag check", alias)
+            healthy = False
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), healthy)
+        return healthy
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checked.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+def _pin_cache():
+    return caches[replica_settings()["CACHE_ALIAS"]]
+
+
+def pin_primary() -> None:
+    """Send catalog reads to the primary for ``PIN_SECONDS``."""
+    config = replica_settings()
+    seconds = config["PIN_SECONDS"]
+    if config["ALIASES"] and seconds:
+        _pin_cache().set(PIN_KEY, time.time() + seconds, seconds)
+
+
+def primary_pinned() -> bool:
+    return (_pin_cache().get(PIN_KEY) or 0) > time.time()
+
+
+def choose_replica() -> str | None:
+    """Return a random healthy replica alias, or ``None`` to read from the primary."""
+    aliases = replica_settings()["ALIASES"]
+    if not aliases or primary_pinned():
+        return None
+    healthy = [alias for alias in aliases if replica_health.is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+@contextmanager
+def read_from(alias: str | None):
+    """Route reads in this context (thread or task) to ``alias``."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Reads go to the alias chosen by ``read_from``; writes and migrations to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_settings()["ALIASES"]:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Serve the queries of safe (GET/HEAD/OPTIONS) requests from a read replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        alias = choose_replica() if request.method in SAFE_METHODS else None
+        with read_from(alias):
+            return super().dispatch(request, *args, **kwargs)
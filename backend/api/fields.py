@@ -0,0 +1,127 @@
+"""Sparse fieldsets for catalog reads: ``?fields=`` and ``?expand=``.
+
+``?fields=id,title,price_amount`` limits each object to the named fields.
+Nested relations (``Meta.expandable_fields`` of the serializer) render as
+their primary key in a sparse response unless they are also named in
+``?expand=``, in which case they appear as nested objects. Without
+``?fields=`` the full representation is returned, as before.
+
+The selection is pushed down to SQL as well. The queryset loads only the
+selected columns with ``only()``, plus the ordering columns the keyset
+cursors read. Related tables are joined only for expanded relations.
+"""
+
+from __future__ import annotations
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def _names(raw: str | None) -> list[str] | None:
+    names = [name.strip() for name in (raw or "").split(",") if name.strip()]
+    return names or None
+
+
+class SparseFieldsSerializerMixin:
+    """Serializer accepting ``fields`` and ``expand`` keyword arguments."""
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.expanded = set(expand or ())
+        if fields is None:
+            return
+        expandable = set(getattr(self.Meta, "expandable_fields", ()))
+        unknown = (set(fields) | self.expanded) - set(self.fields)
+        unknown |= self.expanded - expandable
+        if unknown:
+            raise ValidationError(
+                {FIELDS_PARAM: [f"Unknown or non-expandable field: {name}" for name in sorted(unknown)]}
+            )
+        for name in list(self.fields):
+            if name not in fields and name not in self.expanded:
+                self.fields.pop(name)
+            elif name in expandable and name not in self.expanded:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    def get_queryset_selection(self, model) -> tuple[list[str], list[str]] | None:
+        """``(only, select_related)`` arguments covering the selected fields.
+
+        ``None`` means a field is not a plain model column (a method field or
+        a dotted source), so the queryset is left alone.
+        """
+        if self.sparse_fields is None:
+            return None
+        only: list[str] = [model._meta.pk.name]
+        related: list[str] = []
+        for name, field in self.fields.items():
+            try:
+                model_field = model._meta.get_field(field.source)
+            except (FieldDoesNotExist, AttributeError):
+                return None
+            if name not in self.expanded:
+                only.append(model_field.name)
+                continue
+            related_model = model_field.related_model
+            related.append(model_field.name)
+            only.append(f"{model_field.name}__{related_model._meta.pk.name}")
+            for nested_field in field.fields.values():
+                try:
+                    related_model._meta.get_field(nested_field.source)
+                except (FieldDoesNotExist, AttributeError):
+                    return None
+                only.append(f"{model_field.name}__{nested_field.source}")
+        return only, related
+
+
+class SparseFieldsMixin:
+    """View mixin applying ``?fields=``/``?expand=`` to the serializer and the queryset.
+
+    The serializer must use ``SparseFieldsSerializerMixin``. Only safe
+    requests are affected; writes always use the full representation.
+    """
+
+    def sparse_selection(self) -> tuple[list[str] | None, list[str] | None]:
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None, None
+        return _names(request.query_params.get(FIELDS_PARAM)), _names(request.query_params.get(EXPAND_PARAM))
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.sparse_selection()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.sparse_selection()
+        if fields is None:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        selection = serializer_class(fields=fields, expand=expand).get_queryset_selection(queryset.model)
+        if selection is None:
+            return queryset
+        only, related = selection
+        # Keyset cursors read the ordering columns off the last row.
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        for term in ordering:
+            if isinstance(term, str):
+                name = term.lstrip("-")
+                if name in ("pk", "?"):
+                    continue
+                try:
+                    queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                only.append(name)
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def wsgi_command(port: int, workers: int) -> list[str]:
+    # Sync DRF views behind pre-forked sync workers: one request per worker at a time.
+    return [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "api.wsgi:application",
+        f"--bind=127.0.0.1:{port}",
+        f"--workers={workers}",
+        "--worker-class=sync",
+        "--log-level=warning",
+    ]
+
+
+def asgi_command(port: int, workers: int) -> list[str]:
+    # Async views on uvicorn's event loop.
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "api.asgi:application",
+        "--host=127.0.0.1",
+        f"--port={port}",
+        f"--workers={workers}",
+        "--lifespan=off",
+        "--log-level=warning",
+    ]
+
+
+SERVERS = {"wsgi": wsgi_command, "asgi": asgi_command}
+PATHS = {"wsgi": "/api/courses/?page=1", "asgi": "/api/async/courses/?page=1"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        return
+    raise CommandError(f"server on port {port} did not start")
+
+
+def request_bytes(path: str) -> bytes:
+    return f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode()
+
+
+async def fetch(port: int, path: str, trickle: float = 0) -> int:
+    """Send one request (byte by byte every ``trickle`` seconds) and return the status."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        payload = request_bytes(path)
+        if trickle:
+            for index in range(len(payload)):
+                writer.write(payload[index : index + 1])
+                await writer.drain()
+                await asyncio.sleep(trickle)
+        else:
+            writer.write(payload)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sync WSGI (gunicorn sync workers) with ASGI (uvicorn, async views) on the course list "
+        "under concurrent fast clients while slow clients trickle their requests in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server (default: 2).")
+        parser.add_argument("--clients", type=int, default=32, help="Concurrent fast clients (default: 32).")
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=8,
+            help="Clients sending their request one byte per tick (default: 8).",
+        )
+        parser.add_argument("--trickle", type=float, default=0.05, help="Seconds between slow-client bytes.")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of load per server (default: 10).")
+        parser.add_argument("--mode", choices=sorted(SERVERS), action="append", help="Only benchmark these servers.")
+
+    def handle(self, *args, **options):
+        if settings.DATABASES["default"]["NAME"] == ":memory:":
+            raise CommandError("the servers need a database file or server they can share")
+        self.stdout.write(
+            f"{'mode':>5} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'slow done':>10}"
+        )
+        for mode in options["mode"] or ("wsgi", "asgi"):
+            self.stdout.write(self._format(mode, self._bench(mode, options)))
+        self.stdout.write("Slow clients hold a sync worker for their whole request but not the event loop.")
+
+    def _bench(self, mode: str, options) -> dict:
+        port = free_port()
+        env = {**os.environ, "DJANGO_DEBUG": "0", "DJANGO_SETTINGS_MODULE": "api.settings"}
+        server = subprocess.Popen(SERVERS[mode](port, options["workers"]), cwd=Path(settings.BASE_DIR), env=env)
+        try:
+            return asyncio.run(self._load(port, PATHS[mode], options))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    async def _load(self, port: int, path: str, options) -> dict:
+        await wait_for_port(port)
+        await fetch(port, path)
+        deadline = time.monotonic() + options["duration"]
+        latencies: list[float] = []
+        errors = 0
+        slow_done = 0
+
+        async def fast_client():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    ok = await fetch(port, path) == 200
+                except (OSError, ValueError, IndexError):
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        async def slow_client():
+            nonlocal slow_done
+            while time.monotonic() < deadline:
+                try:
+                    await fetch(port, path, trickle=options["trickle"])
+                    slow_done += 1
+                except (OSError, ValueError, IndexError):
+                    pass
+
+        started = time.monotonic()
+        tasks = [fast_client() for _ in range(options["clients"])]
+        tasks += [slow_client() for _ in range(options["slow_clients"])]
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+        return {"latencies": latencies, "errors": errors, "elapsed": elapsed, "slow_done": slow_done}
+
+    @staticmethod
+    def _format(mode: str, result: dict) -> str:
+        latencies = result["latencies"]
+        p50 = statistics.median(latencies) if latencies else float("nan")
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else float("nan")
+        return (
+            f"{mode:>5} {len(latencies):>9} {len(latencies) / result['elapsed']:>8.1f} {result['errors']:>7} "
+            f"{p50:>8.1f} {p95:>8.1f} {result['slow_done']:>10}"
+        )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import io
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.compiled import compile_serializer
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from courses.models import Course, Publisher, Teacher
+from courses.serializers import CourseSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+
+WORDS = "spice desert dune water sand worm guild navigator mentat fremen stillsuit ornithopter".split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF serializers with compiled ones (api.compiled) and DRF's JSONRenderer/JSONParser with the "
+        "orjson-backed FastJSONRenderer/FastJSONParser on course and review lists. No database access: the "
+        "objects and their values() rows are built in memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1_000, help="Objects per list (default: 1000).")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per measurement (default: 20).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic objects.")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(self.style.WARNING("orjson is not installed: FastJSONRenderer falls back to json."))
+        randomizer = random.Random(options["seed"])
+        repeat = options["repeat"]
+        objects = {
+            "courses": (CourseSerializer, self._courses(options["items"], randomizer)),
+            "reviews": (ReviewSerializer, self._reviews(options["items"], randomizer)),
+        }
+        self.stdout.write(
+            f"{'payload':<9} {'KiB':>6} {'serialize ms':>13} {'compiled ms':>12} {'render ms':>10} {'fast ms':>8} {'speedup':>8} "
+            f"{'parse ms':>9} {'fast ms':>8} {'speedup':>8}"
+        )
+        for name, (serializer_class, instances) in objects.items():
+            data = serializer_class(instances, many=True).data
+            content = JSONRenderer().render(data)
+            if FastJSONParser().parse(io.BytesIO(FastJSONRenderer().render(data))) != JSONParser().parse(
+                io.BytesIO(content)
+            ):
+                raise CommandError(f"FastJSONRenderer output differs for {name}")
+            compiled = compile_serializer(serializer_class)
+            rows = [self._row(instance, compiled.columns) for instance in instances]
+            if compiled(rows) != [dict(item) for item in data]:
+                raise CommandError(f"Compiled serializer output differs for {name}")
+            serialize = self._measure(lambda: serializer_class(instances, many=True).data, max(repeat // 4, 1))
+            compiled_serialize = self._measure(lambda: compiled(rows), repeat)
+            render = self._measure(lambda: JSONRenderer().render(data), repeat)
+            fast_render = self._measure(lambda: FastJSONRenderer().render(data), repeat)
+            parse = self._measure(lambda: JSONParser().parse(io.BytesIO(content)), repeat)
+            fast_parse = self._measure(lambda: FastJSONParser().parse(io.BytesIO(content)), repeat)
+            self.stdout.write(
+                f"{name:<9} {len(content) / 1024:>6.0f} {serialize:>13.2f} {compiled_serialize:>12.2f} {render:>10.2f} {fast_render:>8.2f} "
+                f"{render / fast_render:>7.1f}x {parse:>9.2f} {fast_parse:>8.2f} {parse / fast_parse:>7.1f}x"
+            )
+
+    @staticmethod
+    def _measure(function, repeat: int) -> float:
+        """Median CPU time of ``function`` in milliseconds."""
+        samples = []
+        for _ in range(repeat):
+            started = time.process_time()
+            function()
+            samples.append((time.process_time() - started) * 1000)
+        return statistics.median(samples)
+
+    @staticmethod
+    def _row(instance, columns: list[str]) -> dict:
+        """The ``values(*columns)`` row the database would return for ``instance``."""
+        row = {}
+        for column in columns:
+            *path, name = column.split("__")
+            value = instance
+            for attribute in path:
+                value = getattr(value, attribute)
+            # Foreign keys come back as their "<name>_id" column.
+            row[column] = getattr(value, value._meta.get_field(name).attname)
+        return row
+
+    @staticmethod
+    def _courses(count: int, randomizer: random.Random) -> list[Course]:
+        publisher = Publisher(pk=1, name="Bench Publisher", slug="bench-publisher", avatar_url="https://example.com/p")
+        teacher = Teacher(pk=1, name="Bench Teacher", avatar_url="https://example.com/t")
+        now = timezone.now()
+        return [
+            Course(
+                pk=index + 1,
+                title=" ".join(randomizer.choices(WORDS, k=4)),
+                description=" ".join(randomizer.choices(WORDS, k=60)),
+                price_amount=Decimal(randomizer.choice(["0.00", "19.00", "49.99"])),
+                language=randomizer.choice(["en", "fa", "ar"]),
+                tags=randomizer.sample(WORDS, 3),
+                participants_count=randomizer.randint(0, 50_000),
+                published_at=now - timedelta(seconds=randomizer.randint(0, 10**8)),
+                rating_avg=Decimal(randomizer.randint(100, 500)) / 100,
+                rating_count=randomizer.randint(0, 5_000),
+                publisher=publisher,
+                teacher=teacher,
+            )
+            for index in range(count)
+        ]
+
+    @staticmethod
+    def _reviews(count: int, randomizer: random.Random) -> list[Review]:
+        users = [get_user_model()(pk=index + 1, username=f"bench-user-{index}") for index in range(50)]
+        now = timezone.now()
+        return [
+            Review(
+                pk=index + 1,
+                course_id=randomizer.randint(1, 100),
+                user=randomizer.choice(users),
+                rating=randomizer.randint(1, 5),
+                text=" ".join(randomizer.choices(WORDS, k=25)),
+                created_at=now - timedelta(seconds=randomizer.randint(0, 10**7)),
+            )
+            for index in range(count)
+        ]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.dataset import SCALES, generate_dataset, scaled
+from courses.models import Publisher
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic catalog (users, publishers, teachers, courses, lessons, reviews and search "
+        "postings) for load tests. Rows are streamed with COPY on PostgreSQL and batched inserts elsewhere; "
+        "run it against a scratch database (DJANGO_DB_NAME)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Base dataset size (default: small).")
+        for name in ("users", "publishers", "teachers", "courses", "reviews"):
+            parser.add_argument(f"--{name}", type=int, help=f"Number of {name} (overrides the scale).")
+        parser.add_argument("--lessons-per-course", type=int, help="Lessons per course (overrides the scale).")
+        parser.add_argument(
+            "--popularity-skew",
+            type=float,
+            help="Zipf exponent of course popularity; 0 spreads reviews uniformly (default: 1.0).",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed (default: 42).")
+        parser.add_argument("--batch-size", type=int, help="Rows per insert batch.")
+        parser.add_argument("--no-search-index", action="store_true", help="Do not build search postings.")
+
+    def handle(self, *args, **options):
+        overrides = {
+            name: options[name]
+            for name in (
+                "users", "publishers", "teachers", "courses", "reviews", "lessons_per_course", "popularity_skew",
+                "seed", "batch_size",
+            )
+            if options[name] is not None
+        }
+        if options["no_search_index"]:
+            overrides["search_index"] = False
+        spec = scaled(options["scale"], **overrides)
+        if min(spec.users, spec.publishers, spec.teachers, spec.courses) < 1:
+            raise CommandError("users, publishers, teachers and courses must be at least 1")
+        if Publisher.objects.filter(slug="bench-publisher-0").exists():
+            raise CommandError("this database already holds a synthetic catalog; point DJANGO_DB_NAME at a fresh one")
+
+        created = generate_dataset(spec, log=self.stdout.write, progress=self._progress)
+        total = sum(created.values())
+        self.stdout.write(self.style.SUCCESS(f"Generated {total:,} rows."))
+
+    def _progress(self, label: str, done: int, total: int | None, elapsed: float) -> None:
+        if not self.stderr.isatty():
+            return
+        of = f"/{total:,}" if total else ""
+        self.stderr.write(f"\r  {label}: {done:,}{of} rows ({done / max(elapsed, 1e-9):,.0f} rows/s)", ending="")
+        if total and done >= total:
+            self.stderr.write("\r" + " " * 72 + "\r", ending="")
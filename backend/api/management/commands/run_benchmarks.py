@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from benchmarks.dataset import SCALES, generate_dataset, scaled
+from benchmarks.suite import build_scenarios, compare, load_baseline, run_scenario, save_baseline
+from courses.models import Publisher
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the main endpoints at concurrency against a synthetic catalog and compare with the stored "
+        "baseline. Run it against a scratch database (DJANGO_DB_NAME): the catalog is seeded there."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Dataset size (default: small).")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per scenario (default: 400).")
+        parser.add_argument("--concurrency", type=int, default=8, help="Client threads (default: 8).")
+        parser.add_argument("--scenario", action="append", help="Only run these scenarios.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95/throughput drift (0.25).")
+        parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+        parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero on regressions.")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Serve anonymous reads from the response cache (measures cache hits, not the endpoints).",
+        )
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        if not Publisher.objects.filter(slug="bench-publisher-0").exists():
+            self.stderr.write(f"Seeding the {scale} dataset...")
+            generate_dataset(scaled(scale), log=lambda message: self.stderr.write(f"  {message}"))
+
+        scenarios = build_scenarios()
+        if options["scenario"]:
+            unknown = set(options["scenario"]) - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f"unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in scenarios if scenario.name in options["scenario"]]
+
+        baseline = load_baseline().get(scale, {})
+        results = []
+        with self._response_cache(options["response_cache"]):
+            for scenario in scenarios:
+                requests = max(int(options["requests"] * scenario.weight), options["concurrency"])
+                result = run_scenario(scenario, requests, options["concurrency"])
+                result.regressions = compare(result, baseline.get(scenario.name), options["tolerance"])
+                results.append(result)
+
+        if options["json"]:
+            self.stdout.write(json.dumps([asdict(result) for result in results], indent=2))
+        else:
+            self._print_table(results, baseline)
+
+        if options["update_baseline"]:
+            save_baseline(scale, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline for {scale} updated."))
+        elif options["fail_on_regression"] and any(result.regressions for result in results):
+            raise CommandError("performance regressions against the baseline")
+
+    @staticmethod
+    def _response_cache(enabled: bool):
+        if enabled:
+            return override_settings()
+        return override_settings(
+            CACHES={**settings.CACHES, "benchmark": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+            RESPONSE_CACHE={**getattr(settings, "RESPONSE_CACHE", {}), "ALIAS": "benchmark"},
+        )
+
+    def _print_table(self, results, baseline: dict) -> None:
+        self.stdout.write(
+            f"{'scenario':<20} {'reqs':>6} {'err':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'queries':>8} {'base p95':>9}"
+        )
+        for result in results:
+            base = baseline.get(result.scenario, {}).get("p95_ms", "-")
+            self.stdout.write(
+                f"{result.scenario:<20} {result.requests:>6} {result.errors:>4} {result.rps:>8.1f} "
+                f"{result.p50_ms:>8.2f} {result.p95_ms:>8.2f} {result.p99_ms:>8.2f} {result.queries:>8.2f} {base:>9}"
+            )
+            for regression in result.regressions:
+                self.stdout.write(self.style.WARNING(f"  regression: {regression}"))
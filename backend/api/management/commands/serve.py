@@ -0,0 +1,164 @@
+"""Production server: gunicorn's pre-forking arbiter around the Django app.
+
+The app is imported once in the master (``--preload``) and shared with the
+workers copy-on-write, after the health check has passed, so a broken
+deploy fails before any worker forks. Workers are recycled after
+``--max-requests`` (plus jitter, so they do not all restart together) to cap
+memory growth.
+
+Graceful reload: ``kill -HUP <master pid>`` (``pm2 sendSignal SIGHUP
+dunetube-backend``, ``docker kill -s HUP``) starts new workers with fresh code and lets the old ones finish
+their in-flight requests within ``--graceful-timeout``. With ``--preload`` the
+master keeps its imported code, so reloading code needs a restart unless
+``--no-preload`` is used.
+
+Workers share state (response cache generations, ETags, replica pinning,
+progress and metrics buffers) through the Django cache, so the command
+refuses to start more than one worker on a process-local ``locmem`` cache;
+set ``DJANGO_CACHE_BACKEND=file`` or ``redis``.
+
+gunicorn does not run on Windows; there the command falls back to uvicorn's
+own (spawning, not pre-forking) supervisor with the same worker count and
+request limit.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "asgi": "uvicorn.workers.UvicornWorker",
+}
+
+
+def default_workers() -> int:
+    """``$WEB_CONCURRENCY``, else gunicorn's recommended ``2 * cores + 1``."""
+    if os.environ.get("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    return 2 * (os.cpu_count() or 1) + 1
+
+
+def check_health() -> None:
+    """Call ``api.views.healthz`` in-process; raise ``CommandError`` unless it reports ok."""
+    response = Client(raise_request_exception=False).get(reverse("healthz"), HTTP_HOST="localhost")
+    if response.status_code != 200 or not response.json().get("ok"):
+        raise CommandError(f"health check failed with status {response.status_code}")
+
+
+def check_shared_cache(workers: int) -> None:
+    """Raise ``CommandError`` if several workers would each get their own ``locmem`` cache."""
+    if workers <= 1:
+        return
+    local = [alias for alias in settings.CACHES if isinstance(caches[alias], LocMemCache)]
+    if local:
+        raise CommandError(
+            f"{workers} workers cannot share the process-local LocMemCache ({', '.join(local)}): "
+            "set DJANGO_CACHE_BACKEND=file or redis, or run with --workers 1."
+        )
+
+
+def _post_fork(server, worker):
+    # Connections opened in the master must not be shared with the workers.
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Serve the API with a pre-forking gunicorn server (WSGI, or ASGI through uvicorn workers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bind", default=os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', 8000)}"))
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=default_workers(),
+            help="Worker processes (default: $WEB_CONCURRENCY or 2 * CPU cores + 1).",
+        )
+        parser.add_argument("--worker-class", choices=sorted(WORKER_CLASSES), default="sync")
+        parser.add_argument("--threads", type=int, default=1, help="Threads per gthread worker.")
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000)),
+            help="Recycle a worker after this many requests; 0 disables (default: 1000).",
+        )
+        parser.add_argument("--max-requests-jitter", type=int, default=100)
+        parser.add_argument("--timeout", type=int, default=30, help="Kill workers silent for this many seconds.")
+        parser.add_argument("--graceful-timeout", type=int, default=30)
+        parser.add_argument("--keep-alive", type=int, default=5)
+        parser.add_argument("--no-preload", action="store_false", dest="preload")
+        parser.add_argument("--pid", help="Write the master pid here (for kill -HUP reloads).")
+        parser.add_argument("--log-level", default="info")
+        parser.add_argument("--skip-health-check", action="store_false", dest="health_check")
+
+    def handle(self, *args, **options):
+        check_shared_cache(options["workers"])
+        if options["health_check"]:
+            check_health()
+            connections.close_all()
+        if os.name == "nt":
+            return self.serve_uvicorn(options)
+
+        from gunicorn.app.base import BaseApplication
+
+        asgi = options["worker_class"] == "asgi"
+        config = {
+            "bind": options["bind"],
+            "workers": options["workers"],
+            "worker_class": WORKER_CLASSES[options["worker_class"]],
+            "threads": options["threads"],
+            "max_requests": options["max_requests"],
+            "max_requests_jitter": options["max_requests_jitter"],
+            "timeout": options["timeout"],
+            "graceful_timeout": options["graceful_timeout"],
+            "keepalive": options["keep_alive"],
+            "preload_app": options["preload"],
+            "pidfile": options["pid"],
+            "loglevel": options["log_level"],
+            "accesslog": "-",
+            "errorlog": "-",
+            "post_fork": _post_fork,
+        }
+
+        class Application(BaseApplication):
+            def load_config(self):
+                for key, value in config.items():
+                    if value is not None:
+                        self.cfg.set(key, value)
+
+            def load(self):
+                if asgi:
+                    from api.asgi import application
+                else:
+                    from api.wsgi import application
+                return application
+
+        self.stdout.write(
+            f"Serving on {options['bind']} with {options['workers']} {options['worker_class']} workers"
+            f"{' (preloaded)' if options['preload'] else ''}"
+        )
+        Application(prog="manage.py serve").run()
+
+    def serve_uvicorn(self, options):
+        import uvicorn
+
+        host, _, port = options["bind"].rpartition(":")
+        self.stdout.write(f"Serving on {options['bind']} with {options['workers']} uvicorn workers")
+        uvicorn.run(
+            "api.asgi:application",
+            host=host or "0.0.0.0",
+            port=int(port),
+            workers=options["workers"],
+            limit_max_requests=options["max_requests"] or None,
+            timeout_keep_alive=options["keep_alive"],
+            timeout_graceful_shutdown=options["graceful_timeout"],
+            lifespan="off",
+            log_level=options["log_level"],
+        )
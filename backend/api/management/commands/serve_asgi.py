@@ -0,0 +1,38 @@
+import os
+
+import uvicorn
+from django.core.management.base import BaseCommand
+
+from .serve import check_shared_cache
+
+
+def default_workers() -> int:
+    return int(os.environ.get("WEB_CONCURRENCY") or (os.cpu_count() or 1))
+
+
+class Command(BaseCommand):
+    help = "Serve the API with uvicorn on api.asgi:application (async views run on the event loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+        parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=default_workers(),
+            help="Worker processes (default: $WEB_CONCURRENCY or the CPU count).",
+        )
+        parser.add_argument("--log-level", default="info")
+
+    def handle(self, *args, **options):
+        check_shared_cache(options["workers"])
+        uvicorn.run(
+            "api.asgi:application",
+            host=options["host"],
+            port=options["port"],
+            workers=options["workers"],
+            lifespan="off",
+            log_level=options["log_level"],
+            # Let a reverse proxy's X-Forwarded-* headers through.
+            proxy_headers=True,
+        )
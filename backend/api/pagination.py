@@ -0,0 +1,209 @@
+"""Keyset (cursor) pagination with a page-number fallback.
+
+Page-number pagination issues ``COUNT(*)`` and ``OFFSET n`` queries that get
+slower the deeper a client pages. Requests carrying a ``cursor`` parameter
+(empty for the first page) are paginated by keyset instead: the cursor holds
+the ordering values of the last row seen and the next page is fetched with a
+``WHERE (ordering) > (last values)`` condition that an index can seek to.
+
+The keyset follows whatever ordering the queryset ends up with, including
+``?ordering=`` choices, and appends the primary key as a tie-breaker so pages
+never skip or repeat rows. Cursors are opaque, bound to that ordering, and
+only ``?count=exact`` or ``?count=approx`` add a count to the response.
+
+Requests without ``cursor`` keep the page-number behaviour (``?page=``) so
+existing clients work unchanged.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+import re
+import uuid
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+_ESTIMATE_RE = re.compile(r"rows=(\d+)")
+
+
+class CursorEncoder(json.JSONEncoder):
+    """Encode keyset values losslessly (``DjangoJSONEncoder`` drops microseconds)."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        return super().default(o)
+
+
+def approximate_count(queryset) -> int:
+    """Return the planner's row estimate on PostgreSQL, an exact count elsewhere."""
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    match = _ESTIMATE_RE.search(queryset.order_by().explain())
+    return int(match.group(1)) if match else queryset.count()
+
+
+class KeysetPagination(PageNumberPagination):
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.ordering = self.get_ordering(queryset)
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset, request)
+        cursor = self.decode_cursor(request)
+
+        reverse = cursor is not None and cursor["direction"] == "previous"
+        if cursor is not None:
+            queryset = queryset.filter(self.keyset_filter(cursor["values"], reverse))
+        order_by = [self.order_term(name, descending ^ reverse) for name, descending in self.ordering]
+        rows = list(queryset.order_by(*order_by)[: self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.rows = rows
+        return rows
+
+    def get_ordering(self, queryset) -> list[tuple[str, bool]]:
+        terms = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        ordering = []
+        for term in terms:
+            if not isinstance(term, str) or term == "?":
+                raise NotFound("Cursor pagination is not available for this ordering.")
+            name = term.lstrip("-")
+            ordering.append(("pk" if name in ("id", queryset.model._meta.pk.name) else name, term.startswith("-")))
+        if "pk" not in {name for name, _ in ordering}:
+            ordering.append(("pk", ordering[-1][1] if ordering else False))
+        return ordering
+
+    @staticmethod
+    def order_term(name: str, descending: bool) -> str:
+        return f"-{name}" if descending else name
+
+    def keyset_filter(self, values: list, reverse: bool) -> Q:
+        """``(a, b, pk) > (x, y, z)`` expanded for mixed sort directions."""
+        clauses = []
+        for position, (name, descending) in enumerate(self.ordering):
+            lookup = "lt" if descending ^ reverse else "gt"
+            equal = {prefix: value for (prefix, _), value in zip(self.ordering[:position], values)}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": values[position]}))
+        return reduce(or_, clauses)
+
+    def get_count(self, queryset, request) -> int | None:
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            return queryset.count()
+        if mode == "approx":
+            return approximate_count(queryset)
+        return None
+
+    def signature(self) -> str:
+        ordering = ",".join(self.order_term(name, descending) for name, descending in self.ordering)
+        return hashlib.sha1(ordering.encode()).hexdigest()[:8]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if payload["o"] != self.signature() or len(payload["v"]) != len(self.ordering):
+                raise ValueError
+            direction = {"n": "next", "p": "previous"}[payload["d"]]
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"values": payload["v"], "direction": direction}
+
+    def encode_cursor(self, row, direction: str) -> str:
+        values = []
+        for name, _ in self.ordering:
+            if isinstance(row, dict):
+                # values() rows from api.compiled.CompiledListMixin.
+                values.append(row[name])
+                continue
+            value = row
+            for attribute in name.split("__"):
+                value = getattr(value, attribute)
+            values.append(value)
+        payload = {"v": values, "d": direction[0], "o": self.signature()}
+        raw = json.dumps(payload, cls=CursorEncoder, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def cursor_link(self, row, direction: str) -> str:
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, direction))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not (self.has_next and self.rows):
+            return None
+        return self.cursor_link(self.rows[-1], "next")
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not (self.has_previous and self.rows):
+            return None
+        return self.cursor_link(self.rows[0], "previous")
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        payload = OrderedDict()
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["next"] = self.get_next_link()
+        payload["previous"] = self.get_previous_link()
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque keyset cursor; pass it empty to start cursor pagination.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "With a cursor, include an `exact` or `approx` (planner estimate) count.",
+                "schema": {"type": "string", "enum": ["exact", "approx"]},
+            },
+        ]
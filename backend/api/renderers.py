@@ -0,0 +1,48 @@
+"""JSON rendering with orjson.
+
+``FastJSONRenderer`` is a drop-in for DRF's ``JSONRenderer``. orjson encodes
+dicts, lists, strings, numbers, datetimes and UUIDs in C. Anything else
+(Decimal, lazy translation strings, querysets, ...) goes through DRF's own
+encoder, so the output matches the stock renderer, except that ``indent``
+is always two spaces. Without orjson installed the renderer falls back to
+the stock implementation.
+"""
+
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _encoder.default(obj)
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    """Encode ``data`` the way ``FastJSONRenderer`` does."""
+    if orjson is None:
+        return JSONRenderer().render(data, renderer_context={"indent": 2 if indent else None})
+    rendered = orjson.dumps(data, default=_default, option=OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+    # Escape the line separators that are valid JSON but not valid JavaScript, as JSONRenderer does.
+    if b"\xe2\x80\xa8" in rendered or b"\xe2\x80\xa9" in rendered:
+        rendered = rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return rendered
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        return dumps(data, indent=bool(self.get_indent(accepted_media_type, renderer_context)))
@@ -2,6 +2,7 @@ from pathlib import Path
 from datetime import timedelta
 import os
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,13 +24,18 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_spectacular",
     "django_filters",
+    "api.apps.ApiConfig",
+    "jobs.apps.JobsConfig",
+    "metrics.apps.MetricsConfig",
     "users.apps.UsersConfig",
     "courses.apps.CoursesConfig",
     "lessons.apps.LessonsConfig",
     "reviews.apps.ReviewsConfig",
+    "search.apps.SearchConfig",
 ]
 
 MIDDLEWARE = [
+    "metrics.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -66,6 +72,9 @@ if db_engine == "django.db.backends.sqlite3":
         "default": {
             "ENGINE": db_engine,
             "NAME": os.environ.get("DJANGO_DB_NAME", str(BASE_DIR / "db.sqlite3")),
+            # Writers queue for the lock up front instead of failing to upgrade
+            # a read transaction when job workers run in parallel.
+            "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
         }
     }
 else:
@@ -77,9 +86,52 @@ else:
             "PASSWORD": os.environ.get("DJANGO_DB_PASSWORD", ""),
             "HOST": os.environ.get("DJANGO_DB_HOST", "localhost"),
             "PORT": os.environ.get("DJANGO_DB_PORT", "5432"),
+            "OPTIONS": {},
         }
     }
 
+# Keep connections open between requests; health checks drop ones the server closed.
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DJANGO_DB_CONN_MAX_AGE", 60))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = os.environ.get("DJANGO_DB_CONN_HEALTH_CHECKS", "1") == "1"
+
+# Optional psycopg 3 connection pool (pip install "psycopg[binary,pool]"). Every
+# worker process has its own pool, so by default the server's connection budget
+# (minus a few slots for admin, migrations and job workers) is split between
+# the `serve` workers.
+if db_engine == "django.db.backends.postgresql" and os.environ.get("DJANGO_DB_POOL", "0") == "1":
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError as exc:
+        # requirements.txt pins psycopg2, which Django cannot pool.
+        raise ImproperlyConfigured(
+            'DJANGO_DB_POOL=1 needs psycopg 3 with its pool: pip install "psycopg[binary,pool]".'
+        ) from exc
+    web_workers = int(os.environ.get("WEB_CONCURRENCY") or 2 * (os.cpu_count() or 1) + 1)
+    db_connection_budget = int(os.environ.get("DJANGO_DB_MAX_CONNECTIONS", 100)) - 5
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # the pool owns connection reuse
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DJANGO_DB_POOL_MIN_SIZE", 1)),
+        "max_size": int(os.environ.get("DJANGO_DB_POOL_MAX_SIZE") or max(db_connection_budget // web_workers, 1)),
+        "timeout": float(os.environ.get("DJANGO_DB_POOL_TIMEOUT", 10)),
+    }
+
+# Comma-separated replica hosts serving catalog GETs (see api.db).
+REPLICA_HOSTS = [host for host in os.environ.get("DJANGO_DB_REPLICA_HOSTS", "").split(",") if host]
+for index, host in enumerate(REPLICA_HOSTS):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["api.db.ReplicaRouter"]
+REPLICA_ROUTING = {
+    "ALIASES": [f"replica_{index}" for index in range(len(REPLICA_HOSTS))],
+    "MAX_LAG": float(os.environ.get("DJANGO_DB_REPLICA_MAX_LAG", 5)),
+    "LAG_CHECK_INTERVAL": float(os.environ.get("DJANGO_DB_REPLICA_LAG_CHECK_INTERVAL", 10)),
+    "PIN_SECONDS": float(os.environ.get("DJANGO_DB_REPLICA_PIN_SECONDS", 5)),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -114,15 +166,75 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson-backed JSON (api.renderers); the stock classes are drop-in replacements.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetPagination",
     "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 12)),
 }
 
+# "locmem" (per process), "file" or "redis" (any Redis-compatible server).
+cache_backend = os.environ.get("DJANGO_CACHE_BACKEND", "locmem")
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_LOCATIONS = {
+    "locmem": "dunetube",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://localhost:6379/0",
+}
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[cache_backend],
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", CACHE_LOCATIONS[cache_backend]),
+        "KEY_PREFIX": os.environ.get("DJANGO_CACHE_KEY_PREFIX", "dunetube"),
+    }
+}
+
+# Anonymous catalog responses; entries are also orphaned by generation bumps.
+RESPONSE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.environ.get("DJANGO_RESPONSE_CACHE_TIMEOUT", 300)),
+}
+
+# Background jobs stored in the database and run by `manage.py run_workers`.
+JOBS = {
+    "POLL_INTERVAL": float(os.environ.get("JOBS_POLL_INTERVAL", 1.0)),
+    "BATCH_SIZE": 1,
+    "MAX_ATTEMPTS": 5,
+    "TIMEOUT": 300,
+    "BACKOFF_BASE": 5,
+    "BACKOFF_MAX": 3600,
+}
+
+# Per-route request metrics served to staff at /api/metrics/ (Prometheus format).
+METRICS = {
+    "ENABLED": os.environ.get("DJANGO_METRICS", "1") == "1",
+    "CACHE_ALIAS": "default",
+    "FLUSH_INTERVAL": float(os.environ.get("DJANGO_METRICS_FLUSH_INTERVAL", 5)),
+    "WORKER_TTL": 300,
+}
+
+# List endpoints build their JSON from values() rows (api.compiled) instead of DRF serializers.
+COMPILED_SERIALIZERS = os.environ.get("DJANGO_COMPILED_SERIALIZERS", "1") == "1"
+
+# "index" ranks ?search= with the inverted index; "database" uses icontains scans.
+SEARCH_BACKEND = os.environ.get("DJANGO_SEARCH_BACKEND", "index")
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "DuneTube API",
     "DESCRIPTION": "REST API for the DuneTube learning platform.",
@@ -136,4 +248,13 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "authz.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authz.tokens.RoleTokenRefreshSerializer",
+}
+
+# Resolved user roles are cached per user and, optionally, signed into access tokens.
+ROLE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.environ.get("DJANGO_ROLE_CACHE_TIMEOUT", 300)),
+    "TOKEN_CLAIMS": os.environ.get("DJANGO_JWT_ROLE_CLAIMS", "1") == "1",
 }
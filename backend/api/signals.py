@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import CATALOG, PUBLISHING, bump_generation, course_namespace
+from api.db import pin_primary
+from courses.models import Course, Publisher, Teacher
+from lessons.models import Lesson
+from reviews.models import Review
+
+CATALOG_MODELS = (Course, Lesson, Publisher, Teacher, Review)
+
+
+def _receive_catalog_writes(handler):
+    for model in CATALOG_MODELS:
+        handler = receiver(post_save, sender=model)(handler)
+        handler = receiver(post_delete, sender=model)(handler)
+    return handler
+
+
+@_receive_catalog_writes
+def invalidate_catalog_responses(sender, raw: bool = False, **kwargs):
+    if raw:
+        return
+    # Bump now so the writing transaction stops reading old entries, and again
+    # after commit so nothing cached from pre-commit data outlives the write.
+    namespaces = [CATALOG]
+    if sender in (Publisher, Teacher):
+        namespaces.append(PUBLISHING)
+    else:
+        instance = kwargs["instance"]
+        namespaces.append(course_namespace(instance.pk if sender is Course else instance.course_id))
+    for namespace in namespaces:
+        bump_generation(namespace)
+        transaction.on_commit(partial(bump_generation, namespace))
+    # Replicas see the write once it commits; read from the primary until they catch up.
+    transaction.on_commit(pin_primary)
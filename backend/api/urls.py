@@ -4,9 +4,11 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from api import async_views
 from api.views import healthz
 from courses.views import CourseViewSet
 from lessons.views import LessonViewSet
+from metrics.views import prometheus_metrics
 from reviews.views import CourseReviewViewSet
 from users.views import ProfileMeView, RoleActivationView, RoleListView
 
@@ -26,4 +28,8 @@ urlpatterns = [
     path("api/auth/roles/activate/", RoleActivationView.as_view(), name="auth-roles-activate"),
     path("api/", include(router.urls)),
     path("api/healthz/", healthz, name="healthz"),
+    path("api/metrics/", prometheus_metrics, name="metrics"),
+    path("api/async/healthz/", async_views.healthz, name="async-healthz"),
+    path("api/async/courses/", async_views.course_list, name="async-course-list"),
+    path("api/async/profile/me/", async_views.profile_me, name="async-profile-me"),
 ]
@@ -0,0 +1,8 @@
+"""Role resolution and JWT role claims shared by the API and the legacy core project.
+
+Both projects store roles the same way (``RoleAssignment`` rows and a
+``UserProfile.active_role`` reached through the ``role_assignments`` and
+``profile`` relations of the user model), so neither this package nor its
+modules are an app: each project keeps its own models and signals and calls
+``authz.roles.invalidate_roles`` from them.
+"""
@@ -0,0 +1,106 @@
+"""Role resolution for role-aware permissions and the role endpoints.
+
+``resolve_roles(request)`` answers which roles a user holds and which one is
+active at most once per request. Results are read with one query and cached
+across requests under a per-user key that each project's
+``RoleAssignment``/``UserProfile`` signals drop, and access tokens issued by
+``authz.tokens`` carry them as claims so permissions can authorize without
+touching the database at all.
+
+Configured through ``settings.ROLE_CACHE``::
+
+    ROLE_CACHE = {
+        "ALIAS": "default",
+        "TIMEOUT": 300,
+        "TOKEN_CLAIMS": True,
+    }
+
+Claims are as fresh as the access token: role changes reach them on the next
+token refresh (or immediately for the token returned by role activation).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+ROLES_CLAIM = "roles"
+ACTIVE_ROLE_CLAIM = "active_role"
+
+DEFAULT_SETTINGS = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "TOKEN_CLAIMS": True,
+}
+
+
+def role_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "ROLE_CACHE", {})}
+
+
+@dataclass(frozen=True)
+class ResolvedRoles:
+    available_roles: tuple[str, ...] = ()
+    active_role: str | None = None
+
+    def has_any(self, roles) -> bool:
+        return not set(roles).isdisjoint(self.available_roles)
+
+    def as_claims(self) -> dict:
+        return {ROLES_CLAIM: list(self.available_roles), ACTIVE_ROLE_CLAIM: self.active_role}
+
+    @classmethod
+    def from_claims(cls, token) -> "ResolvedRoles | None":
+        if ROLES_CLAIM not in token:
+            return None
+        return cls(tuple(token[ROLES_CLAIM]), token.get(ACTIVE_ROLE_CLAIM))
+
+
+def _cache_key(user_id) -> str:
+    return f"roles:{user_id}"
+
+
+def load_roles(user_id) -> ResolvedRoles:
+    """Read the roles and active role of ``user_id`` with a single query."""
+    rows = get_user_model().objects.filter(pk=user_id).values_list("profile__active_role", "role_assignments__role")
+    active_role, roles = None, set()
+    for active_role, role in rows:
+        if role:
+            roles.add(role)
+    return ResolvedRoles(tuple(sorted(roles)), active_role)
+
+
+def get_roles(user_id) -> ResolvedRoles:
+    config = role_settings()
+    cache = caches[config["ALIAS"]]
+    roles = cache.get(_cache_key(user_id))
+    if roles is None:
+        roles = load_roles(user_id)
+        cache.set(_cache_key(user_id), roles, config["TIMEOUT"])
+    return roles
+
+
+def invalidate_roles(user_id) -> None:
+    caches[role_settings()["ALIAS"]].delete(_cache_key(user_id))
+
+
+def resolve_roles(request, trust_token: bool = True) -> ResolvedRoles:
+    """Return the roles of ``request.user``.
+
+    With ``trust_token`` the role claims of the access token win; views that
+    display or change roles pass ``False`` to read the cached database state.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return ResolvedRoles()
+    if trust_token and role_settings()["TOKEN_CLAIMS"] and hasattr(request.auth, "payload"):
+        claimed = ResolvedRoles.from_claims(request.auth)
+        if claimed is not None:
+            return claimed
+    roles = getattr(request, "_resolved_roles", None)
+    if roles is None:
+        roles = request._resolved_roles = get_roles(user.pk)
+    return roles
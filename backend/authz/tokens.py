@@ -0,0 +1,47 @@
+"""SimpleJWT serializers embedding role claims (and optionally identity claims) in access tokens.
+
+Identity claims (``username`` and ``is_superuser``) let
+``core.authentication.TokenUserAuthentication`` build the request user from
+the token alone; projects that authenticate statelessly subclass the obtain
+serializer with ``identity_claims = True``.
+"""
+
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .roles import get_roles, role_settings
+
+
+def add_claims(token, user, identity: bool = False):
+    if identity:
+        token["username"] = user.get_username()
+        token["is_superuser"] = user.is_superuser
+    if role_settings()["TOKEN_CLAIMS"]:
+        token.payload.update(get_roles(user.pk).as_claims())
+    return token
+
+
+def access_token_for(user, identity: bool = False) -> AccessToken:
+    """Issue an access token carrying ``user``'s current claims."""
+    return add_claims(AccessToken.for_user(user), user, identity)
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    identity_claims = False
+
+    @classmethod
+    def get_token(cls, user):
+        # Access tokens copy the refresh token's claims.
+        return add_claims(super().get_token(user), user, cls.identity_claims)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if role_settings()["TOKEN_CLAIMS"]:
+            # Re-read the roles so a refresh picks up changes since login.
+            access = AccessToken(data["access"], verify=False)
+            access.payload.update(get_roles(access[api_settings.USER_ID_CLAIM]).as_claims())
+            data["access"] = str(access)
+        return data
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +36,8 @@ INSTALLED_APPS = [
     'rest_framework',
     'drf_spectacular',
     'core',
+    'jobs',
+    'metrics',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -44,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -81,6 +85,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Job workers write concurrently; take the write lock up front.
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
     }
 }
 
@@ -121,6 +127,23 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Lesson videos are served by LessonViewSet.stream. Set MODE to
+# "x-accel-redirect" (nginx, files exposed as an internal location at PREFIX)
+# or "x-sendfile" (Apache/lighttpd) to let the fronting proxy send the bytes.
+LESSON_MEDIA_SENDFILE = {
+    'MODE': None,
+    'PREFIX': '/protected-media/',
+}
+
+# Resumable lesson uploads: partial files live here until completed, and
+# sessions idle for longer than the TTL are purged by cleanup_upload_sessions.
+UPLOAD_SESSION_ROOT = MEDIA_ROOT / 'uploads' / 'partial'
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+UPLOAD_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -134,7 +157,102 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
-SIMPLE_JWT = {}
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "core.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authz.tokens.RoleTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "core.authentication.ClaimsUser",
+}
+
+# Worker processes serving the app (gunicorn and uvicorn read the same variable).
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY") or 1)
+
+# "locmem" is per process: with more than one worker use "file" or "redis".
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_LOCATIONS = {
+    "locmem": "dunetube",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://localhost:6379/0",
+}
+cache_backend = os.environ.get("DJANGO_CACHE_BACKEND", "locmem")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[cache_backend],
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", CACHE_LOCATIONS[cache_backend]),
+    }
+}
+
+# Resolved user roles are cached per user and embedded in access tokens.
+ROLE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "TOKEN_CLAIMS": True,
+}
+
+# Background jobs stored in the database and run by `manage.py run_workers`.
+JOBS = {
+    "POLL_INTERVAL": 1.0,
+    "BATCH_SIZE": 1,
+    "MAX_ATTEMPTS": 5,
+    "TIMEOUT": 300,
+    "BACKOFF_BASE": 5,
+    "BACKOFF_MAX": 3600,
+}
+
+# Uploaded lesson videos are probed and packaged as HLS by the "media" job queue.
+LESSON_TRANSCODING = {
+    "ENABLED": True,
+    "QUEUE": "media",
+    "FFMPEG": "ffmpeg",
+    "FFPROBE": "ffprobe",
+    "WORKERS": 2,
+    "SEGMENT_SECONDS": 6,
+    "OUTPUT_DIR": "lessons/hls",
+}
+
+# Per-route request metrics served to staff at /api/metrics (Prometheus format).
+METRICS = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    "FLUSH_INTERVAL": 5,
+    "WORKER_TTL": 300,
+}
+
+# Stateless token authentication used by the lesson endpoints.
+TOKEN_AUTH = {
+    "LRU_SIZE": 1024,
+    "REVOCATION_REFRESH": 5,
+}
+
+# Lesson progress heartbeats are coalesced and flushed in bulk: in memory with a
+# single worker, in the shared cache otherwise so every worker reads the same
+# positions. Set "BACKEND" to None to write every heartbeat straight to the database.
+PROGRESS_BUFFER = {
+    "BACKEND": (
+        "core.progress_buffer.LocalProgressBuffer"
+        if WEB_CONCURRENCY == 1
+        else "core.progress_buffer.CacheProgressBuffer"
+    ),
+    "FLUSH_INTERVAL": 5,
+    "OPTIONS": {},
+}
+
+# Lesson progress rolled up into daily studio analytics by the "analytics" job queue
+# (core.analytics); start the schedule with `manage.py rollup_studio_analytics --schedule`.
+STUDIO_ANALYTICS = {
+    "INTERVAL": 300,
+    "QUEUE": "analytics",
+    "LAG": 300,
+    "COMPLETION_RATIO": 0.9,
+    "DROPOFF_BUCKETS": 4,
+    "BATCH_SIZE": 500,
+}
+
+# Rows fetched (and encoded) per batch by the streaming studio exports.
+STUDIO_EXPORT_CHUNK_SIZE = 2000
 
 CORS_ALLOW_ALL_ORIGINS = True
 
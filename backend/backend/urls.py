@@ -1,19 +1,38 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from core.views import HealthCheckView
+from core import async_views
+from core.views import HealthCheckView, LessonViewSet, StudioCourseViewSet, StudioExportView, StudioLessonViewSet
+from metrics.views import prometheus_metrics
 
 router = DefaultRouter()
 # در آینده: router.register('courses', CourseViewSet, basename='course')
+router.register("lessons", LessonViewSet, basename="lesson")
+router.register("studio/courses", StudioCourseViewSet, basename="studio-course")
+router.register("studio/lessons", StudioLessonViewSet, basename="studio-lesson")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(router.urls)),
+    path(
+        "api/studio/exports/<slug:dataset>.<slug:export_format>",
+        StudioExportView.as_view(),
+        name="studio-export",
+    ),
     path("api/healthz", HealthCheckView.as_view(), name="api-healthz"),
+    path("api/metrics", prometheus_metrics, name="metrics"),
+    path("api/async/healthz", async_views.healthz, name="async-healthz"),
+    path("api/async/lessons/<int:pk>/progress", async_views.lesson_progress, name="async-lesson-progress"),
     path("api/token", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/schema", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs", SpectacularSwaggerView.as_view(url_name="schema"), name="docs"),
 ]
+
+if settings.DEBUG:
+    # HLS playlists and segments are plain media files.
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
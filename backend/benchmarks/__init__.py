@@ -0,0 +1 @@
+"""Synthetic datasets and the endpoint benchmark suite (``manage.py run_benchmarks``)."""
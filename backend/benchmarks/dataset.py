@@ -0,0 +1,390 @@
+"""Bulk seeding of synthetic catalogs for load tests.
+
+Rows are generated as plain tuples and streamed to the database in batches:
+``COPY ... FROM STDIN`` on PostgreSQL, multi-row ``executemany`` inserts
+elsewhere. Primary keys are allocated up front so no batch has to wait for
+the ids of the previous one, and no model instances, signals or per-row
+queries are involved. The side effects those signals would have are produced
+in bulk instead: user profiles, search postings and the denormalised review
+aggregates, which are computed while the reviews are planned.
+
+Course popularity follows a Zipf distribution: with ``popularity_skew`` s,
+the course of popularity rank r receives reviews and participants in
+proportion to ``1 / r**s`` (0 is uniform). Everything is derived from
+``DatasetSpec.seed``, so the same spec on an empty database always yields the
+same catalog.
+
+Synthetic rows are prefixed with ``bench-`` (usernames, publisher slugs) and
+share the password ``BENCH_PASSWORD``.
+"""
+
+from __future__ import annotations
+
+import csv
+import functools
+import io
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Callable, Iterable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from courses.models import RATING_SCALE, Course, Publisher, Teacher
+from lessons.models import Lesson
+from reviews.aggregates import RatingAggregate
+from reviews.models import Review
+from search.models import SearchPosting
+from search.text import course_terms
+from users.models import UserProfile
+
+BENCH_PASSWORD = "bench-pass-123"
+LANGUAGES = ("en", "fa", "ar")
+PRICES = (Decimal("0.00"), Decimal("19.00"), Decimal("29.00"), Decimal("39.00"), Decimal("99.00"))
+WORDS = (
+    "spice desert dune water sand worm guild navigator mentat fremen stillsuit ornithopter "
+    "harvester sietch strategy survival history prophecy empire house melange storm crysknife "
+    "litany fear planet ecology trade politics language culture combat focus"
+).split()
+# Rating weights (1..5 stars) by course quality tier.
+RATING_WEIGHTS = ((30, 25, 25, 12, 8), (5, 10, 25, 35, 25), (2, 3, 10, 30, 55))
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 1_000
+    publishers: int = 20
+    teachers: int = 100
+    courses: int = 2_000
+    lessons_per_course: int = 8
+    reviews: int = 20_000
+    # Zipf exponent of course popularity (reviews and participants); 0 is uniform.
+    popularity_skew: float = 1.0
+    # Build the search postings of the generated courses.
+    search_index: bool = True
+    seed: int = 42
+    batch_size: int = 5_000
+
+
+SCALES = {
+    "tiny": DatasetSpec(users=50, publishers=3, teachers=5, courses=60, lessons_per_course=3, reviews=300),
+    "small": DatasetSpec(),
+    "medium": DatasetSpec(users=20_000, publishers=200, teachers=1_000, courses=50_000, reviews=500_000),
+    "large": DatasetSpec(
+        users=200_000, publishers=1_000, teachers=5_000, courses=100_000, reviews=2_000_000, batch_size=20_000
+    ),
+}
+
+
+def _batches(items, size: int):
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _identity(value):
+    return value
+
+
+def _sentence(randomizer: random.Random, words: int) -> str:
+    return " ".join(randomizer.choices(WORDS, k=words))
+
+
+def _pool(factory: Callable[[], object], size: int = 4_096) -> list:
+    """Pre-generated values to draw from: far cheaper per row than ``factory``."""
+    return [factory() for _ in range(size)]
+
+
+def zipf_weights(count: int, skew: float) -> list[float]:
+    """Cumulative weights of ranks ``1..count`` under a Zipf distribution."""
+    return list(itertools.accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+class BulkWriter:
+    """Stream rows of one model after another into the database.
+
+    ``write`` takes the attribute names the caller supplies and an iterable of
+    tuples in that order; every other concrete field gets its default (or
+    ``now`` for ``auto_now``/``auto_now_add`` fields). Values are adapted per
+    column with the cheapest conversion that the database accepts.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, batch_size: int = 5_000, progress=None):
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.progress = progress or (lambda label, done, total, elapsed: None)
+        self.now = timezone.now()
+        self.written: set[type[models.Model]] = set()
+
+    @property
+    def copy_supported(self) -> bool:
+        return self.connection.vendor == "postgresql"
+
+    def next_id(self, model: type[models.Model]) -> int:
+        return (model.objects.using(self.connection.alias).aggregate(top=Max("pk"))["top"] or 0) + 1
+
+    def write(self, model, fields: tuple[str, ...], rows: Iterable[tuple], total: int | None = None, label=None) -> int:
+        label = label or model._meta.verbose_name_plural
+        given = [model._meta.get_field(name) for name in fields]
+        rest = [field for field in model._meta.concrete_fields if field not in given and not field.primary_key]
+        columns = [field.column for field in given + rest]
+        adapters = [(index, self._adapter(field)) for index, field in enumerate(given)]
+        adapters = [(index, adapt) for index, adapt in adapters if adapt is not None]
+        constants = tuple((self._adapter(field) or _identity)(self._default(field)) for field in rest)
+
+        started = time.perf_counter()
+        written = 0
+        with self.connection.cursor() as cursor:
+            for batch in _batches(rows, self.batch_size):
+                values = [self._adapt(row, adapters) + constants for row in batch]
+                if self.copy_supported:
+                    self._copy(cursor, model._meta.db_table, columns, values)
+                else:
+                    self._insert(cursor, model._meta.db_table, columns, values)
+                written += len(values)
+                self.progress(label, written, total, time.perf_counter() - started)
+        self.written.add(model)
+        return written
+
+    def reset_sequences(self) -> None:
+        """Move id sequences past the explicitly allocated keys (PostgreSQL)."""
+        statements = self.connection.ops.sequence_reset_sql(no_style(), list(self.written))
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def _default(self, field):
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            return self.now
+        if field.has_default():
+            return field.get_default()
+        if field.null:
+            return None
+        return field.get_default()
+
+    def _adapter(self, field) -> Callable | None:
+        """Conversion a value of ``field`` needs before it is sent, if any."""
+        ops = self.connection.ops
+        if isinstance(field, models.JSONField):
+            return json.dumps
+        if isinstance(field, models.DateTimeField):
+            # Generated timestamps repeat (see _pool), so adapt each only once.
+            return functools.lru_cache(maxsize=65_536)(ops.adapt_datetimefield_value)
+        if isinstance(field, models.DateField):
+            return ops.adapt_datefield_value
+        return None
+
+    @staticmethod
+    def _adapt(row: tuple, adapters: list[tuple[int, Callable]]) -> tuple:
+        if not adapters:
+            return row
+        row = list(row)
+        for index, adapt in adapters:
+            row[index] = adapt(row[index])
+        return tuple(row)
+
+    def _insert(self, cursor, table: str, columns: list[str], values: list[tuple]) -> None:
+        quote = self.connection.ops.quote_name
+        placeholders = ", ".join(["%s"] * len(columns))
+        cursor.executemany(
+            f"INSERT INTO {quote(table)} ({', '.join(quote(column) for column in columns)}) VALUES ({placeholders})",
+            values,
+        )
+
+    def _copy(self, cursor, table: str, columns: list[str], values: list[tuple]) -> None:
+        quote = self.connection.ops.quote_name
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in values:
+            writer.writerow(r"\N" if value is None else value for value in row)
+        sql = (
+            f"COPY {quote(table)} ({', '.join(quote(column) for column in columns)}) "
+            "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+@dataclass
+class _CoursePlan:
+    id: int
+    publisher_id: int
+    teacher_id: int
+    language: str
+    title: str
+    description: str
+    ratings: RatingAggregate
+    participants: int
+
+
+def generate_dataset(spec: DatasetSpec, log=None, progress=None, using: str = DEFAULT_DB_ALIAS) -> dict[str, int]:
+    """Insert the synthetic catalog described by ``spec``; returns rows created per table.
+
+    ``log`` receives one line per finished table, ``progress`` is called after
+    every batch with ``(label, rows_done, rows_total, elapsed_seconds)``.
+    """
+    randomizer = random.Random(spec.seed)
+    log = log or (lambda message: None)
+    created: dict[str, int] = {}
+    writer = BulkWriter(using=using, batch_size=spec.batch_size, progress=progress)
+    now = writer.now
+    User = get_user_model()
+
+    def finished(label: str, rows: int, started: float) -> None:
+        created[label] = rows
+        elapsed = time.perf_counter() - started
+        log(f"{label}: {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    with transaction.atomic(using=using):
+        started = time.perf_counter()
+        first_user = writer.next_id(User)
+        password = make_password(BENCH_PASSWORD)
+        user_ids = range(first_user, first_user + spec.users)
+        writer.write(
+            User,
+            ("id", "username", "password", "date_joined"),
+            ((pk, f"bench-user-{pk - first_user}", password, now) for pk in user_ids),
+            total=spec.users,
+        )
+        writer.write(
+            UserProfile, ("user", "active_role"), ((pk, "student") for pk in user_ids), total=spec.users, label="profiles"
+        )
+        finished("users", spec.users, started)
+        created["profiles"] = spec.users
+
+        started = time.perf_counter()
+        first_publisher, first_teacher = writer.next_id(Publisher), writer.next_id(Teacher)
+        publishers = [(first_publisher + index, f"Bench Publisher {index}") for index in range(spec.publishers)]
+        teachers = [(first_teacher + index, f"Bench Teacher {index}") for index in range(spec.teachers)]
+        writer.write(
+            Publisher,
+            ("id", "name", "slug"),
+            ((pk, name, f"bench-publisher-{pk - first_publisher}") for pk, name in publishers),
+        )
+        writer.write(Teacher, ("id", "name", "expertise"), ((pk, name, randomizer.sample(WORDS, 3)) for pk, name in teachers))
+        created["publishers"], created["teachers"] = spec.publishers, spec.teachers
+
+        # Plan the courses first: their aggregate columns depend on the reviews.
+        first_course = writer.next_id(Course)
+        review_total = min(spec.reviews, spec.courses * spec.users)
+        popularity = zipf_weights(spec.courses, spec.popularity_skew)
+        ranks = list(range(spec.courses))
+        randomizer.shuffle(ranks)  # popularity must not follow insertion order
+        review_counts = Counter(randomizer.choices(ranks, cum_weights=popularity, k=review_total))
+        plans: list[_CoursePlan] = []
+        overflow = 0
+        for index, rank in enumerate(ranks):
+            count = review_counts[rank] + overflow
+            overflow = max(count - spec.users, 0)  # a user reviews a course once
+            aggregate = RatingAggregate()
+            quality = RATING_WEIGHTS[randomizer.randrange(len(RATING_WEIGHTS))]
+            for rating, times in Counter(randomizer.choices(RATING_SCALE, weights=quality, k=count - overflow)).items():
+                aggregate.add(rating, times)
+            language = randomizer.choice(LANGUAGES)
+            plans.append(
+                _CoursePlan(
+                    id=first_course + index,
+                    publisher_id=first_publisher + randomizer.randrange(spec.publishers),
+                    teacher_id=first_teacher + randomizer.randrange(spec.teachers),
+                    language=language,
+                    title=f"{_sentence(randomizer, 3).title()} {index}",
+                    description=_sentence(randomizer, 30),
+                    ratings=aggregate,
+                    participants=aggregate.count * randomizer.randint(5, 40) + randomizer.randint(0, 200),
+                )
+            )
+        created["reviews"] = review_total - overflow
+
+        writer.write(
+            Course,
+            (
+                "id", "title", "description", "price_amount", "language", "tags", "participants_count",
+                "published_at", "publisher", "teacher", "rating_count", "rating_sum", "rating_histogram", "rating_avg",
+            ),
+            (
+                (
+                    plan.id, plan.title, plan.description, randomizer.choice(PRICES), plan.language,
+                    randomizer.sample(WORDS, 3), plan.participants,
+                    now - timedelta(minutes=randomizer.randint(0, 60 * 24 * 365 * 3)),
+                    plan.publisher_id, plan.teacher_id, plan.ratings.count, plan.ratings.total,
+                    plan.ratings.histogram, plan.ratings.average,
+                )
+                for plan in plans
+            ),
+            total=spec.courses,
+        )
+        finished("courses", spec.courses, started)
+
+        if spec.search_index:
+            started = time.perf_counter()
+            publisher_names = dict(publishers)
+            teacher_names = dict(teachers)
+
+            def postings():
+                # bulk inserts skip the post_save indexer.
+                for plan in plans:
+                    course = SimpleNamespace(
+                        title=plan.title,
+                        description=plan.description,
+                        language=plan.language,
+                        publisher=SimpleNamespace(name=publisher_names[plan.publisher_id]),
+                        teacher=SimpleNamespace(name=teacher_names[plan.teacher_id]),
+                    )
+                    for term, weight in course_terms(course).items():
+                        yield plan.id, term, weight
+
+            finished("search_postings", writer.write(SearchPosting, ("course", "term", "weight"), postings()), started)
+
+        started = time.perf_counter()
+        lesson_total = spec.courses * spec.lessons_per_course
+        lesson_titles = _pool(lambda: _sentence(randomizer, 3))
+        writer.write(
+            Lesson,
+            ("course", "order", "title", "duration_seconds", "is_free_preview"),
+            (
+                (plan.id, order, f"Lesson {order}: {randomizer.choice(lesson_titles)}", randomizer.randint(120, 3_600), order == 1)
+                for plan in plans
+                for order in range(1, spec.lessons_per_course + 1)
+            ),
+            total=lesson_total,
+        )
+        finished("lessons", lesson_total, started)
+
+        started = time.perf_counter()
+        review_texts = _pool(lambda: _sentence(randomizer, 12))
+        review_times = _pool(lambda: now - timedelta(minutes=randomizer.randint(0, 60 * 24 * 365)))
+
+        def reviews():
+            for plan in plans:
+                histogram = plan.ratings.histogram
+                ratings = [rating for rating, times in zip(RATING_SCALE, histogram) for _ in range(times)]
+                randomizer.shuffle(ratings)
+                authors = randomizer.sample(user_ids, len(ratings))
+                for user_id, rating in zip(authors, ratings):
+                    yield plan.id, user_id, rating, randomizer.choice(review_texts), randomizer.choice(review_times)
+
+        writer.write(Review, ("course", "user", "rating", "text", "created_at"), reviews(), total=created["reviews"])
+        finished("reviews", created["reviews"], started)
+
+        writer.reset_sequences()
+    return created
+
+
+def scaled(name: str, **overrides) -> DatasetSpec:
+    return replace(SCALES[name], **overrides)
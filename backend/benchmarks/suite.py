@@ -0,0 +1,186 @@
+"""Endpoint benchmark suite with baseline comparison.
+
+Each scenario sends requests through the full Django stack (middleware,
+authentication, views, rendering) from a pool of client threads, each with
+its own database connection. For every scenario it records throughput,
+p50/p95/p99 latency and SQL queries per request. Results can be compared
+against a stored baseline (``baseline.json`` next to this module). A p95
+latency or throughput worse than the tolerance, or any increase in queries
+per request, is reported as a regression.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from django.db import connection, connections
+from django.test import Client
+
+from courses.models import Course, Publisher
+
+from .dataset import BENCH_PASSWORD
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Returns (path, payload) for one request.
+    request: Callable[[random.Random], tuple[str, dict | None]]
+    # Fraction of the suite's request count this scenario sends.
+    weight: float = 1.0
+
+
+@dataclass
+class Result:
+    scenario: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: float
+    regressions: list[str] = field(default_factory=list)
+
+
+def build_scenarios() -> list[Scenario]:
+    """Scenarios over the current catalog (seed it with ``benchmarks.dataset`` first)."""
+    course_ids = list(Course.objects.order_by("?").values_list("pk", flat=True)[:500])
+    slugs = list(Publisher.objects.values_list("slug", flat=True)[:50])
+    words = ["spice", "desert", "navigator", "sand worm", "fremen strategy"]
+    usernames = [f"bench-user-{index}" for index in range(50)]
+
+    def catalog_page(rng):
+        return f"/api/courses/?page={rng.randint(1, 20)}", None
+
+    return [
+        Scenario("course_list", "get", catalog_page),
+        Scenario("course_list_cursor", "get", lambda rng: ("/api/courses/?cursor=", None)),
+        Scenario("course_search", "get", lambda rng: (f"/api/courses/?search={rng.choice(words)}", None)),
+        Scenario(
+            "course_order",
+            "get",
+            lambda rng: (
+                f"/api/courses/?ordering={rng.choice(['-rating_avg', '-participants_count', 'price_amount'])}",
+                None,
+            ),
+        ),
+        Scenario("course_filter", "get", lambda rng: (f"/api/courses/?publisher={rng.choice(slugs)}", None)),
+        Scenario("course_detail", "get", lambda rng: (f"/api/courses/{rng.choice(course_ids)}/", None)),
+        Scenario("lessons_by_course", "get", lambda rng: (f"/api/lessons/?course={rng.choice(course_ids)}", None)),
+        Scenario("course_reviews", "get", lambda rng: (f"/api/courses/{rng.choice(course_ids)}/reviews/", None)),
+        # Password hashing dominates token requests, so they get a smaller share.
+        Scenario(
+            "token_obtain",
+            "post",
+            lambda rng: ("/api/token/", {"username": rng.choice(usernames), "password": BENCH_PASSWORD}),
+            weight=0.05,
+        ),
+    ]
+
+
+def _percentile(ordered: list[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))]
+
+
+def run_scenario(scenario: Scenario, requests: int, concurrency: int, seed: int = 42) -> Result:
+    latencies: list[float] = []
+    query_counts: list[int] = []
+    errors = 0
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed + index)
+        client = Client()
+        queries = 0
+
+        def count(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        try:
+            with connection.execute_wrapper(count):
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    path, payload = scenario.request(rng)
+                    queries = 0
+                    started = time.perf_counter()
+                    if payload is None:
+                        response = getattr(client, scenario.method)(path)
+                    else:
+                        response = getattr(client, scenario.method)(path, payload, content_type="application/json")
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        if response.status_code >= 400:
+                            errors += 1
+                        else:
+                            latencies.append(elapsed)
+                            query_counts.append(queries)
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return Result(
+        scenario=scenario.name,
+        requests=requests,
+        errors=errors,
+        rps=round(len(ordered) / elapsed, 1),
+        p50_ms=round(_percentile(ordered, 50), 2),
+        p95_ms=round(_percentile(ordered, 95), 2),
+        p99_ms=round(_percentile(ordered, 99), 2),
+        queries=round(statistics.fmean(query_counts), 2) if query_counts else 0.0,
+    )
+
+
+def compare(result: Result, baseline: dict | None, tolerance: float) -> list[str]:
+    """Describe how ``result`` regressed against its ``baseline`` entry."""
+    if not baseline:
+        return []
+    regressions = []
+    if result.p95_ms > baseline["p95_ms"] * (1 + tolerance):
+        regressions.append(f"p95 {baseline['p95_ms']} -> {result.p95_ms} ms")
+    if result.rps < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"throughput {baseline['rps']} -> {result.rps} req/s")
+    if result.queries > baseline["queries"]:
+        regressions.append(f"queries {baseline['queries']} -> {result.queries} per request")
+    if result.errors > baseline.get("errors", 0):
+        regressions.append(f"errors {baseline.get('errors', 0)} -> {result.errors}")
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(scale: str, results: list[Result], path: Path = BASELINE_PATH) -> None:
+    baselines = load_baseline(path)
+    baselines[scale] = {
+        result.scenario: {key: value for key, value in asdict(result).items() if key not in ("scenario", "regressions")}
+        for result in results
+    }
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
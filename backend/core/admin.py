@@ -1,6 +1,17 @@
 from django.contrib import admin
 
-from .models import Course, Lesson, LessonNote, LessonProgress, RoleAssignment, UserProfile
+from .models import (
+    Course,
+    CourseDailyStats,
+    Lesson,
+    LessonDailyStats,
+    LessonNote,
+    LessonProgress,
+    RoleAssignment,
+    TokenRevocation,
+    UploadSession,
+    UserProfile,
+)
 
 
 @admin.register(UserProfile)
@@ -45,3 +56,29 @@ class LessonNoteAdmin(admin.ModelAdmin):
     list_display = ["user", "lesson", "timestamp", "updated_at"]
     search_fields = ["user__username", "lesson__title", "body"]
     list_filter = ["lesson__course"]
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ["lesson", "user", "filename", "total_size", "expires_at", "updated_at"]
+    search_fields = ["filename", "user__username", "lesson__title"]
+
+
+@admin.register(TokenRevocation)
+class TokenRevocationAdmin(admin.ModelAdmin):
+    list_display = ["jti", "user", "revoked_at", "expires_at"]
+    search_fields = ["jti", "user__username"]
+
+
+@admin.register(LessonDailyStats)
+class LessonDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ["lesson", "day", "viewers", "average_position", "completion_ratio"]
+    list_filter = ["course"]
+    date_hierarchy = "day"
+
+
+@admin.register(CourseDailyStats)
+class CourseDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ["course", "day", "viewers", "lesson_views", "completion_ratio"]
+    list_filter = ["course"]
+    date_hierarchy = "day"
@@ -0,0 +1,218 @@
+"""Daily studio analytics rolled up from lesson progress.
+
+``LessonProgress`` holds one row per viewer and lesson with the last position
+reached. ``rollup_progress`` aggregates those rows into
+:class:`~core.models.LessonDailyStats` and :class:`~core.models.CourseDailyStats`,
+grouped by the day each row was last written:
+
+* ``viewers`` – progress rows (per course: distinct users);
+* ``average_position`` – mean last position in seconds (lessons only);
+* ``completions``/``completion_ratio`` – viewers past ``COMPLETION_RATIO`` of
+  ``Lesson.duration_seconds``;
+* ``dropoff`` – viewers per ``DROPOFF_BUCKETS`` equal slices of the lesson,
+  by the slice their position falls in (the end counts as the last slice).
+
+Runs are incremental. A :class:`~core.models.RollupCheckpoint` records how
+far the last run read. The next run finds the progress written since then
+(minus ``LAG`` seconds, for transactions that committed late) and recomputes,
+for those rows' courses, the days they are now written on and the days they
+were counted on before (``LessonProgress.rollup_day``): a viewer only counts
+on the day of their latest write, so a row written again leaves its earlier
+day. An incremental run thus leaves the same figures as a rebuild. Lessons
+without a duration have no completions or drop-off.
+
+The ``rollup_studio_analytics`` job re-enqueues itself every ``INTERVAL``
+seconds once started (``manage.py rollup_studio_analytics --schedule``).
+Defaults come from ``settings.STUDIO_ANALYTICS``.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import enqueue, task, task_name
+
+from .models import CourseDailyStats, LessonDailyStats, LessonProgress, RollupCheckpoint
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT = "studio-analytics"
+
+DEFAULT_SETTINGS = {
+    "INTERVAL": 300,
+    "QUEUE": "analytics",
+    "LAG": 300,
+    "COMPLETION_RATIO": 0.9,
+    "DROPOFF_BUCKETS": 4,
+    "BATCH_SIZE": 500,
+}
+
+
+def analytics_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "STUDIO_ANALYTICS", {})}
+
+
+def _midnight(day: date) -> datetime:
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def _on_days(field: str, days) -> Q:
+    """Match ``field`` falling on any of ``days`` (as ranges, so its index can be used)."""
+    return reduce(
+        or_,
+        (
+            Q(**{f"{field}__gte": _midnight(day), f"{field}__lt": _midnight(day + timedelta(days=1))})
+            for day in sorted(days)
+        ),
+    )
+
+
+def _lesson_stats(progress, config: dict) -> list[LessonDailyStats]:
+    # Integer arithmetic only: position / duration >= x is compared as position * n >= duration * x * n.
+    duration = F("lesson__duration_seconds")
+    timed = Q(lesson__duration_seconds__gt=0)
+    buckets = config["DROPOFF_BUCKETS"]
+    slices = {
+        f"slice_{index}": Count(
+            "id",
+            filter=timed
+            & Q(bucket_position__gte=duration * index)
+            & (Q(bucket_position__lt=duration * (index + 1)) if index < buckets - 1 else Q()),
+        )
+        for index in range(buckets)
+    }
+    completed = Q(permille_position__gte=duration * round(config["COMPLETION_RATIO"] * 1000))
+    rows = (
+        progress.alias(bucket_position=F("last_position") * buckets, permille_position=F("last_position") * 1000)
+        .values("lesson_id", "lesson__course_id", "day")
+        .annotate(
+            viewers=Count("id"),
+            average_position=Avg("last_position"),
+            completions=Count("id", filter=timed & completed),
+            **slices,
+        )
+        .order_by()
+    )
+    return [
+        LessonDailyStats(
+            lesson_id=row["lesson_id"],
+            course_id=row["lesson__course_id"],
+            day=row["day"],
+            viewers=row["viewers"],
+            average_position=float(row["average_position"] or 0),
+            completions=row["completions"],
+            completion_ratio=row["completions"] / row["viewers"],
+            dropoff=[row[name] for name in slices],
+        )
+        for row in rows
+    ]
+
+
+def _course_stats(progress, lesson_stats: list[LessonDailyStats]) -> list[CourseDailyStats]:
+    viewers = {
+        (row["lesson__course_id"], row["day"]): row["viewers"]
+        for row in progress.values("lesson__course_id", "day").annotate(viewers=Count("user", distinct=True)).order_by()
+    }
+    totals: dict[tuple, CourseDailyStats] = {}
+    for stats in lesson_stats:
+        key = (stats.course_id, stats.day)
+        course = totals.get(key)
+        if course is None:
+            course = totals[key] = CourseDailyStats(
+                course_id=stats.course_id, day=stats.day, viewers=viewers[key], dropoff=[0] * len(stats.dropoff)
+            )
+        course.lesson_views += stats.viewers
+        course.completions += stats.completions
+        course.dropoff = [total + count for total, count in zip(course.dropoff, stats.dropoff)]
+    for course in totals.values():
+        course.completion_ratio = course.completions / course.lesson_views
+    return list(totals.values())
+
+
+def rollup_courses(course_ids, days, config: dict | None = None) -> tuple[int, int]:
+    """Recompute the stats of ``course_ids`` on ``days`` (every course or day if ``None``)."""
+    config = config or analytics_settings()
+    progress = LessonProgress.objects.annotate(day=TruncDate("updated_at"))
+    lessons, courses = LessonDailyStats.objects.all(), CourseDailyStats.objects.all()
+    if course_ids is not None:
+        progress = progress.filter(lesson__course_id__in=course_ids)
+        lessons, courses = lessons.filter(course_id__in=course_ids), courses.filter(course_id__in=course_ids)
+    if days is not None:
+        if not days:
+            return 0, 0
+        progress = progress.filter(_on_days("updated_at", days))
+        lessons, courses = lessons.filter(day__in=days), courses.filter(day__in=days)
+
+    lesson_stats = _lesson_stats(progress, config)
+    course_stats = _course_stats(progress, lesson_stats)
+    with transaction.atomic():
+        lessons.delete()
+        courses.delete()
+        LessonDailyStats.objects.bulk_create(lesson_stats, batch_size=config["BATCH_SIZE"])
+        CourseDailyStats.objects.bulk_create(course_stats, batch_size=config["BATCH_SIZE"])
+    return len(lesson_stats), len(course_stats)
+
+
+def rollup_progress(rebuild: bool = False) -> dict:
+    """Roll up the progress written since the last run (everything if ``rebuild`` or on the first run)."""
+    config = analytics_settings()
+    started = timezone.now()
+    checkpoint = None if rebuild else RollupCheckpoint.objects.filter(name=CHECKPOINT).first()
+    summary = {"courses": 0, "lesson_days": 0, "course_days": 0}
+
+    if checkpoint is None:
+        changed = LessonProgress.objects.all()
+        summary["lesson_days"], summary["course_days"] = rollup_courses(None, None, config)
+        summary["courses"] = CourseDailyStats.objects.values("course_id").distinct().count()
+    else:
+        changed = LessonProgress.objects.filter(updated_at__gte=checkpoint.watermark - timedelta(seconds=config["LAG"]))
+        # Each changed row's current day, and the day it was counted on so far.
+        affected: dict[int, set[date]] = {}
+        for course_id, day, rollup_day in (
+            changed.annotate(day=TruncDate("updated_at"))
+            .values_list("lesson__course_id", "day", "rollup_day")
+            .distinct()
+            .order_by()
+        ):
+            affected.setdefault(course_id, set()).update(filter(None, (day, rollup_day)))
+        course_ids = sorted(affected)
+        summary["courses"] = len(course_ids)
+        for offset in range(0, len(course_ids), config["BATCH_SIZE"]):
+            batch = course_ids[offset : offset + config["BATCH_SIZE"]]
+            days = set().union(*(affected[course_id] for course_id in batch))
+            lesson_days, course_days = rollup_courses(batch, days, config)
+            summary["lesson_days"] += lesson_days
+            summary["course_days"] += course_days
+
+    # Rows written from now on keep their old day until the next run has recomputed it.
+    changed.filter(updated_at__lt=started).update(rollup_day=TruncDate("updated_at"))
+    RollupCheckpoint.objects.update_or_create(name=CHECKPOINT, defaults={"watermark": started})
+    return summary
+
+
+def schedule_rollup(delay: float = 0) -> Job | None:
+    """Enqueue the periodic rollup job unless one is already waiting."""
+    if Job.objects.filter(name=task_name(rollup_studio_analytics), status=Job.QUEUED).exists():
+        return None
+    return enqueue(rollup_studio_analytics, queue=analytics_settings()["QUEUE"], delay=delay)
+
+
+@task(queue="analytics", max_attempts=1)
+def rollup_studio_analytics() -> None:
+    try:
+        summary = rollup_progress()
+        logger.info("Studio analytics rolled up: %s", summary)
+    finally:
+        # One failed run must not stop the schedule; the next run picks up where this one left off.
+        schedule_rollup(delay=analytics_settings()["INTERVAL"])
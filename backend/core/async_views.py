@@ -0,0 +1,71 @@
+"""Async health and progress heartbeat endpoints for ASGI deployments.
+
+Heartbeats are the hottest write path: every playing client sends one every
+few seconds. Served by these views under ASGI, a heartbeat costs a coroutine
+instead of a worker thread, and the lesson lookup goes through the async ORM.
+Token checks and the progress buffer are synchronous (the buffer may sit in a
+database-backed cache) and run through ``sync_to_async``.
+
+The payloads match ``HealthCheckView`` and ``LessonViewSet.progress``.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import TokenUserAuthentication
+from .models import Lesson
+from .progress_buffer import read_progress, record_progress
+from .serializers import LessonProgressSerializer
+
+
+def _error(detail, status: int) -> JsonResponse:
+    return JsonResponse(detail if isinstance(detail, dict) else {"detail": detail}, status=status)
+
+
+@sync_to_async
+def _authenticate(request):
+    result = TokenUserAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+@require_GET
+async def healthz(request):
+    return JsonResponse({"ok": True, "service": "dunetube-api"})
+
+
+@csrf_exempt
+@require_http_methods(["GET", "PATCH"])
+async def lesson_progress(request, pk):
+    try:
+        user = await _authenticate(request)
+    except AuthenticationFailed as exc:
+        return _error(exc.detail, 401)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+    if not await Lesson.objects.filter(pk=pk).aexists():
+        return _error("No Lesson matches the given query.", 404)
+
+    if request.method == "GET":
+        progress = await sync_to_async(read_progress)(user.id, pk)
+        if progress is None:
+            return JsonResponse({"last_position": 0, "updated_at": None})
+        return JsonResponse(LessonProgressSerializer(progress).data)
+
+    try:
+        last_position = json.loads(request.body or b"{}").get("last_position")
+    except (ValueError, AttributeError):
+        return _error("JSON parse error", 400)
+    if last_position is None:
+        return _error("last_position is required", 400)
+    try:
+        position_value = max(int(last_position), 0)
+    except (TypeError, ValueError):
+        return _error("last_position must be an integer", 400)
+
+    progress = await sync_to_async(record_progress)(user.id, pk, position_value)
+    return JsonResponse(LessonProgressSerializer(progress).data)
@@ -0,0 +1,194 @@
+"""Stateless JWT authentication for read-mostly and heartbeat endpoints.
+
+``TokenUserAuthentication`` trusts the signed claims of an access token (user
+id, ``username``, ``is_superuser`` and the role claims added by
+``core.tokens``) instead of loading the ``User`` row on every request; the
+request user is a ``ClaimsUser`` whose ``id`` is the integer user id. Tokens
+that passed signature verification are kept in a small per-process LRU keyed
+on the raw token, so a player sending heartbeats with the same token is only
+verified once. Every request is still checked against an in-memory revocation
+list, which keeps sessions killable.
+
+Configured through ``settings.TOKEN_AUTH``::
+
+    TOKEN_AUTH = {
+        "LRU_SIZE": 1024,
+        "REVOCATION_REFRESH": 5,
+    }
+
+Revocations live in ``TokenRevocation`` rows (see ``revoke_token``,
+``revoke_user_tokens`` and ``manage.py revoke_tokens``). Each process reloads
+them at most every ``REVOCATION_REFRESH`` seconds, which bounds how long a
+revoked token keeps working on other workers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenRevocation
+
+DEFAULT_SETTINGS = {
+    "LRU_SIZE": 1024,
+    "REVOCATION_REFRESH": 5,
+}
+
+
+def auth_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "TOKEN_AUTH", {})}
+
+
+class ClaimsUser(TokenUser):
+    """``TokenUser`` with the integer id the ``User`` row has.
+
+    The user id claim is serialised as a string, which would never match the
+    integer ids of the database when filtering or comparing rows.
+    """
+
+    @cached_property
+    def id(self) -> int:
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of tokens whose signature has been verified."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tokens: OrderedDict[bytes, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw_token: bytes):
+        with self._lock:
+            token = self._tokens.get(raw_token)
+            if token is not None:
+                self._tokens.move_to_end(raw_token)
+            return token
+
+    def put(self, raw_token: bytes, token) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._tokens[raw_token] = token
+            self._tokens.move_to_end(raw_token)
+            while len(self._tokens) > self.size:
+                self._tokens.popitem(last=False)
+
+    def discard(self, raw_token: bytes) -> None:
+        with self._lock:
+            self._tokens.pop(raw_token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+class RevocationList:
+    """In-memory copy of the unexpired ``TokenRevocation`` rows."""
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._jtis: frozenset[str] = frozenset()
+        self._users: dict[str, float] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        jtis, users = set(), {}
+        rows = TokenRevocation.objects.filter(expires_at__gt=timezone.now()).values_list("jti", "user_id", "revoked_at")
+        for jti, user_id, revoked_at in rows:
+            if jti:
+                jtis.add(jti)
+            if user_id is not None:
+                users[str(user_id)] = max(users.get(str(user_id), 0), revoked_at.timestamp())
+        with self._lock:
+            self._jtis, self._users = frozenset(jtis), users
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _ensure_fresh(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.refresh_interval:
+            self.load()
+
+    def is_revoked(self, token) -> bool:
+        self._ensure_fresh()
+        if token.get(api_settings.JTI_CLAIM) in self._jtis:
+            return True
+        revoked_at = self._users.get(str(token.get(api_settings.USER_ID_CLAIM)))
+        # Tokens issued in the same second as the revocation are treated as revoked.
+        return revoked_at is not None and token.get("iat", 0) <= revoked_at
+
+
+_verified_tokens: VerifiedTokenCache | None = None
+_revocations: RevocationList | None = None
+_state_lock = threading.Lock()
+
+
+def _state() -> tuple[VerifiedTokenCache, RevocationList]:
+    global _verified_tokens, _revocations
+    if _verified_tokens is None or _revocations is None:
+        with _state_lock:
+            if _verified_tokens is None or _revocations is None:
+                config = auth_settings()
+                _verified_tokens = VerifiedTokenCache(config["LRU_SIZE"])
+                _revocations = RevocationList(config["REVOCATION_REFRESH"])
+    return _verified_tokens, _revocations
+
+
+def reset_token_auth() -> None:
+    """Drop the verified tokens and revocations so the next request reloads them."""
+    global _verified_tokens, _revocations
+    with _state_lock:
+        _verified_tokens = _revocations = None
+
+
+def _expiry(token) -> datetime:
+    return datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+
+
+def revoke_token(token) -> TokenRevocation:
+    """Revoke a single validated access token by its ``jti``."""
+    revocation = TokenRevocation.objects.create(jti=token[api_settings.JTI_CLAIM], expires_at=_expiry(token))
+    _state()[1].invalidate()
+    return revocation
+
+
+def revoke_user_tokens(user_id) -> TokenRevocation:
+    """Revoke every access token issued to ``user_id`` until now."""
+    revocation = TokenRevocation.objects.create(
+        user_id=user_id,
+        expires_at=timezone.now() + api_settings.ACCESS_TOKEN_LIFETIME,
+    )
+    _state()[1].invalidate()
+    return revocation
+
+
+class TokenUserAuthentication(JWTStatelessUserAuthentication):
+    """``JWTStatelessUserAuthentication`` with a verified-token LRU and revocation checks."""
+
+    def get_validated_token(self, raw_token: bytes):
+        verified_tokens, revocations = _state()
+        token = verified_tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            verified_tokens.put(raw_token, token)
+        elif token["exp"] <= time.time():
+            verified_tokens.discard(raw_token)
+            token = super().get_validated_token(raw_token)
+        if revocations.is_revoked(token):
+            raise InvalidToken({"detail": "Token has been revoked", "code": "token_revoked"})
+        return token
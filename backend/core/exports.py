@@ -0,0 +1,179 @@
+"""Streaming bulk exports of studio data as NDJSON or CSV.
+
+A creator exports the courses they own, those courses' lessons, or the
+viewers' :class:`~core.models.LessonProgress` on them; admins can export
+everyone's. Rows are read with ``values_list().iterator(chunk_size=...)``,
+which uses a server-side cursor on PostgreSQL and fetches in batches
+elsewhere, and each batch is encoded and yielded before the next is read. A
+``StreamingHttpResponse`` (or the ``export_studio_data`` command) therefore
+holds one batch in memory however many rows are exported.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound, ValidationError
+
+from .models import Course, Lesson, LessonProgress
+
+DEFAULT_CHUNK_SIZE = 2000
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Spreadsheet apps evaluate cells starting with these as formulas.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type[models.Model]
+    columns: tuple[str, ...]
+    # Lookup from the model to the owning user.
+    owner_lookup: str
+
+    def queryset(self, owner=None):
+        queryset = self.model.objects.all()
+        if owner is not None:
+            queryset = queryset.filter(**{self.owner_lookup: owner})
+        return queryset.order_by("pk").values_list(*self.columns)
+
+
+DATASETS = {
+    "courses": Dataset(
+        Course,
+        (
+            "id",
+            "owner_id",
+            "title",
+            "language",
+            "publisher",
+            "price_amount",
+            "price_currency",
+            "tags",
+            "created_at",
+            "updated_at",
+        ),
+        owner_lookup="owner",
+    ),
+    "lessons": Dataset(
+        Lesson,
+        ("id", "course_id", "position", "title", "duration_seconds", "media_status", "created_at", "updated_at"),
+        owner_lookup="course__owner",
+    ),
+    "progress": Dataset(
+        LessonProgress,
+        ("id", "user_id", "lesson__course_id", "lesson_id", "last_position", "created_at", "updated_at"),
+        owner_lookup="lesson__course__owner",
+    ),
+}
+
+
+def chunk_size() -> int:
+    return getattr(settings, "STUDIO_EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def get_dataset(name: str) -> Dataset:
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise NotFound(f"Unknown export {name!r}; choose one of {', '.join(DATASETS)}.")
+
+
+def get_format(name: str) -> str:
+    if name not in FORMATS:
+        raise ValidationError({"format": [f"Choose one of {', '.join(FORMATS)}."]})
+    return name
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, (datetime, date)):
+        return value.isoformat()
+    elif isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _JSONEncoder(DjangoJSONEncoder):
+    # Keep microseconds, as the CSV export does (DjangoJSONEncoder truncates them).
+    def default(self, o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _Buffer:
+    """A file-like sink for ``csv.writer`` that hands back what was written."""
+
+    def __init__(self):
+        self.parts: list[str] = []
+
+    def write(self, value: str):
+        self.parts.append(value)
+
+    def drain(self) -> bytes:
+        data = "".join(self.parts).encode()
+        self.parts.clear()
+        return data
+
+
+def iter_ndjson(columns: tuple[str, ...], rows: Iterable[tuple], size: int) -> Iterator[bytes]:
+    encoder = _JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for batch in _batches(rows, size):
+        yield "".join(encoder.encode(dict(zip(columns, row))) + "\n" for row in batch).encode()
+
+
+def iter_csv(columns: tuple[str, ...], rows: Iterable[tuple], size: int) -> Iterator[bytes]:
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.drain()
+    for batch in _batches(rows, size):
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.drain()
+
+
+def iter_export(dataset: Dataset, export_format: str, owner=None, size: int | None = None) -> Iterator[bytes]:
+    """Yield ``dataset`` (limited to ``owner``'s courses, if given) encoded as ``export_format``."""
+    size = size or chunk_size()
+    rows = dataset.queryset(owner).iterator(chunk_size=size)
+    # Headers use "course_id" rather than the "lesson__course_id" lookup.
+    columns = tuple(column.rsplit("__", 1)[-1] for column in dataset.columns)
+    encode = iter_ndjson if export_format == "ndjson" else iter_csv
+    return encode(columns, rows, size)
+
+
+def export_response(name: str, export_format: str, owner=None) -> StreamingHttpResponse:
+    dataset = get_dataset(name)
+    export_format = get_format(export_format)
+    response = StreamingHttpResponse(
+        iter_export(dataset, export_format, owner),
+        content_type=f"{FORMATS[export_format]}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.{export_format}"'
+    return response
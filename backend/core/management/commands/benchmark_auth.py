@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.authentication import TokenUserAuthentication, reset_token_auth
+from core.tokens import access_token_for
+
+
+class Command(BaseCommand):
+    help = "Measure per-request JWT authentication overhead with and without the stateless fast path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000, help="Requests per mode (default: 5000).")
+        parser.add_argument(
+            "--tokens",
+            type=int,
+            default=50,
+            help="Distinct users/tokens cycled through (default: 50).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            User = get_user_model()
+            users = [User.objects.create(username=f"auth-bench-{index}") for index in range(options["tokens"])]
+            headers = [f"Bearer {access_token_for(user)}" for user in users]
+            reset_token_auth()
+            self.stdout.write(f"{'mode':>10} {'p50 us':>8} {'p95 us':>8} {'mean us':>8} {'queries':>8}")
+            for mode, authenticator in (
+                ("database", JWTAuthentication()),
+                ("stateless", TokenUserAuthentication()),
+            ):
+                timings, queries = self._run(authenticator, headers, options["requests"])
+                self.stdout.write(
+                    f"{mode:>10} {statistics.median(timings):>8.1f} "
+                    f"{statistics.quantiles(timings, n=20)[-1]:>8.1f} {statistics.fmean(timings):>8.1f} {queries:>8}"
+                )
+            reset_token_auth()
+            transaction.set_rollback(True)
+        self.stdout.write("queries is the total for all requests, including revocation list reloads.")
+
+    def _run(self, authenticator, headers: list[str], count: int) -> tuple[list[float], int]:
+        factory = APIRequestFactory()
+        requests = [
+            Request(factory.get("/api/lessons/", HTTP_AUTHORIZATION=headers[index % len(headers)]))
+            for index in range(count)
+        ]
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for request in requests:
+                started = time.perf_counter()
+                authenticator.authenticate(request)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+        return timings, len(queries)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Course, Lesson
+from core.progress_buffer import flush_progress_buffer, get_progress_buffer, reset_progress_buffer
+from core.views import LessonViewSet
+
+
+class WriteCounter:
+    """``execute_wrapper`` hook counting INSERT/UPDATE/DELETE statements."""
+
+    def __init__(self):
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().split(" ", 1)[0].upper() in {"INSERT", "UPDATE", "DELETE"}:
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Compare database writes of direct vs buffered lesson progress heartbeats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--viewers", type=int, default=200, help="Concurrent viewers (default: 200).")
+        parser.add_argument(
+            "--duration",
+            type=int,
+            default=60,
+            help="Simulated viewing time in seconds (default: 60).",
+        )
+        parser.add_argument(
+            "--heartbeat",
+            type=int,
+            default=5,
+            help="Seconds between player heartbeats (default: 5).",
+        )
+        parser.add_argument(
+            "--flush-interval",
+            type=int,
+            default=15,
+            help="Seconds between buffer flushes (default: 15).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            viewers = self._fixtures(options["viewers"])
+            self.stdout.write(f"{'mode':>9} {'requests':>9} {'db writes':>10} {'writes/s':>9} {'req/s':>9}")
+            for mode in ("direct", "buffered"):
+                requests, writes, elapsed = self._run(mode, viewers, options)
+                simulated_writes_per_second = writes / options["duration"]
+                self.stdout.write(
+                    f"{mode:>9} {requests:>9} {writes:>10} {simulated_writes_per_second:>9.1f} {requests / elapsed:>9.0f}"
+                )
+            transaction.set_rollback(True)
+        self.stdout.write("writes/s is per simulated second of viewing; req/s is wall-clock handler throughput.")
+
+    def _fixtures(self, count: int):
+        User = get_user_model()
+        course = Course.objects.create(
+            title="Progress benchmark",
+            description="Synthetic course for heartbeat load.",
+            price_amount=0,
+            price_currency="USD",
+            language="en",
+            publisher="Benchmarks",
+        )
+        lesson = Lesson.objects.create(course=course, title="Heartbeat", video_url="https://example.com/v.mp4")
+        users = [User.objects.create(username=f"progress-bench-{index}") for index in range(count)]
+        return [(user, lesson) for user in users]
+
+    def _run(self, mode: str, viewers, options) -> tuple[int, int, float]:
+        backend = None if mode == "direct" else "core.progress_buffer.LocalProgressBuffer"
+        config = {"BACKEND": backend, "FLUSH_INTERVAL": None, "OPTIONS": {}}
+        view = LessonViewSet.as_view({"patch": "progress"})
+        factory = APIRequestFactory()
+        counter = WriteCounter()
+        requests = 0
+        flush_every = max(1, options["flush_interval"] // options["heartbeat"])
+
+        reset_progress_buffer()
+        with override_settings(PROGRESS_BUFFER=config), connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            for tick in range(1, options["duration"] // options["heartbeat"] + 1):
+                for user, lesson in viewers:
+                    request = factory.patch(
+                        f"/lessons/{lesson.pk}/progress/",
+                        {"last_position": tick * options["heartbeat"]},
+                        format="json",
+                    )
+                    force_authenticate(request, user=user)
+                    view(request, pk=lesson.pk)
+                    requests += 1
+                if backend and tick % flush_every == 0:
+                    flush_progress_buffer(get_progress_buffer())
+            if backend:
+                flush_progress_buffer(get_progress_buffer())
+            elapsed = time.perf_counter() - started
+        reset_progress_buffer()
+        return requests, counter.writes, elapsed
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import DATASETS, FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream a studio dataset (courses, lessons or progress) as NDJSON or CSV to stdout or a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("--format", dest="export_format", choices=sorted(FORMATS), default="ndjson")
+        parser.add_argument("--owner", help="Only export courses owned by this username.")
+        parser.add_argument("--output", "-o", help="Write to this file instead of stdout.")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched per batch.")
+
+    def handle(self, *args, **options):
+        owner = None
+        if options["owner"]:
+            try:
+                owner = get_user_model().objects.get(username=options["owner"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user named {options['owner']!r}.")
+        chunks = iter_export(DATASETS[options["dataset"]], options["export_format"], owner, options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
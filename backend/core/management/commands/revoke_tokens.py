@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.authentication import revoke_token, revoke_user_tokens
+
+
+class Command(BaseCommand):
+    help = "Revoke access tokens accepted by the stateless token authentication."
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument("--user", help="Revoke every access token issued to this username so far.")
+        group.add_argument("--token", help="Revoke a single encoded access token.")
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(**{User.USERNAME_FIELD: options["user"]})
+            except User.DoesNotExist:
+                raise CommandError(f"Unknown user {options['user']!r}.")
+            revoke_user_tokens(user.pk)
+            self.stdout.write(self.style.SUCCESS(f"Revoked every token issued to {options['user']} so far."))
+            return
+        try:
+            token = AccessToken(options["token"])
+        except TokenError as exc:
+            raise CommandError(f"Invalid token: {exc}")
+        revoke_token(token)
+        self.stdout.write(self.style.SUCCESS(f"Revoked token {token['jti']}."))
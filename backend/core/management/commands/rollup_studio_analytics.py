@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.analytics import analytics_settings, rollup_progress, schedule_rollup
+
+
+class Command(BaseCommand):
+    help = "Roll lesson progress written since the last run up into the daily studio analytics tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recompute every day from all progress rows.")
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Enqueue the periodic rollup job instead (it re-enqueues itself every INTERVAL seconds).",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            job = schedule_rollup()
+            if job is None:
+                self.stdout.write("A rollup job is already queued.")
+            else:
+                interval = analytics_settings()["INTERVAL"]
+                self.stdout.write(self.style.SUCCESS(f"Queued job {job.pk}; it repeats every {interval}s."))
+            return
+        summary = rollup_progress(rebuild=options["rebuild"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {summary['courses']} courses: {summary['lesson_days']} lesson days, "
+                f"{summary['course_days']} course days."
+            )
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Lesson
+from core.transcoding import process_lesson_media
+
+
+class Command(BaseCommand):
+    help = "Probe and package lesson videos as HLS (pending or failed ones unless lessons are given)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("lesson_ids", nargs="*", type=int, help="Lessons to (re)process.")
+        parser.add_argument("--all", action="store_true", help="Reprocess every lesson with an uploaded video.")
+
+    def handle(self, *args, **options):
+        lessons = Lesson.objects.exclude(video_file="").exclude(video_file__isnull=True)
+        if options["lesson_ids"]:
+            lessons = lessons.filter(pk__in=options["lesson_ids"])
+        elif not options["all"]:
+            lessons = lessons.exclude(media_status=Lesson.MEDIA_READY)
+
+        ready = failed = 0
+        for lesson_id in lessons.order_by("pk").values_list("pk", flat=True):
+            process_lesson_media(lesson_id)
+            lesson = Lesson.objects.only("media_status", "media_info").get(pk=lesson_id)
+            if lesson.media_status == Lesson.MEDIA_READY:
+                ready += 1
+            else:
+                failed += 1
+                self.stderr.write(f"Lesson {lesson_id}: {lesson.media_info.get('error', lesson.media_status)}")
+        self.stdout.write(self.style.SUCCESS(f"Packaged {ready} lessons, {failed} failed."))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:47
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_updated_at(apps, schema_editor):
+    # Existing rows only know their last write time.
+    LessonProgress = apps.get_model("core", "LessonProgress")
+    LessonProgress.objects.update(reported_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_assign_course_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonprogress',
+            name='reported_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:42
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_lessonprogress_reported_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("filename", models.CharField(max_length=255)),
+                ("total_size", models.PositiveBigIntegerField()),
+                ("chunk_size", models.PositiveIntegerField()),
+                ("checksum", models.CharField(blank=True, max_length=64)),
+                ("received_chunks", models.JSONField(blank=True, default=list)),
+                ("expires_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("lesson", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="upload_sessions", to="core.lesson")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="upload_sessions", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["expires_at"], name="core_upload_expires_3c6aed_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_lesson_media_processing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('viewers', models.PositiveIntegerField(default=0)),
+                ('lesson_views', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('completion_ratio', models.FloatField(default=0)),
+                ('dropoff', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LessonDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('viewers', models.PositiveIntegerField(default=0)),
+                ('average_position', models.FloatField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('completion_ratio', models.FloatField(default=0)),
+                ('dropoff', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['day', 'lesson_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('watermark', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lessonprogress',
+            index=models.Index(fields=['updated_at'], name='lesson_progress_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='coursedailystats',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='core.course'),
+        ),
+        migrations.AddField(
+            model_name='lessondailystats',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lesson_daily_stats', to='core.course'),
+        ),
+        migrations.AddField(
+            model_name='lessondailystats',
+            name='lesson',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='core.lesson'),
+        ),
+        migrations.AddConstraint(
+            model_name='coursedailystats',
+            constraint=models.UniqueConstraint(fields=('course', 'day'), name='course_daily_stats_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='lessondailystats',
+            index=models.Index(fields=['course', 'day'], name='lesson_daily_stats_course_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='lessondailystats',
+            constraint=models.UniqueConstraint(fields=('lesson', 'day'), name='lesson_daily_stats_unique'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:51
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def count_on_last_write(apps, schema_editor):
+    # Rolled-up rows were counted on the day of their last write.
+    LessonProgress = apps.get_model("core", "LessonProgress")
+    LessonProgress.objects.update(rollup_day=TruncDate("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_studio_analytics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonprogress',
+            name='rollup_day',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(count_on_last_write, migrations.RunPython.noop),
+    ]
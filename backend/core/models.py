@@ -1,5 +1,8 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class UserProfile(models.Model):
@@ -56,6 +59,17 @@ class Course(models.Model):
 
 
 class Lesson(models.Model):
+    MEDIA_PENDING = "pending"
+    MEDIA_PROCESSING = "processing"
+    MEDIA_READY = "ready"
+    MEDIA_FAILED = "failed"
+    MEDIA_STATUS_CHOICES = [
+        (MEDIA_PENDING, "Pending"),
+        (MEDIA_PROCESSING, "Processing"),
+        (MEDIA_READY, "Ready"),
+        (MEDIA_FAILED, "Failed"),
+    ]
+
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="lessons")
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -63,6 +77,9 @@ class Lesson(models.Model):
     video_file = models.FileField(upload_to="lessons/videos/", blank=True, null=True)
     duration_seconds = models.PositiveIntegerField(default=0)
     position = models.PositiveIntegerField(default=0)
+    media_status = models.CharField(max_length=16, choices=MEDIA_STATUS_CHOICES, blank=True)
+    media_info = models.JSONField(default=dict, blank=True)
+    hls_manifest = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -91,12 +108,20 @@ class LessonProgress(models.Model):
         related_name="progress_entries",
     )
     last_position = models.PositiveIntegerField(default=0)
+    # When the player reached last_position: the heartbeat's arrival, or the
+    # client's clock for offline syncs. updated_at is the server's last write.
+    reported_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Day the analytics rollup last counted this row on (core.analytics), so a
+    # row written again on a later day is also taken out of the earlier one.
+    rollup_day = models.DateField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ("user", "lesson")
         ordering = ["-updated_at"]
+        # The analytics rollup reads the rows written since its last run.
+        indexes = [models.Index(fields=["updated_at"], name="lesson_progress_updated_idx")]
 
     def __str__(self) -> str:
         return f"{self.user.username}:{self.lesson_id}@{self.last_position}s"
@@ -119,3 +144,118 @@ class LessonNote(models.Model):
 
     def __str__(self) -> str:
         return f"Note<{self.user.username}:{self.lesson_id}>"
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked upload of a lesson video in progress."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="upload_sessions")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=64, blank=True)
+    received_chunks = models.JSONField(default=list, blank=True)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self) -> str:
+        return f"Upload<{self.lesson_id}:{self.filename}>"
+
+    @property
+    def chunk_count(self) -> int:
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def chunk_length(self, index: int) -> int:
+        if index == self.chunk_count - 1:
+            return self.total_size - index * self.chunk_size
+        return self.chunk_size
+
+    @property
+    def missing_chunks(self) -> list[int]:
+        received = set(self.received_chunks)
+        return [index for index in range(self.chunk_count) if index not in received]
+
+
+class TokenRevocation(models.Model):
+    """Revokes one access token (``jti``) or every token a user was issued before ``revoked_at``."""
+
+    jti = models.CharField(max_length=255, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="token_revocations",
+        null=True,
+        blank=True,
+    )
+    revoked_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-revoked_at"]
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self) -> str:
+        return f"Revocation<{self.jti or self.user_id}>"
+
+
+class LessonDailyStats(models.Model):
+    """Viewers of a lesson whose progress was last written on ``day`` (see ``core.analytics``)."""
+
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="daily_stats")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="lesson_daily_stats")
+    day = models.DateField()
+    viewers = models.PositiveIntegerField(default=0)
+    average_position = models.FloatField(default=0)
+    completions = models.PositiveIntegerField(default=0)
+    completion_ratio = models.FloatField(default=0)
+    # Viewers per equal slice of the lesson in which they stopped, first slice first.
+    dropoff = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["day", "lesson_id"]
+        constraints = [models.UniqueConstraint(fields=["lesson", "day"], name="lesson_daily_stats_unique")]
+        indexes = [models.Index(fields=["course", "day"], name="lesson_daily_stats_course_idx")]
+
+    def __str__(self) -> str:
+        return f"LessonStats<{self.lesson_id}@{self.day}>"
+
+
+class CourseDailyStats(models.Model):
+    """Lesson stats of a course summed per day, with viewers counted once per course."""
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="daily_stats")
+    day = models.DateField()
+    viewers = models.PositiveIntegerField(default=0)
+    lesson_views = models.PositiveIntegerField(default=0)
+    completions = models.PositiveIntegerField(default=0)
+    completion_ratio = models.FloatField(default=0)
+    dropoff = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["day"]
+        constraints = [models.UniqueConstraint(fields=["course", "day"], name="course_daily_stats_unique")]
+
+    def __str__(self) -> str:
+        return f"CourseStats<{self.course_id}@{self.day}>"
+
+
+class RollupCheckpoint(models.Model):
+    """How far an incremental rollup has read; rows written before ``watermark`` are rolled up."""
+
+    name = models.CharField(max_length=64, unique=True)
+    watermark = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}@{self.watermark:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,429 @@
+"""Write-behind buffering for lesson playback progress.
+
+Players report their position every few seconds, so ``LessonViewSet.progress``
+does not write each heartbeat to the database. Heartbeats land in a buffer keyed
+by ``(user_id, lesson_id)`` that keeps only the latest position, and a flusher
+persists everything buffered with one bulk upsert per interval. Reads consult
+the buffer before the database so a client always sees its last heartbeat.
+
+Configured through ``settings.PROGRESS_BUFFER``::
+
+    PROGRESS_BUFFER = {
+        "BACKEND": "core.progress_buffer.LocalProgressBuffer",
+        "FLUSH_INTERVAL": 5,
+        "OPTIONS": {},
+    }
+
+``BACKEND`` set to ``None`` disables buffering and writes heartbeats through.
+``CacheProgressBuffer`` keeps entries in a Django cache shared by all workers;
+use it (with a cache that is not ``locmem``) whenever more than one process
+serves the app, or a GET on one worker misses positions buffered on another.
+
+Entries carry ``reported_at``, the time the position was reached, and rows
+are only ever overwritten by entries reported at or after their own, so a
+late flush or a stale offline sync never moves a viewer back.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Lesson, LessonProgress
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "BACKEND": "core.progress_buffer.LocalProgressBuffer",
+    "FLUSH_INTERVAL": 5,
+    "OPTIONS": {},
+}
+
+
+@dataclass(frozen=True)
+class BufferedProgress:
+    user_id: int
+    lesson_id: int
+    last_position: int
+    reported_at: datetime
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.user_id, self.lesson_id
+
+
+class ProgressBuffer:
+    """Interface of a progress buffer backend."""
+
+    # Whether every worker process sees the same entries.
+    shared = False
+
+    def put(self, entry: BufferedProgress) -> BufferedProgress:
+        raise NotImplementedError
+
+    def get(self, user_id: int, lesson_id: int) -> BufferedProgress | None:
+        raise NotImplementedError
+
+    def discard(self, user_id: int, lesson_id: int) -> None:
+        raise NotImplementedError
+
+    def drain(self) -> list[BufferedProgress]:
+        """Remove and return every entry waiting to be flushed."""
+        raise NotImplementedError
+
+    def acknowledge(self, entries: list[BufferedProgress]) -> None:
+        """Called once drained ``entries`` are committed to the database."""
+
+    def restore(self, entries: list[BufferedProgress]) -> None:
+        """Put back entries of a failed flush unless newer ones arrived."""
+        for entry in entries:
+            current = self.get(*entry.key)
+            if current is None or current.reported_at <= entry.reported_at:
+                self.put(entry)
+
+
+class LocalProgressBuffer(ProgressBuffer):
+    """Per-process buffer; each worker flushes its own heartbeats.
+
+    Drained entries stay readable until their upsert commits so a GET issued
+    mid-flush does not fall back to the older database row.
+    """
+
+    def __init__(self, **options):
+        self._entries: dict[tuple[int, int], BufferedProgress] = {}
+        self._in_flight: dict[tuple[int, int], BufferedProgress] = {}
+        self._lock = threading.Lock()
+
+    def put(self, entry):
+        with self._lock:
+            self._entries[entry.key] = entry
+        return entry
+
+    def get(self, user_id, lesson_id):
+        key = (user_id, lesson_id)
+        with self._lock:
+            return self._entries.get(key) or self._in_flight.get(key)
+
+    def discard(self, user_id, lesson_id):
+        with self._lock:
+            self._entries.pop((user_id, lesson_id), None)
+            self._in_flight.pop((user_id, lesson_id), None)
+
+    def drain(self):
+        with self._lock:
+            self._in_flight.update(self._entries)
+            entries, self._entries = list(self._entries.values()), {}
+        return entries
+
+    def acknowledge(self, entries):
+        with self._lock:
+            for entry in entries:
+                if self._in_flight.get(entry.key) == entry:
+                    del self._in_flight[entry.key]
+
+    def restore(self, entries):
+        self.acknowledge(entries)
+        super().restore(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheProgressBuffer(ProgressBuffer):
+    """Buffer kept in a shared Django cache so every worker reads the same state.
+
+    Entries live in the cache under a TTL that outlasts several flush intervals.
+    Each process remembers which keys it wrote and flushes their latest cached
+    value; upserting the same entry from two workers is harmless.
+    """
+
+    def __init__(self, alias: str = "default", key_prefix: str = "progress", timeout: int = 300, **options):
+        self._cache = caches[alias]
+        self.shared = not isinstance(self._cache, LocMemCache)
+        self._prefix = key_prefix
+        self._timeout = timeout
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _key(self, user_id, lesson_id) -> str:
+        return f"{self._prefix}:{user_id}:{lesson_id}"
+
+    def put(self, entry):
+        key = self._key(*entry.key)
+        self._cache.set(key, entry, self._timeout)
+        with self._lock:
+            self._dirty.add(key)
+        return entry
+
+    def get(self, user_id, lesson_id):
+        return self._cache.get(self._key(user_id, lesson_id))
+
+    def discard(self, user_id, lesson_id):
+        key = self._key(user_id, lesson_id)
+        self._cache.delete(key)
+        with self._lock:
+            self._dirty.discard(key)
+
+    def drain(self):
+        with self._lock:
+            keys, self._dirty = self._dirty, set()
+        # Entries stay cached until they expire so reads on other workers keep
+        # seeing them while the upsert commits.
+        return list(self._cache.get_many(keys).values())
+
+
+def buffer_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "PROGRESS_BUFFER", {})}
+
+
+_buffer: ProgressBuffer | None = None
+_flusher: "ProgressFlusher | None" = None
+_buffer_lock = threading.Lock()
+
+
+def get_progress_buffer() -> ProgressBuffer | None:
+    """Return the configured process-wide buffer, or ``None`` when disabled.
+
+    The flusher thread starts with the buffer unless ``FLUSH_INTERVAL`` is
+    ``None``, in which case callers flush explicitly.
+    """
+    global _buffer, _flusher
+    config = buffer_settings()
+    if not config["BACKEND"]:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = import_string(config["BACKEND"])(**config["OPTIONS"])
+                if not _buffer.shared and getattr(settings, "WEB_CONCURRENCY", 1) > 1:
+                    logger.warning(
+                        "%s is per process but WEB_CONCURRENCY is %s: workers will not see each other's "
+                        "buffered progress. Use CacheProgressBuffer with a shared cache.",
+                        type(_buffer).__name__,
+                        settings.WEB_CONCURRENCY,
+                    )
+                if config["FLUSH_INTERVAL"] is not None:
+                    _flusher = ProgressFlusher(_buffer, config["FLUSH_INTERVAL"])
+                    _flusher.start()
+    return _buffer
+
+
+def reset_progress_buffer() -> None:
+    """Stop the flusher and drop the buffer so the next use reads the settings again."""
+    global _buffer, _flusher
+    with _buffer_lock:
+        if _flusher is not None:
+            _flusher.stop()
+        _buffer = _flusher = None
+
+
+def record_progress(user_id: int, lesson_id: int, last_position: int):
+    """Store a heartbeat and return an object exposing ``last_position``/``updated_at``."""
+    buffer = get_progress_buffer()
+    if buffer is None:
+        progress, _ = LessonProgress.objects.update_or_create(
+            user_id=user_id,
+            lesson_id=lesson_id,
+            defaults={"last_position": last_position, "reported_at": timezone.now()},
+        )
+        return progress
+    return buffer.put(BufferedProgress(user_id, lesson_id, last_position, timezone.now()))
+
+
+def read_progress(user_id: int, lesson_id: int):
+    """Return the latest known progress, buffered first, or ``None``."""
+    buffer = get_progress_buffer()
+    if buffer is not None:
+        entry = buffer.get(user_id, lesson_id)
+        if entry is not None:
+            return entry
+    return LessonProgress.objects.filter(user_id=user_id, lesson_id=lesson_id).first()
+
+
+def persist_progress(entries: list[BufferedProgress]) -> int:
+    """Upsert ``entries``, one statement per batch; returns the entries sent.
+
+    Unlike ``bulk_create(update_conflicts=True)`` the upsert keeps each entry's
+    ``reported_at`` (instead of the ``auto_now`` write time) and skips rows
+    already holding a position reported later.
+    """
+    if not entries:
+        return 0
+    lesson_ids = set(Lesson.objects.filter(id__in={entry.lesson_id for entry in entries}).values_list("id", flat=True))
+    user_ids = set(
+        get_user_model().objects.filter(id__in={entry.user_id for entry in entries}).values_list("id", flat=True)
+    )
+    latest: dict[tuple[int, int], BufferedProgress] = {}
+    for entry in entries:
+        if entry.lesson_id in lesson_ids and entry.user_id in user_ids:
+            current = latest.get(entry.key)
+            if current is None or current.reported_at <= entry.reported_at:
+                latest[entry.key] = entry
+    if not latest:
+        return 0
+
+    quote = connection.ops.quote_name
+    table = quote(LessonProgress._meta.db_table)
+    columns = ["user_id", "lesson_id", "last_position", "reported_at", "created_at", "updated_at"]
+    datetime_field = LessonProgress._meta.get_field("reported_at")
+    now = datetime_field.get_db_prep_value(timezone.now(), connection)
+    rows = [
+        (
+            entry.user_id,
+            entry.lesson_id,
+            entry.last_position,
+            datetime_field.get_db_prep_value(entry.reported_at, connection),
+            now,
+            now,
+        )
+        for entry in latest.values()
+    ]
+    batch_size = max(connection.ops.bulk_batch_size(columns, rows), 1)
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), batch_size):
+            batch = rows[offset : offset + batch_size]
+            placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(map(quote, columns))}) VALUES {placeholders} "
+                f"ON CONFLICT ({quote('user_id')}, {quote('lesson_id')}) DO UPDATE SET "
+                f"{quote('last_position')} = excluded.{quote('last_position')}, "
+                f"{quote('reported_at')} = excluded.{quote('reported_at')}, "
+                f"{quote('updated_at')} = excluded.{quote('updated_at')} "
+                f"WHERE {table}.{quote('reported_at')} <= excluded.{quote('reported_at')}",
+                [value for row in batch for value in row],
+            )
+    return len(rows)
+
+
+def sync_progress(user_id: int, entries: list[BufferedProgress]) -> list[dict]:
+    """Apply a batch of offline progress entries with last-write-wins.
+
+    ``entries`` carry the client's timestamp in ``reported_at`` (clamped to
+    now). An entry wins when it is newer than both the stored row's
+    ``reported_at`` and any buffered heartbeat for the lesson; winners are
+    persisted with the conditional upsert, which also loses to a row written
+    later in the meantime, and their stale buffered heartbeats discarded.
+
+    Returns one result per lesson with ``status`` ``applied``, ``stale`` or
+    ``not_found`` and the position that is now current. ``applied`` is only
+    reported for entries the rows read back after the upsert actually hold.
+    """
+    now = timezone.now()
+    latest: dict[int, BufferedProgress] = {}
+    for entry in entries:
+        entry = replace(entry, user_id=user_id, reported_at=min(entry.reported_at, now))
+        current = latest.get(entry.lesson_id)
+        if current is None or entry.reported_at >= current.reported_at:
+            latest[entry.lesson_id] = entry
+
+    known = set(Lesson.objects.filter(id__in=latest).values_list("id", flat=True))
+    buffer = get_progress_buffer()
+    before = _stored_progress(user_id, known)
+    candidates = []
+    for lesson_id in known:
+        entry, current = latest[lesson_id], _newest(before, buffer, user_id, lesson_id)
+        if current is None or entry.reported_at > current.reported_at:
+            candidates.append(entry)
+
+    with transaction.atomic():
+        persist_progress(candidates)
+        # The upsert loses to rows written meanwhile, so what won is read back.
+        after = _stored_progress(user_id, {entry.lesson_id for entry in candidates})
+    applied = [entry for entry in candidates if after.get(entry.lesson_id) == entry]
+    if buffer is not None:
+        for entry in applied:
+            # Keep heartbeats that arrived meanwhile; drop older ones before they flush over the sync.
+            pending = buffer.get(user_id, entry.lesson_id)
+            if pending is not None and pending.reported_at <= entry.reported_at:
+                buffer.discard(user_id, entry.lesson_id)
+
+    results = []
+    for lesson_id in latest:
+        if lesson_id not in known:
+            results.append({"lesson": lesson_id, "status": "not_found", "last_position": None, "updated_at": None})
+            continue
+        current = _newest({**before, **after}, buffer, user_id, lesson_id)
+        results.append(
+            {
+                "lesson": lesson_id,
+                "status": "applied" if latest[lesson_id] in applied else "stale",
+                "last_position": current.last_position if current is not None else None,
+                "updated_at": current.reported_at if current is not None else None,
+            }
+        )
+    return results
+
+
+def _stored_progress(user_id: int, lesson_ids) -> dict[int, BufferedProgress]:
+    return {
+        lesson_id: BufferedProgress(user_id, lesson_id, last_position, reported_at)
+        for lesson_id, last_position, reported_at in LessonProgress.objects.filter(
+            user_id=user_id, lesson_id__in=lesson_ids
+        ).values_list("lesson_id", "last_position", "reported_at")
+    }
+
+
+def _newest(stored: dict[int, BufferedProgress], buffer: ProgressBuffer | None, user_id: int, lesson_id: int):
+    """Return the stored or buffered progress reported last, or ``None``."""
+    current = stored.get(lesson_id)
+    buffered = buffer.get(user_id, lesson_id) if buffer is not None else None
+    if buffered is not None and (current is None or buffered.reported_at > current.reported_at):
+        return buffered
+    return current
+
+
+def flush_progress_buffer(buffer: ProgressBuffer | None = None) -> int:
+    """Persist everything buffered; failed entries are put back for the next run."""
+    if buffer is None:
+        buffer = get_progress_buffer()
+    if buffer is None:
+        return 0
+    entries = buffer.drain()
+    try:
+        with transaction.atomic():
+            written = persist_progress(entries)
+    except Exception:
+        buffer.restore(entries)
+        raise
+    buffer.acknowledge(entries)
+    return written
+
+
+class ProgressFlusher(threading.Thread):
+    """Daemon thread flushing a buffer every ``interval`` seconds and at exit."""
+
+    def __init__(self, buffer: ProgressBuffer, interval: float):
+        super().__init__(name="progress-flusher", daemon=True)
+        self.buffer = buffer
+        self.interval = interval
+        self._stopped = threading.Event()
+        atexit.register(self.stop)
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        try:
+            flush_progress_buffer(self.buffer)
+        except Exception:
+            logger.exception("Flushing buffered lesson progress failed")
+        finally:
+            close_old_connections()
+
+    def stop(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self.flush()
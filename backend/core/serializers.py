@@ -1,13 +1,29 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 from .models import (
     Course,
+    CourseDailyStats,
     Lesson,
+    LessonDailyStats,
     LessonNote,
     LessonProgress,
     RoleAssignment,
+    UploadSession,
     UserProfile,
 )
+from .progress_buffer import get_progress_buffer
+from .transcoding import hls_manifest_url
+
+
+def lesson_stream_url(lesson: Lesson, request=None) -> str | None:
+    """Transcoded videos play their HLS playlist, other uploads the range-aware stream endpoint."""
+    manifest = hls_manifest_url(lesson)
+    if manifest:
+        return request.build_absolute_uri(manifest) if request else manifest
+    if lesson.video_file:
+        return reverse("lesson-stream", kwargs={"pk": lesson.pk}, request=request)
+    return lesson.video_url or None
 
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -30,10 +46,27 @@ class CourseSerializer(serializers.ModelSerializer):
 
 
 class LessonProgressSerializer(serializers.ModelSerializer):
+    # When the position was reached, for stored rows and buffered heartbeats alike.
+    updated_at = serializers.DateTimeField(source="reported_at", read_only=True)
+
     class Meta:
         model = LessonProgress
         fields = ["last_position", "updated_at"]
-        read_only_fields = ["updated_at"]
+
+
+class ProgressSyncEntrySerializer(serializers.Serializer):
+    lesson = serializers.IntegerField(min_value=1)
+    last_position = serializers.IntegerField()
+    client_timestamp = serializers.DateTimeField()
+
+    def validate_last_position(self, value):
+        return max(value, 0)
+
+
+class ProgressSyncSerializer(serializers.Serializer):
+    MAX_ENTRIES = 500
+
+    entries = serializers.ListField(child=ProgressSyncEntrySerializer(), allow_empty=False, max_length=MAX_ENTRIES)
 
 
 class LessonSerializer(serializers.ModelSerializer):
@@ -68,25 +101,24 @@ class LessonSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return {"last_position": 0, "updated_at": None}
 
+        buffer = get_progress_buffer()
+        buffered = buffer.get(request.user.id, obj.id) if buffer else None
+        if buffered:
+            return LessonProgressSerializer(buffered).data
+
         progress_entries = getattr(obj, "user_progress", None)
         if progress_entries:
             entry = progress_entries[0]
             return LessonProgressSerializer(entry).data
 
-        progress = LessonProgress.objects.filter(user=request.user, lesson=obj).first()
+        progress = LessonProgress.objects.filter(user_id=request.user.id, lesson=obj).first()
         if progress:
             return LessonProgressSerializer(progress).data
 
         return {"last_position": 0, "updated_at": None}
 
     def get_stream_url(self, obj: Lesson) -> str | None:
-        stream = obj.stream_url
-        if not stream:
-            return None
-        request = self.context.get("request")
-        if request and obj.video_file:
-            return request.build_absolute_uri(stream)
-        return stream
+        return lesson_stream_url(obj, self.context.get("request"))
 
 
 class LessonNoteSerializer(serializers.ModelSerializer):
@@ -144,6 +176,30 @@ class StudioCourseSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "owner", "created_at", "updated_at"]
 
 
+class CourseDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CourseDailyStats
+        fields = ["day", "viewers", "lesson_views", "completions", "completion_ratio", "dropoff"]
+        read_only_fields = fields
+
+
+class LessonDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LessonDailyStats
+        fields = ["lesson", "day", "viewers", "average_position", "completions", "completion_ratio", "dropoff"]
+        read_only_fields = fields
+
+
+class StudioCourseStatsQuerySerializer(serializers.Serializer):
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("since") and attrs.get("until") and attrs["since"] > attrs["until"]:
+            raise serializers.ValidationError({"until": ["Must not be before since."]})
+        return attrs
+
+
 class StudioLessonSerializer(serializers.ModelSerializer):
     stream_url = serializers.SerializerMethodField()
 
@@ -158,19 +214,41 @@ class StudioLessonSerializer(serializers.ModelSerializer):
             "stream_url",
             "duration_seconds",
             "position",
+            "media_status",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "stream_url", "created_at", "updated_at"]
+        read_only_fields = ["id", "stream_url", "media_status", "created_at", "updated_at"]
 
     def get_stream_url(self, obj: Lesson) -> str | None:
-        stream = obj.stream_url
-        if not stream:
-            return None
-        request = self.context.get("request")
-        if request and obj.video_file:
-            return request.build_absolute_uri(stream)
-        return stream
+        return lesson_stream_url(obj, self.context.get("request"))
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_count = serializers.IntegerField(read_only=True)
+    missing_chunks = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "lesson",
+            "filename",
+            "total_size",
+            "chunk_size",
+            "chunk_count",
+            "received_chunks",
+            "missing_chunks",
+            "expires_at",
+        ]
+        read_only_fields = fields
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    chunk_size = serializers.IntegerField(required=False)
+    checksum = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True)
 
 
 class WalletTransactionSerializer(serializers.Serializer):
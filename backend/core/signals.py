@@ -1,11 +1,24 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import UserProfile
+from authz.roles import invalidate_roles
+
+from .models import RoleAssignment, UserProfile
 
 
 @receiver(post_save, sender=get_user_model())
 def ensure_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_roles(sender, instance, **kwargs):
+    invalidate_roles(instance.user_id)
+    # Drop again after commit in case a concurrent read cached the old state.
+    transaction.on_commit(lambda: invalidate_roles(instance.user_id))
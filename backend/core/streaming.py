@@ -0,0 +1,176 @@
+"""Conditional, byte-range aware serving of uploaded lesson media.
+
+``serve_media`` answers ``GET``/``HEAD`` for a stored file with ``ETag`` and
+``Last-Modified`` validators, ``304 Not Modified`` revalidation and single
+``Range`` requests (``206 Partial Content``), honouring ``If-Range`` so a
+player resuming a download never stitches together two versions of a file.
+
+Whole-file responses use ``FileResponse`` so WSGI servers with
+``wsgi.file_wrapper`` can ``sendfile()`` them. With
+``settings.LESSON_MEDIA_SENDFILE["MODE"]`` set to ``"x-accel-redirect"`` or
+``"x-sendfile"`` the body is left to the fronting proxy entirely and the
+response only carries the redirect header; storages without local paths
+(``x-sendfile`` needs one) are streamed from here instead.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import re
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+BLOCK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def media_settings() -> dict:
+    return {"MODE": None, "PREFIX": "/protected-media/", **getattr(settings, "LESSON_MEDIA_SENDFILE", {})}
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Return the inclusive ``(start, end)`` of a single-range header.
+
+    Returns ``None`` for headers that should be ignored (malformed or
+    multi-range requests get the full body) and raises
+    :class:`RangeNotSatisfiable` when the range lies outside the file.
+    """
+    match = _RANGE_RE.match(header.strip().replace(" ", ""))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def _not_modified(request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return bool(last_modified and if_modified_since and int(last_modified.timestamp()) <= if_modified_since)
+
+
+def _range_applies(request, etag: str, last_modified: datetime | None) -> bool:
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return bool(last_modified and since and int(last_modified.timestamp()) == since)
+
+
+def _read_range(fh, start: int, length: int):
+    try:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _modified_time(storage, name: str) -> datetime | None:
+    try:
+        modified = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        return None
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=dt_timezone.utc)
+    return modified
+
+
+def _sendfile_header(mode: str, storage, name: str) -> tuple[str, str] | None:
+    """Return the header handing ``name`` to the proxy, or ``None`` to serve it here."""
+    if mode == "x-accel-redirect":
+        # nginx decodes the URI before looking the file up.
+        return "X-Accel-Redirect", media_settings()["PREFIX"].rstrip("/") + "/" + quote(name)
+    if mode == "x-sendfile":
+        try:
+            return "X-Sendfile", storage.path(name)
+        except NotImplementedError:
+            return None
+    raise ValueError(f"Unknown LESSON_MEDIA_SENDFILE mode: {mode!r}")
+
+
+def serve_media(request, field_file) -> HttpResponse:
+    """Serve ``field_file`` honouring conditional and range headers."""
+    storage, name = field_file.storage, field_file.name
+    size = storage.size(name)
+    last_modified = _modified_time(storage, name)
+    etag = quote_etag(f"{size:x}-{int(last_modified.timestamp()) if last_modified else 0:x}")
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    validators = {"ETag": etag, "Accept-Ranges": "bytes"}
+    if last_modified:
+        validators["Last-Modified"] = http_date(last_modified.timestamp())
+
+    if _not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    mode = media_settings()["MODE"]
+    sendfile = _sendfile_header(mode, storage, name) if mode else None
+    if sendfile:
+        # The proxy resolves Range/If-Range itself from the redirected file.
+        response = HttpResponse(content_type=content_type)
+        header, value = sendfile
+        response[header] = value
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    byte_range = None
+    range_header = request.META.get("HTTP_RANGE")
+    if range_header and _range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(storage.open(name, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(storage.open(name, "rb"), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    for header, value in validators.items():
+        response[header] = value
+    return response
@@ -0,0 +1,52 @@
+import pytest
+from django.core.cache import cache
+
+from core.authentication import reset_token_auth
+from core.progress_buffer import reset_progress_buffer
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached roles, verified tokens, revocations and buffered progress would
+    # otherwise outlive the database rollback between tests.
+    cache.clear()
+    reset_token_auth()
+    reset_progress_buffer()
+    yield
+    reset_progress_buffer()
+    reset_token_auth()
+    cache.clear()
+
+
+@pytest.fixture
+def owner(django_user_model):
+    from core.models import RoleAssignment
+
+    user = django_user_model.objects.create_user(username="course-owner", password="secret123")
+    RoleAssignment.objects.create(user=user, role="creator")
+    return user
+
+
+@pytest.fixture
+def course(owner):
+    from core.models import Course
+
+    return Course.objects.create(
+        owner=owner,
+        title="Dune Basics",
+        description="Sand and spice.",
+        price_amount="10.00",
+        price_currency="USD",
+        language="en",
+        publisher="DuneTube",
+    )
+
+
+@pytest.fixture
+def lesson(course):
+    return course.lessons.create(title="Arrakis", duration_seconds=600, position=1)
+
+
+@pytest.fixture
+def viewer(django_user_model):
+    return django_user_model.objects.create_user(username="viewer", password="secret123")
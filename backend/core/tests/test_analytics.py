@@ -0,0 +1,129 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.analytics import rollup_progress
+from core.models import CourseDailyStats, LessonDailyStats, LessonProgress, RollupCheckpoint
+
+
+def _noon(days_ago: int) -> datetime:
+    return timezone.make_aware(datetime.combine(timezone.localdate() - timedelta(days=days_ago), time(12)))
+
+
+def _watch(user, lesson, position, written_at):
+    progress, _ = LessonProgress.objects.update_or_create(
+        user=user, lesson=lesson, defaults={"last_position": position}
+    )
+    # updated_at is auto_now; a queryset update sets it as given.
+    LessonProgress.objects.filter(pk=progress.pk).update(updated_at=written_at)
+
+
+def _rollup_at(moment: datetime, **options):
+    rollup_progress(**options)
+    # Writes are backdated, so the checkpoint is too: the next run reads what was written after ``moment``.
+    RollupCheckpoint.objects.update(watermark=moment)
+
+
+def _snapshot():
+    return (
+        list(
+            LessonDailyStats.objects.order_by("lesson_id", "day").values(
+                "lesson_id", "course_id", "day", "viewers", "average_position", "completions", "completion_ratio", "dropoff"
+            )
+        ),
+        list(
+            CourseDailyStats.objects.order_by("course_id", "day").values(
+                "course_id", "day", "viewers", "lesson_views", "completions", "completion_ratio", "dropoff"
+            )
+        ),
+    )
+
+
+@pytest.fixture
+def viewers(django_user_model):
+    return [django_user_model.objects.create_user(username=f"viewer-{index}") for index in range(3)]
+
+
+@pytest.mark.django_db
+def test_rollup_counts_viewers_completions_and_dropoff(course, lesson, viewers):
+    for user, position in zip(viewers, [100, 300, 590]):
+        _watch(user, lesson, position, _noon(1))
+
+    rollup_progress()
+
+    stats = LessonDailyStats.objects.get(lesson=lesson, day=_noon(1).date())
+    assert (stats.viewers, stats.average_position, stats.completions) == (3, 330.0, 1)
+    assert stats.completion_ratio == pytest.approx(1 / 3)
+    assert stats.dropoff == [1, 0, 1, 1]
+    course_stats = CourseDailyStats.objects.get(course=course, day=_noon(1).date())
+    assert (course_stats.viewers, course_stats.lesson_views, course_stats.completions) == (3, 3, 1)
+
+
+@pytest.mark.django_db
+def test_incremental_rollup_matches_a_rebuild(course, lesson, viewers):
+    second = course.lessons.create(title="Giedi Prime", duration_seconds=300, position=2)
+    for user, position in zip(viewers, [100, 300, 590]):
+        _watch(user, lesson, position, _noon(3))
+    _watch(viewers[0], second, 200, _noon(3))
+    _rollup_at(_noon(2))
+
+    # One viewer comes back two days later, another watches a new lesson today.
+    _watch(viewers[1], lesson, 560, _noon(1))
+    _watch(viewers[2], second, 50, timezone.now())
+    rollup_progress()
+    incremental = _snapshot()
+
+    rollup_progress(rebuild=True)
+
+    assert incremental == _snapshot()
+    assert LessonDailyStats.objects.get(lesson=lesson, day=_noon(3).date()).viewers == 2
+    assert CourseDailyStats.objects.get(course=course, day=_noon(1).date()).completions == 1
+
+
+@pytest.mark.django_db
+def test_row_moving_twice_leaves_both_earlier_days(course, lesson, viewers):
+    _watch(viewers[0], lesson, 100, _noon(3))
+    _rollup_at(_noon(2) - timedelta(hours=1))
+    _watch(viewers[0], lesson, 200, _noon(2))
+    _rollup_at(_noon(1) - timedelta(hours=1))
+    _watch(viewers[0], lesson, 300, _noon(1))
+    rollup_progress()
+
+    assert list(LessonDailyStats.objects.values_list("day", "viewers")) == [(_noon(1).date(), 1)]
+    assert list(CourseDailyStats.objects.values_list("day", flat=True)) == [_noon(1).date()]
+
+
+@pytest.mark.django_db
+def test_stats_action_returns_the_requested_days(owner, course, lesson, viewers):
+    _watch(viewers[0], lesson, 590, _noon(1))
+    _watch(viewers[1], lesson, 100, _noon(40))
+    rollup_progress()
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    response = client.get(f"/api/studio/courses/{course.id}/stats/")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [day["day"] for day in body["days"]] == [_noon(1).date().isoformat()]
+    assert body["days"][0]["completions"] == 1
+    assert [row["lesson"] for row in body["lessons"]] == [lesson.id]
+
+    since = _noon(45).date().isoformat()
+    assert len(client.get(f"/api/studio/courses/{course.id}/stats/", {"since": since}).json()["days"]) == 2
+    invalid = client.get(f"/api/studio/courses/{course.id}/stats/", {"since": since, "until": "2000-01-01"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.django_db
+def test_stats_action_is_limited_to_the_owner(django_user_model, course):
+    from core.models import RoleAssignment
+
+    other = django_user_model.objects.create_user(username="other-creator")
+    RoleAssignment.objects.create(user=other, role="creator")
+    client = APIClient()
+    client.force_authenticate(other)
+
+    assert client.get(f"/api/studio/courses/{course.id}/stats/").status_code == 404
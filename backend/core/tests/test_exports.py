@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db.models import QuerySet
+from rest_framework.test import APIClient
+
+from core.exports import DATASETS, iter_export
+from core.models import Course, RoleAssignment
+
+
+@pytest.fixture
+def rival(django_user_model):
+    user = django_user_model.objects.create_user(username="rival")
+    RoleAssignment.objects.create(user=user, role="creator")
+    Course.objects.create(
+        owner=user,
+        title="=HYPERLINK(\"http://evil\")",
+        description="",
+        price_amount="5.00",
+        price_currency="USD",
+        language="en",
+        publisher="+rival",
+    )
+    return user
+
+
+def _export(user, name, **params):
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get(f"/api/studio/exports/{name}", params)
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+def _rows(ndjson):
+    return [json.loads(line) for line in ndjson.splitlines()]
+
+
+@pytest.mark.django_db
+def test_creators_only_export_their_own_rows(owner, course, lesson, rival):
+    courses = _rows(_export(owner, "courses.ndjson"))
+    lessons = _rows(_export(owner, "lessons.ndjson"))
+
+    assert [row["id"] for row in courses] == [course.id]
+    assert [row["course_id"] for row in lessons] == [course.id]
+    # Query parameters cannot widen a creator's export.
+    assert [row["id"] for row in _rows(_export(owner, "courses.ndjson", owner=rival.id))] == [course.id]
+
+
+@pytest.mark.django_db
+def test_admins_export_everything_or_one_owner(django_user_model, owner, course, rival):
+    admin = django_user_model.objects.create_user(username="admin-user")
+    RoleAssignment.objects.create(user=admin, role="admin")
+
+    everything = {row["owner_id"] for row in _rows(_export(admin, "courses.ndjson"))}
+    filtered = {row["owner_id"] for row in _rows(_export(admin, "courses.ndjson", owner=rival.id))}
+
+    assert {owner.id, rival.id} <= everything
+    assert filtered == {rival.id}
+
+
+@pytest.mark.django_db
+def test_admin_owner_must_be_an_id(django_user_model):
+    admin = django_user_model.objects.create_superuser(username="root", password="secret123")
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    assert client.get("/api/studio/exports/courses.csv", {"owner": "rival"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_viewers_cannot_export(viewer):
+    client = APIClient()
+    client.force_authenticate(viewer)
+
+    assert client.get("/api/studio/exports/courses.csv").status_code == 403
+
+
+@pytest.mark.django_db
+def test_csv_neutralises_formulas(rival):
+    rows = list(csv.DictReader(io.StringIO(_export(rival, "courses.csv"))))
+
+    assert rows[0]["title"] == "'=HYPERLINK(\"http://evil\")"
+    assert rows[0]["publisher"] == "'+rival"
+
+
+@pytest.mark.django_db
+def test_exports_stream_one_chunk_per_batch(owner, course, monkeypatch):
+    for position in range(2, 7):
+        course.lessons.create(title=f"Lesson {position}", position=position)
+    iterator, chunk_sizes = QuerySet.iterator, []
+
+    def spy(self, chunk_size=None):
+        chunk_sizes.append(chunk_size)
+        return iterator(self, chunk_size=chunk_size)
+
+    monkeypatch.setattr(QuerySet, "iterator", spy)
+
+    ndjson = list(iter_export(DATASETS["lessons"], "ndjson", owner, size=2))
+    csv_chunks = list(iter_export(DATASETS["lessons"], "csv", owner, size=2))
+
+    assert [chunk.count(b"\n") for chunk in ndjson] == [2, 2, 1]
+    assert csv_chunks[0].startswith(b"id,course_id,position,")
+    assert [chunk.count(b"\n") for chunk in csv_chunks[1:]] == [2, 2, 1]
+    assert chunk_sizes == [2, 2]
+
+
+@pytest.mark.django_db
+def test_unknown_dataset_and_format(owner):
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    assert client.get("/api/studio/exports/payments.csv").status_code == 404
+    assert client.get("/api/studio/exports/courses.xml").status_code == 400
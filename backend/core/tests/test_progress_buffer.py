@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.models import LessonProgress
+from core.progress_buffer import (
+    BufferedProgress,
+    LocalProgressBuffer,
+    flush_progress_buffer,
+    get_progress_buffer,
+    persist_progress,
+    read_progress,
+    record_progress,
+)
+
+
+@pytest.fixture(autouse=True)
+def manual_flush(settings):
+    settings.PROGRESS_BUFFER = {
+        "BACKEND": "core.progress_buffer.LocalProgressBuffer",
+        "FLUSH_INTERVAL": None,
+        "OPTIONS": {},
+    }
+
+
+@pytest.mark.django_db
+def test_heartbeats_are_buffered_until_flushed(viewer, lesson):
+    record_progress(viewer.id, lesson.id, 30)
+    latest = record_progress(viewer.id, lesson.id, 45)
+
+    assert read_progress(viewer.id, lesson.id) == latest
+    assert not LessonProgress.objects.exists()
+
+    assert flush_progress_buffer() == 1
+    stored = LessonProgress.objects.get(user=viewer, lesson=lesson)
+    assert stored.last_position == 45
+    assert len(get_progress_buffer()) == 0
+
+
+@pytest.mark.django_db
+def test_flush_keeps_the_heartbeat_time_not_the_flush_time(viewer, lesson):
+    heartbeat = record_progress(viewer.id, lesson.id, 30)
+
+    flush_progress_buffer()
+
+    stored = LessonProgress.objects.get(user=viewer, lesson=lesson)
+    assert stored.reported_at == heartbeat.reported_at
+    assert stored.updated_at >= heartbeat.reported_at
+
+
+@pytest.mark.django_db
+def test_upsert_updates_existing_rows_and_skips_unknown_lessons(viewer, lesson):
+    now = timezone.now()
+    LessonProgress.objects.create(user=viewer, lesson=lesson, last_position=10, reported_at=now - timedelta(minutes=1))
+
+    written = persist_progress(
+        [BufferedProgress(viewer.id, lesson.id, 90, now), BufferedProgress(viewer.id, lesson.id + 1000, 5, now)]
+    )
+
+    assert written == 1
+    stored = LessonProgress.objects.get(user=viewer, lesson=lesson)
+    assert (stored.last_position, stored.reported_at) == (90, now)
+
+
+@pytest.mark.django_db
+def test_upsert_never_overwrites_a_later_position(viewer, lesson):
+    now = timezone.now()
+    LessonProgress.objects.create(user=viewer, lesson=lesson, last_position=120, reported_at=now)
+
+    persist_progress([BufferedProgress(viewer.id, lesson.id, 60, now - timedelta(seconds=5))])
+
+    assert LessonProgress.objects.get(user=viewer, lesson=lesson).last_position == 120
+
+
+@pytest.mark.django_db
+def test_failed_flush_restores_entries(viewer, lesson, monkeypatch):
+    record_progress(viewer.id, lesson.id, 30)
+
+    def fail(entries):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr("core.progress_buffer.persist_progress", fail)
+    with pytest.raises(RuntimeError):
+        flush_progress_buffer()
+
+    assert get_progress_buffer().get(viewer.id, lesson.id).last_position == 30
+    monkeypatch.undo()
+    assert flush_progress_buffer() == 1
+
+
+def test_process_local_buffer_warns_with_several_workers(settings, caplog):
+    settings.WEB_CONCURRENCY = 3
+
+    assert isinstance(get_progress_buffer(), LocalProgressBuffer)
+    assert "WEB_CONCURRENCY is 3" in caplog.text
+
+
+def test_cache_buffer_is_the_default_with_several_workers(monkeypatch):
+    import importlib
+
+    import backend.settings
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    try:
+        reloaded = importlib.reload(backend.settings)
+        assert reloaded.PROGRESS_BUFFER["BACKEND"] == "core.progress_buffer.CacheProgressBuffer"
+    finally:
+        monkeypatch.delenv("WEB_CONCURRENCY")
+        importlib.reload(backend.settings)
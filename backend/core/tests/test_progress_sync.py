@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+
+from core import progress_buffer
+from core.models import LessonProgress
+from core.progress_buffer import BufferedProgress, flush_progress_buffer, get_progress_buffer, persist_progress
+
+
+@pytest.fixture(autouse=True)
+def manual_flush(settings):
+    settings.PROGRESS_BUFFER = {
+        "BACKEND": "core.progress_buffer.LocalProgressBuffer",
+        "FLUSH_INTERVAL": None,
+        "OPTIONS": {},
+    }
+
+
+@pytest.fixture
+def client(viewer):
+    client = APIClient()
+    client.force_authenticate(viewer)
+    return client
+
+
+def _sync(client, *entries):
+    response = client.post(
+        "/api/lessons/progress/sync/",
+        {
+            "entries": [
+                {"lesson": lesson, "last_position": position, "client_timestamp": moment.isoformat()}
+                for lesson, position, moment in entries
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def _stored(viewer, lesson):
+    return LessonProgress.objects.get(user=viewer, lesson=lesson)
+
+
+@pytest.mark.django_db
+def test_ordered_syncs_apply_in_turn(client, viewer, lesson):
+    now = timezone.now()
+
+    assert _sync(client, (lesson.id, 10, now - timedelta(minutes=2)))[0]["status"] == "applied"
+    assert _sync(client, (lesson.id, 20, now - timedelta(minutes=1)))[0]["status"] == "applied"
+
+    stored = _stored(viewer, lesson)
+    assert (stored.last_position, stored.reported_at) == (20, now - timedelta(minutes=1))
+
+
+@pytest.mark.django_db
+def test_out_of_order_sync_is_stale(client, viewer, lesson):
+    now = timezone.now()
+    _sync(client, (lesson.id, 20, now - timedelta(minutes=1)))
+
+    [result] = _sync(client, (lesson.id, 10, now - timedelta(minutes=2)))
+
+    assert result["status"] == "stale"
+    assert result["last_position"] == 20
+    assert _stored(viewer, lesson).last_position == 20
+
+
+@pytest.mark.django_db
+def test_latest_entry_of_a_batch_wins(client, viewer, lesson):
+    now = timezone.now()
+
+    [result] = _sync(client, (lesson.id, 30, now - timedelta(minutes=1)), (lesson.id, 15, now - timedelta(minutes=3)))
+
+    assert (result["status"], result["last_position"]) == ("applied", 30)
+    assert _stored(viewer, lesson).last_position == 30
+
+
+@pytest.mark.django_db
+def test_sync_is_compared_with_the_report_time_not_the_write_time(client, viewer, lesson):
+    # A heartbeat from ten minutes ago flushed just now.
+    now = timezone.now()
+    persist_progress([BufferedProgress(viewer.id, lesson.id, 100, now - timedelta(minutes=10))])
+
+    [result] = _sync(client, (lesson.id, 250, now - timedelta(minutes=5)))
+
+    assert result["status"] == "applied"
+    assert _stored(viewer, lesson).last_position == 250
+
+
+@pytest.mark.django_db
+def test_newer_buffered_heartbeat_beats_the_sync(client, viewer, lesson):
+    client.patch(f"/api/lessons/{lesson.id}/progress/", {"last_position": 300}, format="json")
+
+    [result] = _sync(client, (lesson.id, 200, timezone.now() - timedelta(minutes=1)))
+
+    assert (result["status"], result["last_position"]) == ("stale", 300)
+    assert flush_progress_buffer() == 1
+    assert _stored(viewer, lesson).last_position == 300
+
+
+@pytest.mark.django_db
+def test_sync_discards_an_older_buffered_heartbeat(client, viewer, lesson):
+    get_progress_buffer().put(BufferedProgress(viewer.id, lesson.id, 50, timezone.now() - timedelta(minutes=5)))
+
+    [result] = _sync(client, (lesson.id, 400, timezone.now() - timedelta(minutes=1)))
+
+    assert result["status"] == "applied"
+    assert get_progress_buffer().get(viewer.id, lesson.id) is None
+    flush_progress_buffer()
+    assert _stored(viewer, lesson).last_position == 400
+
+
+@pytest.mark.django_db
+def test_heartbeat_flushed_during_a_sync_cannot_be_overwritten(viewer, lesson):
+    # The flush of an older heartbeat lands after a newer sync was stored.
+    now = timezone.now()
+    persist_progress([BufferedProgress(viewer.id, lesson.id, 400, now - timedelta(minutes=1))])
+    persist_progress([BufferedProgress(viewer.id, lesson.id, 50, now - timedelta(minutes=5))])
+
+    assert _stored(viewer, lesson).last_position == 400
+
+
+@pytest.mark.django_db
+def test_sync_losing_to_a_concurrent_newer_write_is_stale(client, viewer, lesson, monkeypatch):
+    now = timezone.now()
+    persist = progress_buffer.persist_progress
+
+    def concurrent(entries):
+        # Another worker flushes a newer heartbeat between the sync's read and its upsert.
+        persist([BufferedProgress(viewer.id, lesson.id, 300, now - timedelta(seconds=10))])
+        return persist(entries)
+
+    monkeypatch.setattr(progress_buffer, "persist_progress", concurrent)
+    [result] = _sync(client, (lesson.id, 20, now - timedelta(minutes=1)))
+
+    stored = _stored(viewer, lesson)
+    assert stored.last_position == 300
+    assert result["status"] == "stale"
+    assert result["last_position"] == stored.last_position
+    assert parse_datetime(result["updated_at"]) == stored.reported_at
+
+
+@pytest.mark.django_db
+def test_unknown_lessons_are_reported(client):
+    [result] = _sync(client, (999999, 10, timezone.now()))
+
+    assert result == {"lesson": 999999, "status": "not_found", "last_position": None, "updated_at": None}
@@ -0,0 +1,123 @@
+import os
+
+import pytest
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from rest_framework.test import APIClient
+
+from core.models import Lesson
+from core.streaming import RangeNotSatisfiable, parse_range
+
+VIDEO = bytes(range(256)) * 40
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 10239)),
+        ("bytes=-100", (10140, 10239)),
+        ("bytes=-20000", (0, 10239)),
+        ("bytes=10000-20000", (10000, 10239)),
+        ("bytes = 5 - 9", (5, 9)),
+        ("bytes=0-1,5-9", None),
+        ("items=0-9", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, len(VIDEO)) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10240-", "bytes=9-5", "bytes=-0"])
+def test_parse_range_outside_the_file(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, len(VIDEO))
+
+
+@pytest.fixture
+def stream_url(settings, tmp_path, lesson):
+    settings.MEDIA_ROOT = tmp_path
+    lesson.video_file.save("intro video é.mp4", ContentFile(VIDEO))
+    return f"/api/lessons/{lesson.id}/stream/"
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_whole_file_carries_validators(stream_url):
+    response = APIClient().get(stream_url)
+
+    assert response.status_code == 200
+    assert _body(response) == VIDEO
+    assert response["Accept-Ranges"] == "bytes"
+    assert APIClient().get(stream_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_range_returns_partial_content(stream_url):
+    response = APIClient().get(stream_url, HTTP_RANGE="bytes=256-511")
+
+    assert response.status_code == 206
+    assert _body(response) == VIDEO[256:512]
+    assert response["Content-Range"] == f"bytes 256-511/{len(VIDEO)}"
+    assert response["Content-Length"] == "256"
+
+
+@pytest.mark.django_db
+def test_unsatisfiable_range(stream_url):
+    response = APIClient().get(stream_url, HTTP_RANGE=f"bytes={len(VIDEO)}-")
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(VIDEO)}"
+
+
+@pytest.mark.django_db
+def test_if_range_only_resumes_the_same_version(stream_url):
+    etag = APIClient().get(stream_url)["ETag"]
+
+    same = APIClient().get(stream_url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+    changed = APIClient().get(stream_url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"0-0"')
+
+    assert same.status_code == 206
+    assert (changed.status_code, _body(changed)) == (200, VIDEO)
+
+
+@pytest.mark.django_db
+def test_accel_redirect_quotes_the_file_name(settings, stream_url, lesson):
+    settings.LESSON_MEDIA_SENDFILE = {"MODE": "x-accel-redirect", "PREFIX": "/protected-media/"}
+
+    response = APIClient().get(stream_url)
+
+    lesson.refresh_from_db()
+    assert response["X-Accel-Redirect"] == "/protected-media/" + lesson.video_file.name.replace("é", "%C3%A9")
+
+
+class RemoteStorage(FileSystemStorage):
+    """A storage without local paths, like S3."""
+
+    def path(self, name):
+        raise NotImplementedError("This backend doesn't support absolute paths.")
+
+    def _open(self, name, mode="rb"):
+        return File(open(super().path(name), mode))
+
+    def size(self, name):
+        return os.path.getsize(super().path(name))
+
+    def get_modified_time(self, name):
+        raise NotImplementedError
+
+
+@pytest.mark.django_db
+def test_sendfile_without_a_local_path_streams_the_file(settings, stream_url, tmp_path, monkeypatch):
+    settings.LESSON_MEDIA_SENDFILE = {"MODE": "x-sendfile"}
+    monkeypatch.setattr(Lesson._meta.get_field("video_file"), "storage", RemoteStorage(location=tmp_path))
+
+    response = APIClient().get(stream_url)
+
+    assert "X-Sendfile" not in response
+    assert _body(response) == VIDEO
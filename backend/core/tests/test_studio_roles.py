@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authz.roles import get_roles
+from core.models import RoleAssignment, UserProfile
+
+
+def _tokens(client, username="course-owner", password="secret123"):
+    return client.post("/api/token", {"username": username, "password": password}, format="json").json()
+
+
+@pytest.mark.django_db
+def test_access_token_carries_identity_and_role_claims(owner):
+    UserProfile.objects.filter(user=owner).update(active_role="creator")
+
+    access = AccessToken(_tokens(APIClient())["access"])
+
+    assert (access["username"], access["is_superuser"]) == ("course-owner", False)
+    assert (access["roles"], access["active_role"]) == (["creator"], "creator")
+
+
+@pytest.mark.django_db
+def test_refresh_picks_up_role_changes(owner):
+    client = APIClient()
+    refresh = _tokens(client)["refresh"]
+    RoleAssignment.objects.create(user=owner, role="admin")
+
+    access = AccessToken(client.post("/api/token/refresh", {"refresh": refresh}, format="json").json()["access"])
+
+    assert access["roles"] == ["admin", "creator"]
+
+
+@pytest.mark.django_db
+def test_studio_permission_trusts_the_token_claims(owner, course):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {_tokens(client)['access']}")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/studio/courses/")
+
+    assert response.status_code == 200
+    assert not [query for query in queries if "roleassignment" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_viewers_without_a_studio_role_are_refused(viewer):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {_tokens(client, 'viewer')['access']}")
+
+    assert client.get("/api/studio/courses/").status_code == 403
+
+
+@pytest.mark.django_db
+def test_cached_roles_are_dropped_when_assignments_change(owner):
+    assert get_roles(owner.pk).available_roles == ("creator",)
+
+    RoleAssignment.objects.filter(user=owner).delete()
+
+    assert get_roles(owner.pk).available_roles == ()
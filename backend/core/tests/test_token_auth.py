@@ -0,0 +1,173 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from core import authentication
+from core.authentication import VerifiedTokenCache
+from core.models import LessonProgress, TokenRevocation
+from core.progress_buffer import flush_progress_buffer
+from core.tokens import access_token_for
+
+
+@pytest.fixture
+def token(viewer):
+    return str(access_token_for(viewer))
+
+
+@pytest.fixture
+def progress_url(lesson):
+    return f"/api/lessons/{lesson.id}/progress/"
+
+
+def _client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _get(url, token):
+    return _client(token).get(url)
+
+
+@pytest.fixture
+def manual_flush(settings):
+    settings.PROGRESS_BUFFER = {
+        "BACKEND": "core.progress_buffer.LocalProgressBuffer",
+        "FLUSH_INTERVAL": None,
+        "OPTIONS": {},
+    }
+
+
+@pytest.fixture
+def obtained_token(viewer):
+    response = APIClient().post("/api/token", {"username": "viewer", "password": "secret123"}, format="json")
+    assert response.status_code == 200
+    return response.json()["access"]
+
+
+def test_lru_evicts_the_least_recently_used_token():
+    tokens = VerifiedTokenCache(2)
+    tokens.put(b"a", 1)
+    tokens.put(b"b", 2)
+    tokens.get(b"a")
+    tokens.put(b"c", 3)
+
+    assert (tokens.get(b"a"), tokens.get(b"b"), tokens.get(b"c")) == (1, None, 3)
+
+
+@pytest.mark.django_db
+def test_verified_tokens_skip_signature_checks_and_user_queries(token, progress_url, monkeypatch):
+    verify = JWTStatelessUserAuthentication.get_validated_token
+    calls = []
+
+    def counting(self, raw_token):
+        calls.append(raw_token)
+        return verify(self, raw_token)
+
+    monkeypatch.setattr(JWTStatelessUserAuthentication, "get_validated_token", counting)
+    assert _get(progress_url, token).status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        response = _get(progress_url, token)
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert not [query for query in queries if '"auth_user"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_token_user_carries_the_integer_user_id(viewer, token):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    user, _ = authentication.TokenUserAuthentication().authenticate(request)
+
+    assert user.id == user.pk == viewer.id
+
+
+@pytest.mark.django_db
+def test_heartbeat_with_an_obtained_token_is_persisted(manual_flush, viewer, lesson, obtained_token, progress_url):
+    client = _client(obtained_token)
+
+    assert client.patch(progress_url, {"last_position": 42}, format="json").status_code == 200
+    assert flush_progress_buffer() == 1
+    assert LessonProgress.objects.get(user=viewer, lesson=lesson).last_position == 42
+
+    response = client.get(f"/api/async/lessons/{lesson.id}/progress")
+    assert response.json()["last_position"] == 42
+
+
+@pytest.mark.django_db
+def test_async_heartbeat_with_an_obtained_token_is_persisted(manual_flush, viewer, lesson, obtained_token):
+    response = _client(obtained_token).patch(
+        f"/api/async/lessons/{lesson.id}/progress", {"last_position": 7}, format="json"
+    )
+
+    assert response.status_code == 200
+    assert flush_progress_buffer() == 1
+    assert LessonProgress.objects.get(user=viewer, lesson=lesson).last_position == 7
+
+
+@pytest.mark.django_db
+def test_offline_sync_with_an_obtained_token_is_persisted(manual_flush, viewer, lesson, obtained_token):
+    response = _client(obtained_token).post(
+        "/api/lessons/progress/sync/",
+        {"entries": [{"lesson": lesson.id, "last_position": 90, "client_timestamp": timezone.now().isoformat()}]},
+        format="json",
+    )
+
+    assert response.json()["results"][0]["status"] == "applied"
+    assert LessonProgress.objects.get(user=viewer, lesson=lesson).last_position == 90
+
+
+@pytest.mark.django_db
+def test_revoked_token_is_refused_even_when_cached(token, progress_url):
+    assert _get(progress_url, token).status_code == 200
+
+    call_command("revoke_tokens", "--token", token, stdout=io.StringIO())
+
+    response = _get(progress_url, token)
+    assert response.status_code == 401
+    assert response.json()["code"] == "token_revoked"
+
+
+@pytest.mark.django_db
+def test_revocations_from_other_workers_apply_after_the_refresh_interval(
+    settings, viewer, token, progress_url, monkeypatch
+):
+    settings.TOKEN_AUTH = {"LRU_SIZE": 16, "REVOCATION_REFRESH": 60}
+    authentication.reset_token_auth()
+    assert _get(progress_url, token).status_code == 200
+
+    # Written by another process: this one only sees it on its next reload.
+    TokenRevocation.objects.create(user=viewer, expires_at=timezone.now() + timedelta(hours=1))
+    assert _get(progress_url, token).status_code == 200
+
+    now = authentication.time.monotonic()
+    monkeypatch.setattr(authentication.time, "monotonic", lambda: now + 61)
+    assert _get(progress_url, token).status_code == 401
+
+
+@pytest.mark.django_db
+def test_revoke_tokens_for_a_user(viewer, token, progress_url):
+    other = str(access_token_for(viewer))
+
+    out = io.StringIO()
+    call_command("revoke_tokens", "--user", viewer.username, stdout=out)
+
+    assert "viewer" in out.getvalue()
+    assert _get(progress_url, token).status_code == 401
+    assert _get(progress_url, other).status_code == 401
+
+
+@pytest.mark.django_db
+def test_revoke_tokens_rejects_unknown_input():
+    with pytest.raises(CommandError, match="Unknown user"):
+        call_command("revoke_tokens", "--user", "nobody")
+    with pytest.raises(CommandError, match="Invalid token"):
+        call_command("revoke_tokens", "--token", "not-a-token")
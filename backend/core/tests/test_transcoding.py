@@ -0,0 +1,70 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from core.transcoding import (
+    H264_PROFILE,
+    LADDER,
+    MediaInfo,
+    generate_sample_clip,
+    master_playlist,
+    package_hls,
+    probe,
+    rendition_codecs,
+    rendition_command,
+    select_renditions,
+)
+
+needs_ffmpeg = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")), reason="ffmpeg and ffprobe are not installed"
+)
+
+HD = MediaInfo(duration=10, width=1280, height=720, video_codec="h264", audio_codec="aac", bitrate=None)
+
+
+def test_renditions_never_upscale():
+    assert [rendition.name for rendition in select_renditions(HD)] == ["720p", "480p", "360p"]
+
+
+def test_master_playlist_advertises_each_rendition_level():
+    playlist = master_playlist(select_renditions(HD), HD)
+
+    assert 'RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"' in playlist
+    assert 'RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"' in playlist
+    assert rendition_codecs(LADDER[0], MediaInfo(10, 1920, 1080, "h264", None, None)) == "avc1.4d4028"
+
+
+def test_encoder_gets_the_advertised_profile_and_level(tmp_path):
+    command = rendition_command(tmp_path / "in.mp4", tmp_path, LADDER[0], HD)
+
+    assert command[command.index("-profile:v") + 1] == H264_PROFILE
+    assert command[command.index("-level:v") + 1] == "4.0"
+
+
+def _video_stream(path):
+    output = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_streams", "-print_format", "json", str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)["streams"][0]
+
+
+@needs_ffmpeg
+def test_packaged_renditions_match_their_codecs_string(tmp_path):
+    clip = generate_sample_clip(tmp_path / "sample.mp4", seconds=2, width=854, height=480)
+    info = probe(clip)
+    assert (info.width, info.height, info.audio_codec) == (854, 480, "aac")
+
+    renditions = package_hls(clip, tmp_path / "hls", info)
+
+    master = (tmp_path / "hls" / "master.m3u8").read_text()
+    for rendition in renditions:
+        stream = _video_stream(next((tmp_path / "hls" / rendition.name).glob("segment_*.ts")))
+        assert stream["height"] == rendition.height
+        assert stream["profile"].lower() == H264_PROFILE
+        assert f"{stream['level']:02x}" == rendition_codecs(rendition, info)[9:11]
+        assert f'CODECS="{rendition_codecs(rendition, info)}"' in master
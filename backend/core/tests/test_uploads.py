@@ -0,0 +1,135 @@
+import hashlib
+import io
+import os
+
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from core.models import UploadSession
+from core.uploads import (
+    MIN_CHUNK_SIZE,
+    UploadConflict,
+    complete_upload,
+    partial_path,
+    start_upload,
+    write_chunk,
+)
+
+CHUNK = MIN_CHUNK_SIZE
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.UPLOAD_SESSION_ROOT = tmp_path / "partial"
+
+
+@pytest.fixture
+def video():
+    return os.urandom(2 * CHUNK + 1000)
+
+
+@pytest.fixture
+def session(lesson, owner, video):
+    return start_upload(
+        lesson, owner, "intro.mp4", len(video), CHUNK, checksum=hashlib.sha256(video).hexdigest()
+    )
+
+
+def _chunk(video, index):
+    return video[index * CHUNK : (index + 1) * CHUNK]
+
+
+def _write(session, video, index, data=None, digest=None):
+    data = _chunk(video, index) if data is None else data
+    digest = hashlib.sha256(data).hexdigest() if digest is None else digest
+    return write_chunk(session, index, io.BytesIO(data), digest=digest)
+
+
+@pytest.mark.django_db
+def test_chunks_in_any_order_assemble_the_file(session, video):
+    for index in (2, 0, 1):
+        session = _write(session, video, index)
+
+    lesson = complete_upload(session)
+
+    with lesson.video_file.open("rb") as fh:
+        assert fh.read() == video
+    assert not UploadSession.objects.filter(pk=session.pk).exists()
+    assert not partial_path(session).exists()
+
+
+@pytest.mark.django_db
+def test_bad_retry_does_not_clobber_a_received_chunk(session, video):
+    session = _write(session, video, 0)
+    garbage = os.urandom(CHUNK)
+
+    with pytest.raises(ValidationError, match="Checksum mismatch"):
+        _write(session, video, 0, garbage, digest=hashlib.sha256(b"other").hexdigest())
+    with pytest.raises(ValidationError, match="exactly"):
+        _write(session, video, 0, garbage[:-1])
+
+    with open(partial_path(session), "rb") as fh:
+        assert fh.read(CHUNK) == _chunk(video, 0)
+    assert UploadSession.objects.get(pk=session.pk).received_chunks == [0]
+
+
+@pytest.mark.django_db
+def test_chunk_longer_than_expected_is_rejected(session, video):
+    with pytest.raises(ValidationError):
+        _write(session, video, 2, _chunk(video, 2) + b"x", digest="")
+
+    assert UploadSession.objects.get(pk=session.pk).received_chunks == []
+
+
+@pytest.mark.django_db
+def test_upload_size_is_capped(settings, lesson, owner):
+    settings.UPLOAD_MAX_SIZE = 10 * CHUNK
+
+    with pytest.raises(ValidationError, match="at most"):
+        start_upload(lesson, owner, "huge.mp4", 10 * CHUNK + 1, CHUNK)
+
+
+@pytest.mark.django_db
+def test_incomplete_upload_cannot_be_completed(session, video):
+    session = _write(session, video, 0)
+
+    with pytest.raises(UploadConflict) as exc:
+        complete_upload(session)
+    assert exc.value.detail["missing_chunks"] == ["1", "2"]
+
+
+@pytest.mark.django_db
+def test_concurrent_completion_and_chunk_writes_conflict(session, video, monkeypatch):
+    for index in range(3):
+        session = _write(session, video, index)
+    field = type(session.lesson).video_file.field.attr_class
+    save = field.save
+    raised = []
+
+    def save_during_another_completion(self, *args, **kwargs):
+        for attempt in (lambda: complete_upload(session), lambda: _write(session, video, 1)):
+            with pytest.raises(UploadConflict) as exc:
+                attempt()
+            raised.append(exc.value)
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(field, "save", save_during_another_completion)
+    lesson = complete_upload(session)
+
+    assert len(raised) == 2
+    with lesson.video_file.open("rb") as fh:
+        assert fh.read() == video
+
+
+@pytest.mark.django_db
+def test_failed_completion_keeps_the_partial_file(lesson, owner, video):
+    session = start_upload(lesson, owner, "intro.mp4", len(video), CHUNK, checksum="0" * 64)
+    for index in range(3):
+        session = _write(session, video, index)
+
+    with pytest.raises(ValidationError, match="assembled"):
+        complete_upload(session)
+
+    assert partial_path(session).exists()
+    assert UploadSession.objects.filter(pk=session.pk).exists()
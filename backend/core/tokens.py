@@ -0,0 +1,15 @@
+"""Access tokens of the core project, which also carry identity claims.
+
+``username`` and ``is_superuser`` let ``core.authentication.TokenUserAuthentication``
+build the request user from the token alone. Role claims come from ``authz.tokens``.
+"""
+
+from authz import tokens
+
+
+def access_token_for(user):
+    return tokens.access_token_for(user, identity=True)
+
+
+class RoleTokenObtainPairSerializer(tokens.RoleTokenObtainPairSerializer):
+    identity_claims = True
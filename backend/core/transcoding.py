@@ -0,0 +1,384 @@
+"""Probing and HLS packaging of uploaded lesson videos.
+
+Once a lesson receives a video file the upload views call
+``schedule_transcode``, which enqueues ``process_lesson_media`` as a background
+job (or, without ``QUEUE``, hands it to a bounded in-process worker pool after
+the transaction commits). That function:
+
+* probes the file with ``ffprobe`` and stores the duration, codecs and
+  resolution (``Lesson.duration_seconds`` and ``Lesson.media_info``);
+* encodes an H.264/AAC rendition for every ladder rung that does not
+  upscale the source, segmented as HLS;
+* writes a master playlist and records it in ``Lesson.hls_manifest``.
+  ``LessonSerializer.stream_url`` then points players at that playlist
+  instead of the original file.
+
+Configured through ``settings.LESSON_TRANSCODING``::
+
+    LESSON_TRANSCODING = {
+        "ENABLED": True,
+        "QUEUE": "media",
+        "FFMPEG": "ffmpeg",
+        "FFPROBE": "ffprobe",
+        "WORKERS": 2,
+        "SEGMENT_SECONDS": 6,
+        "OUTPUT_DIR": "lessons/hls",
+    }
+
+Playlists and segments are written under ``MEDIA_ROOT/OUTPUT_DIR`` and served
+like any other media file. ``WORKERS`` caps how many ffmpeg processes run at
+once per server process when no ``QUEUE`` is set; ``0`` transcodes inline
+after commit instead.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from jobs.queue import enqueue, task
+
+from .models import Lesson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "ENABLED": True,
+    "QUEUE": None,
+    "FFMPEG": "ffmpeg",
+    "FFPROBE": "ffprobe",
+    "WORKERS": 2,
+    "SEGMENT_SECONDS": 6,
+    "OUTPUT_DIR": "lessons/hls",
+}
+
+
+class TranscodeError(Exception):
+    pass
+
+
+# H.264 profile encoded by libx264, and its profile_idc and constraint flags
+# as they appear in the RFC 6381 "avc1.PPCCLL" codec string.
+H264_PROFILE = "main"
+H264_PROFILES = {"main": (0x4D, 0x40), "high": (0x64, 0x00)}
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    height: int
+    video_bitrate: int  # kbit/s
+    audio_bitrate: int = 128
+    # H.264 level; encoded into the stream and advertised in the master playlist.
+    level: float = 3.1
+
+
+LADDER = (
+    Rendition("1080p", 1080, 5000, 192, level=4.0),
+    Rendition("720p", 720, 2800),
+    Rendition("480p", 480, 1400),
+    Rendition("360p", 360, 800, 96, level=3.0),
+)
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration: float
+    width: int
+    height: int
+    video_codec: str
+    audio_codec: str | None
+    bitrate: int | None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+
+def transcoding_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "LESSON_TRANSCODING", {})}
+
+
+def _run(command: list[str]) -> str:
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    except FileNotFoundError as exc:
+        raise TranscodeError(f"{command[0]} is not installed") from exc
+    if completed.returncode != 0:
+        raise TranscodeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else command[0])
+    return completed.stdout
+
+
+def probe(path: str | Path) -> MediaInfo:
+    """Read duration, resolution and codecs of ``path`` with ffprobe."""
+    output = _run(
+        [
+            transcoding_settings()["FFPROBE"],
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            str(path),
+        ]
+    )
+    data = json.loads(output)
+    streams = data.get("streams", [])
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    if video is None:
+        raise TranscodeError("file has no video stream")
+    audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    media_format = data.get("format", {})
+    duration = float(media_format.get("duration") or video.get("duration") or 0)
+    bitrate = media_format.get("bit_rate")
+    return MediaInfo(
+        duration=duration,
+        width=int(video["width"]),
+        height=int(video["height"]),
+        video_codec=video.get("codec_name", ""),
+        audio_codec=audio.get("codec_name") if audio else None,
+        bitrate=int(bitrate) if bitrate else None,
+    )
+
+
+def select_renditions(info: MediaInfo, ladder=LADDER) -> list[Rendition]:
+    """Ladder rungs that do not upscale the source; at least the smallest one."""
+    renditions = [rendition for rendition in ladder if rendition.height <= info.height]
+    return renditions or [min(ladder, key=lambda rendition: rendition.height)]
+
+
+def _scaled_width(info: MediaInfo, height: int) -> int:
+    width = round(info.width * height / info.height)
+    return width + width % 2
+
+
+def rendition_command(source: Path, target: Path, rendition: Rendition, info: MediaInfo) -> list[str]:
+    config = transcoding_settings()
+    segment = config["SEGMENT_SECONDS"]
+    command = [
+        config["FFMPEG"],
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(source),
+        "-vf",
+        f"scale=-2:{rendition.height}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-profile:v",
+        H264_PROFILE,
+        "-level:v",
+        str(rendition.level),
+        "-b:v",
+        f"{rendition.video_bitrate}k",
+        "-maxrate",
+        f"{rendition.video_bitrate * 107 // 100}k",
+        "-bufsize",
+        f"{rendition.video_bitrate * 3 // 2}k",
+        # Keyframes on segment boundaries so every rendition switches cleanly.
+        "-force_key_frames",
+        f"expr:gte(t,n_forced*{segment})",
+        "-sc_threshold",
+        "0",
+    ]
+    if info.has_audio:
+        command += ["-c:a", "aac", "-b:a", f"{rendition.audio_bitrate}k", "-ac", "2"]
+    else:
+        command += ["-an"]
+    command += [
+        "-f",
+        "hls",
+        "-hls_time",
+        str(segment),
+        "-hls_playlist_type",
+        "vod",
+        "-hls_segment_filename",
+        str(target / "segment_%05d.ts"),
+        str(target / "index.m3u8"),
+    ]
+    return command
+
+
+def rendition_codecs(rendition: Rendition, info: MediaInfo) -> str:
+    """The ``CODECS`` attribute of ``rendition``: H.264 profile and level, plus AAC-LC if there is audio."""
+    profile_idc, constraints = H264_PROFILES[H264_PROFILE]
+    video = f"avc1.{profile_idc:02x}{constraints:02x}{round(rendition.level * 10):02x}"
+    return f"{video},mp4a.40.2" if info.has_audio else video
+
+
+def master_playlist(renditions: list[Rendition], info: MediaInfo) -> str:
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in renditions:
+        codecs = rendition_codecs(rendition, info)
+        bandwidth = (rendition.video_bitrate + (rendition.audio_bitrate if info.has_audio else 0)) * 1000
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},"
+            f"RESOLUTION={_scaled_width(info, rendition.height)}x{rendition.height},"
+            f'CODECS="{codecs}"'
+        )
+        lines.append(f"{rendition.name}/index.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+def package_hls(source: Path, output: Path, info: MediaInfo) -> list[Rendition]:
+    """Encode every rendition of ``source`` into ``output`` and write ``master.m3u8``."""
+    renditions = select_renditions(info)
+    for rendition in renditions:
+        target = output / rendition.name
+        target.mkdir(parents=True, exist_ok=True)
+        _run(rendition_command(source, target, rendition, info))
+    (output / "master.m3u8").write_text(master_playlist(renditions, info))
+    return renditions
+
+
+def _local_source(lesson: Lesson):
+    """Return a local path to the lesson's video, downloading it if the storage is remote."""
+    try:
+        return Path(lesson.video_file.path), None
+    except NotImplementedError:
+        handle = tempfile.NamedTemporaryFile(suffix=Path(lesson.video_file.name).suffix, delete=False)
+        with handle, lesson.video_file.open("rb") as source:
+            shutil.copyfileobj(source, handle)
+        return Path(handle.name), Path(handle.name)
+
+
+@task(queue="media", timeout=3600)
+def process_lesson_media(lesson_id: int) -> None:
+    """Probe and package the current video of ``lesson_id``; failures mark the lesson failed."""
+    lesson = Lesson.objects.filter(pk=lesson_id).first()
+    if lesson is None or not lesson.video_file:
+        return
+    video_name = lesson.video_file.name
+    Lesson.objects.filter(pk=lesson_id).update(media_status=Lesson.MEDIA_PROCESSING)
+
+    output_root = Path(settings.MEDIA_ROOT)
+    relative = Path(transcoding_settings()["OUTPUT_DIR"]) / str(lesson_id) / uuid.uuid4().hex[:12]
+    source, cleanup = None, None
+    try:
+        source, cleanup = _local_source(lesson)
+        info = probe(source)
+        renditions = package_hls(source, output_root / relative, info)
+    except Exception as exc:
+        logger.warning("Transcoding lesson %s failed: %s", lesson_id, exc)
+        shutil.rmtree(output_root / relative, ignore_errors=True)
+        Lesson.objects.filter(pk=lesson_id, video_file=video_name).update(
+            media_status=Lesson.MEDIA_FAILED,
+            media_info={"error": str(exc)},
+        )
+        return
+    finally:
+        if cleanup is not None:
+            cleanup.unlink(missing_ok=True)
+
+    media_info = {**asdict(info), "renditions": [rendition.name for rendition in renditions]}
+    updated = Lesson.objects.filter(pk=lesson_id, video_file=video_name).update(
+        media_status=Lesson.MEDIA_READY,
+        media_info=media_info,
+        duration_seconds=round(info.duration),
+        hls_manifest=(relative / "master.m3u8").as_posix(),
+    )
+    if not updated:
+        # A newer upload replaced the video while this one was encoding.
+        shutil.rmtree(output_root / relative, ignore_errors=True)
+        return
+    _remove_previous_outputs(output_root, lesson_id, keep=relative.name)
+
+
+def _remove_previous_outputs(output_root: Path, lesson_id: int, keep: str) -> None:
+    lesson_dir = output_root / transcoding_settings()["OUTPUT_DIR"] / str(lesson_id)
+    for child in lesson_dir.iterdir():
+        if child.is_dir() and child.name != keep:
+            shutil.rmtree(child, ignore_errors=True)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcode")
+    return _executor
+
+
+def _process_in_worker(lesson_id: int) -> None:
+    try:
+        process_lesson_media(lesson_id)
+    except Exception:
+        logger.exception("Transcoding lesson %s crashed", lesson_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_transcode(lesson: Lesson) -> None:
+    """Queue ``lesson``'s video for processing once the current transaction commits."""
+    config = transcoding_settings()
+    if not config["ENABLED"] or not lesson.video_file:
+        return
+    Lesson.objects.filter(pk=lesson.pk).update(media_status=Lesson.MEDIA_PENDING, hls_manifest="")
+    lesson.media_status, lesson.hls_manifest = Lesson.MEDIA_PENDING, ""
+    if config["QUEUE"]:
+        # The job row commits (or rolls back) together with the upload.
+        enqueue(process_lesson_media, args=[lesson.pk], queue=config["QUEUE"])
+    elif config["WORKERS"]:
+        executor = _get_executor(config["WORKERS"])
+        transaction.on_commit(lambda: executor.submit(_process_in_worker, lesson.pk))
+    else:
+        transaction.on_commit(lambda: process_lesson_media(lesson.pk))
+
+
+def hls_manifest_url(lesson: Lesson) -> str | None:
+    if lesson.media_status == Lesson.MEDIA_READY and lesson.hls_manifest:
+        return default_storage.url(lesson.hls_manifest)
+    return None
+
+
+def generate_sample_clip(path: str | Path, seconds: int = 2, width: int = 640, height: int = 360) -> Path:
+    """Render a small test-pattern clip with a sine tone (used by tests and benchmarks)."""
+    path = Path(path)
+    _run(
+        [
+            transcoding_settings()["FFMPEG"],
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=duration={seconds}:size={width}x{height}:rate=25",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={seconds}",
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-shortest",
+            str(path),
+        ]
+    )
+    return path
@@ -0,0 +1,202 @@
+"""Resumable chunked uploads of lesson videos.
+
+A client opens an :class:`~core.models.UploadSession` with the file size (at
+most ``UPLOAD_MAX_SIZE`` bytes), then PUTs fixed-size chunks by index in any
+order (and in parallel). Each chunk is streamed from the request body into a
+temporary file in ``BLOCK_SIZE`` pieces, hashed on the way, so memory use per
+upload is bounded no matter how large the file is. Only a chunk of the right
+length and digest is copied to its offset in the sparse partial file, so a
+bad retry never clobbers a chunk already received. Completing the session
+claims the partial file by renaming it, which makes concurrent completions
+fail with a conflict, and moves it into the lesson's storage.
+
+Sessions expire ``UPLOAD_SESSION_TTL`` seconds after their last chunk and are
+removed by the ``cleanup_upload_sessions`` management command.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Lesson, UploadSession
+
+BLOCK_SIZE = 64 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+
+class UploadConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Upload is not complete."
+    default_code = "upload_conflict"
+
+
+def upload_root() -> Path:
+    return Path(getattr(settings, "UPLOAD_SESSION_ROOT", Path(settings.MEDIA_ROOT) / "uploads" / "partial"))
+
+
+def max_upload_size() -> int:
+    return getattr(settings, "UPLOAD_MAX_SIZE", DEFAULT_MAX_SIZE)
+
+
+def session_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "UPLOAD_SESSION_TTL", DEFAULT_TTL))
+
+
+def partial_path(session: UploadSession) -> Path:
+    return upload_root() / f"{session.pk}.part"
+
+
+class PartialFile(File):
+    """Completed partial upload; storages that support it move instead of copy."""
+
+    def temporary_file_path(self) -> str:
+        return self.file.name
+
+
+def start_upload(lesson: Lesson, user, filename: str, total_size: int, chunk_size: int | None = None, checksum: str = ""):
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValidationError({"chunk_size": [f"Must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes."]})
+    if total_size <= 0:
+        raise ValidationError({"size": ["Must be a positive number of bytes."]})
+    if total_size > max_upload_size():
+        raise ValidationError({"size": [f"Must be at most {max_upload_size()} bytes."]})
+
+    session = UploadSession.objects.create(
+        lesson=lesson,
+        user=user,
+        filename=os.path.basename(filename),
+        total_size=total_size,
+        chunk_size=chunk_size,
+        checksum=checksum.lower(),
+        expires_at=timezone.now() + session_ttl(),
+    )
+    path = partial_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        # Sparse on most filesystems; chunks are written at their offsets.
+        fh.truncate(total_size)
+    return session
+
+
+def write_chunk(session: UploadSession, index: int, stream, digest: str = "") -> UploadSession:
+    """Write chunk ``index`` from ``stream`` and record it as received.
+
+    ``digest`` is the chunk's hex SHA-256; when given the chunk is only
+    written if the received bytes match it.
+    """
+    if not 0 <= index < session.chunk_count:
+        raise ValidationError({"index": [f"Must be between 0 and {session.chunk_count - 1}."]})
+
+    expected_length = session.chunk_length(index)
+    hasher = hashlib.sha256()
+    written = 0
+    with tempfile.TemporaryFile(dir=upload_root()) as chunk:
+        while written < expected_length:
+            block = stream.read(min(BLOCK_SIZE, expected_length - written))
+            if not block:
+                break
+            chunk.write(block)
+            hasher.update(block)
+            written += len(block)
+        extra = stream.read(1) if written == expected_length else b""
+
+        if written != expected_length or extra:
+            raise ValidationError({"detail": f"Chunk {index} must be exactly {expected_length} bytes."})
+        if digest and hasher.hexdigest() != digest.lower():
+            raise ValidationError({"detail": f"Checksum mismatch for chunk {index}."})
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            chunk.seek(0)
+            try:
+                # r+b keeps the other chunks' bytes; each writer owns its own byte range.
+                with open(partial_path(session), "r+b") as fh:
+                    fh.seek(index * session.chunk_size)
+                    shutil.copyfileobj(chunk, fh, BLOCK_SIZE)
+            except FileNotFoundError as exc:
+                raise UploadConflict({"detail": "Upload is being completed."}) from exc
+            if index not in session.received_chunks:
+                session.received_chunks = sorted([*session.received_chunks, index])
+            session.expires_at = timezone.now() + session_ttl()
+            session.save(update_fields=["received_chunks", "expires_at", "updated_at"])
+    return session
+
+
+def _file_digest(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def complete_upload(session: UploadSession) -> Lesson:
+    """Move a fully received upload into ``lesson.video_file``."""
+    missing = session.missing_chunks
+    if missing:
+        raise UploadConflict({"detail": "Upload is not complete.", "missing_chunks": missing})
+
+    path = partial_path(session)
+    claimed = path.with_suffix(".completing")
+    try:
+        # Only one caller can rename the partial file; chunk writes and other
+        # completions find it gone until this one gives it back.
+        os.rename(path, claimed)
+    except FileNotFoundError as exc:
+        raise UploadConflict({"detail": "Upload is already being completed."}) from exc
+
+    try:
+        if session.checksum and _file_digest(claimed) != session.checksum:
+            raise ValidationError({"detail": "Checksum mismatch for the assembled file."})
+        lesson = session.lesson
+        with open(claimed, "rb") as fh:
+            lesson.video_file.save(session.filename, PartialFile(fh), save=False)
+        lesson.save(update_fields=["video_file", "updated_at"])
+    except BaseException:
+        if claimed.exists():  # the storage may already have moved it
+            os.rename(claimed, path)
+        raise
+    claimed.unlink(missing_ok=True)
+    session.delete()
+    return lesson
+
+
+def abort_upload(session: UploadSession) -> None:
+    partial_path(session).unlink(missing_ok=True)
+    session.delete()
+
+
+def purge_expired_sessions(now=None) -> int:
+    """Delete expired sessions and partial files without a session."""
+    now = now or timezone.now()
+    purged = 0
+    for session in UploadSession.objects.filter(expires_at__lt=now).iterator():
+        abort_upload(session)
+        purged += 1
+
+    root = upload_root()
+    if root.is_dir():
+        live = {str(pk) for pk in UploadSession.objects.values_list("pk", flat=True)}
+        cutoff = (now - session_ttl()).timestamp()
+        for path in [*root.glob("*.part"), *root.glob("*.completing")]:
+            if path.stem not in live and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                purged += 1
+    return purged
@@ -1,23 +1,49 @@
+import io
 from datetime import timedelta
 from decimal import Decimal
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from django.db.models import Prefetch
 from django.utils import timezone
 from rest_framework import filters, permissions, status, viewsets, parsers
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Course, Lesson, LessonNote, LessonProgress, RoleAssignment, UserProfile
+from authz.roles import resolve_roles, role_settings
+
+from .authentication import TokenUserAuthentication
+from .exports import export_response
+from .models import (
+    Course,
+    CourseDailyStats,
+    Lesson,
+    LessonDailyStats,
+    LessonNote,
+    LessonProgress,
+    UploadSession,
+    UserProfile,
+)
+from .progress_buffer import BufferedProgress, read_progress, record_progress, sync_progress
+from .streaming import serve_media
+from .tokens import access_token_for
+from .transcoding import schedule_transcode
+from .uploads import abort_upload, complete_upload, start_upload, write_chunk
 from .serializers import (
+    CourseDailyStatsSerializer,
     CourseSerializer,
+    LessonDailyStatsSerializer,
     LessonNoteSerializer,
     LessonProgressSerializer,
     LessonSerializer,
+    ProgressSyncSerializer,
     StudioCourseSerializer,
+    StudioCourseStatsQuerySerializer,
     StudioLessonSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
     WalletInvoiceSerializer,
     WalletTransactionSerializer,
 )
@@ -40,7 +66,7 @@ class CourseViewSet(viewsets.ModelViewSet):
             lessons = lessons.prefetch_related(
                 Prefetch(
                     "progress_entries",
-                    queryset=LessonProgress.objects.filter(user=user),
+                    queryset=LessonProgress.objects.filter(user_id=user.id),
                     to_attr="user_progress",
                 )
             )
@@ -59,15 +85,8 @@ class ActiveRoleView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
-        roles = RoleAssignment.objects.filter(user=user).order_by("role")
-        return Response(
-            {
-                "active_role": profile.active_role,
-                "available_roles": [role.role for role in roles],
-            }
-        )
+        roles = resolve_roles(request, trust_token=False)
+        return Response({"active_role": roles.active_role, "available_roles": list(roles.available_roles)})
 
 
 class ActivateRoleView(APIView):
@@ -80,13 +99,20 @@ class ActivateRoleView(APIView):
             return Response({"detail": "role is required"}, status=status.HTTP_400_BAD_REQUEST)
 
         user = request.user
-        if not RoleAssignment.objects.filter(user=user, role=requested_role).exists():
+        if requested_role not in resolve_roles(request, trust_token=False).available_roles:
             return Response({"detail": "role not assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
         profile, _ = UserProfile.objects.get_or_create(user=user)
         profile.active_role = requested_role
         profile.save(update_fields=["active_role", "updated_at"])
-        return Response({"active_role": profile.active_role})
+        payload = {"active_role": profile.active_role}
+        if role_settings()["TOKEN_CLAIMS"]:
+            # The caller's token still claims the previous active role.
+            payload["access"] = str(access_token_for(user))
+        return Response(payload)
+
+
+STUDIO_ROLES = ("creator", "admin")
 
 
 class IsCreatorOrAdmin(permissions.BasePermission):
@@ -98,11 +124,13 @@ class IsCreatorOrAdmin(permissions.BasePermission):
             return False
         if user.is_superuser:
             return True
-        return RoleAssignment.objects.filter(user=user, role__in=["creator", "admin"]).exists()
+        return resolve_roles(request).has_any(STUDIO_ROLES)
 
 
 class LessonViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = LessonSerializer
+    # Catalog reads and progress heartbeats only need the token's claims.
+    authentication_classes = [TokenUserAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["title", "description"]
@@ -119,18 +147,27 @@ class LessonViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.prefetch_related(
                 Prefetch(
                     "progress_entries",
-                    queryset=LessonProgress.objects.filter(user=user),
+                    queryset=LessonProgress.objects.filter(user_id=user.id),
                     to_attr="user_progress",
                 )
             )
         return queryset
 
+    @action(detail=True, methods=["get"], url_path="stream")
+    def stream(self, request, pk=None):
+        lesson = self.get_object()
+        if not lesson.video_file:
+            return Response({"detail": "lesson has no uploaded video"}, status=status.HTTP_404_NOT_FOUND)
+        return serve_media(request, lesson.video_file)
+
     @action(detail=True, methods=["get", "patch"], permission_classes=[permissions.IsAuthenticated])
     def progress(self, request, pk=None):
         lesson = self.get_object()
-        progress, _ = LessonProgress.objects.get_or_create(user=request.user, lesson=lesson)
 
         if request.method == "GET":
+            progress = read_progress(request.user.id, lesson.id)
+            if progress is None:
+                return Response({"last_position": 0, "updated_at": None})
             serializer = LessonProgressSerializer(progress)
             return Response(serializer.data)
 
@@ -152,23 +189,39 @@ class LessonViewSet(viewsets.ReadOnlyModelViewSet):
         if position_value < 0:
             position_value = 0
 
-        progress.last_position = position_value
-        progress.save(update_fields=["last_position", "updated_at"])
+        # Heartbeats are coalesced in the progress buffer and flushed in bulk.
+        progress = record_progress(request.user.id, lesson.id, position_value)
         serializer = LessonProgressSerializer(progress)
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="progress/sync",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def sync(self, request):
+        serializer = ProgressSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_id = request.user.id
+        entries = [
+            BufferedProgress(user_id, entry["lesson"], entry["last_position"], entry["client_timestamp"])
+            for entry in serializer.validated_data["entries"]
+        ]
+        return Response({"results": sync_progress(user_id, entries)})
+
     @action(detail=True, methods=["get", "post"], permission_classes=[permissions.IsAuthenticated])
     def notes(self, request, pk=None):
         lesson = self.get_object()
 
         if request.method == "GET":
-            notes = lesson.notes.filter(user=request.user).select_related("lesson").order_by("-updated_at")
+            notes = lesson.notes.filter(user_id=request.user.id).select_related("lesson").order_by("-updated_at")
             serializer = LessonNoteSerializer(notes, many=True)
             return Response(serializer.data)
 
         serializer = LessonNoteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, lesson=lesson)
+        serializer.save(user_id=request.user.id, lesson=lesson)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
@@ -180,7 +233,7 @@ class LessonViewSet(viewsets.ReadOnlyModelViewSet):
     def note_detail(self, request, pk=None, note_id=None):
         lesson = self.get_object()
         try:
-            note = lesson.notes.get(id=note_id, user=request.user)
+            note = lesson.notes.get(id=note_id, user_id=request.user.id)
         except LessonNote.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -190,7 +243,7 @@ class LessonViewSet(viewsets.ReadOnlyModelViewSet):
 
         serializer = LessonNoteSerializer(note, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, lesson=note.lesson)
+        serializer.save(lesson=note.lesson)
         return Response(serializer.data)
 
 
@@ -240,6 +293,47 @@ class StudioCourseViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """Daily viewer, completion and drop-off figures from the analytics rollup (``core.analytics``).
+
+        ``?since=``/``?until=`` bound the days (default: the last 30). Each table
+        is read once through its (course, day) index.
+        """
+        course = self.get_object()
+        query = StudioCourseStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        until = query.validated_data.get("until") or timezone.localdate()
+        since = query.validated_data.get("since") or until - timedelta(days=29)
+        days = {"course": course, "day__gte": since, "day__lte": until}
+        return Response(
+            {
+                "course": course.pk,
+                "since": since,
+                "until": until,
+                "days": CourseDailyStatsSerializer(CourseDailyStats.objects.filter(**days), many=True).data,
+                "lessons": LessonDailyStatsSerializer(LessonDailyStats.objects.filter(**days), many=True).data,
+            }
+        )
+
+
+class StudioExportView(APIView):
+    """Stream a studio dataset as ``<dataset>.ndjson`` or ``<dataset>.csv`` (see ``core.exports``).
+
+    Creators get rows for the courses they own. Admins get every row, or one
+    owner's with ``?owner=<user id>``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsCreatorOrAdmin]
+
+    def get(self, request, dataset, export_format):
+        owner = request.user
+        if request.user.is_superuser or resolve_roles(request).has_any(("admin",)):
+            owner = request.query_params.get("owner") or None
+            if owner is not None and not owner.isdigit():
+                raise ValidationError({"owner": ["Expected a user id."]})
+        return export_response(dataset, export_format, owner)
+
 
 class StudioLessonViewSet(viewsets.ModelViewSet):
     serializer_class = StudioLessonSerializer
@@ -288,6 +382,77 @@ class StudioLessonViewSet(viewsets.ModelViewSet):
 
         lesson.video_file = file_obj
         lesson.save(update_fields=["video_file", "updated_at"])
+        schedule_transcode(lesson)
+        serializer = self.get_serializer(lesson)
+        return Response(serializer.data)
+
+    def get_upload_session(self, lesson, session_id) -> UploadSession:
+        try:
+            return lesson.upload_sessions.get(pk=session_id, user=self.request.user)
+        except (UploadSession.DoesNotExist, DjangoValidationError) as exc:
+            raise NotFound("upload session not found") from exc
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="uploads",
+        permission_classes=[permissions.IsAuthenticated, IsCreatorOrAdmin],
+        parser_classes=[parsers.JSONParser],
+    )
+    def create_upload(self, request, pk=None):
+        lesson = self.get_object()
+        payload = UploadSessionCreateSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        session = start_upload(
+            lesson,
+            request.user,
+            filename=payload.validated_data["filename"],
+            total_size=payload.validated_data["size"],
+            chunk_size=payload.validated_data.get("chunk_size"),
+            checksum=payload.validated_data.get("checksum", ""),
+        )
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=True,
+        methods=["get", "delete"],
+        url_path=r"uploads/(?P<session_id>[0-9a-f-]+)",
+        permission_classes=[permissions.IsAuthenticated, IsCreatorOrAdmin],
+    )
+    def upload_session(self, request, pk=None, session_id=None):
+        session = self.get_upload_session(self.get_object(), session_id)
+        if request.method == "DELETE":
+            abort_upload(session)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(UploadSessionSerializer(session).data)
+
+    @action(
+        detail=True,
+        methods=["put"],
+        url_path=r"uploads/(?P<session_id>[0-9a-f-]+)/chunks/(?P<index>\d+)",
+        permission_classes=[permissions.IsAuthenticated, IsCreatorOrAdmin],
+    )
+    def upload_chunk(self, request, pk=None, session_id=None, index=None):
+        session = self.get_upload_session(self.get_object(), session_id)
+        # The raw body is streamed to disk; request.data is never parsed.
+        session = write_chunk(
+            session,
+            int(index),
+            request.stream or io.BytesIO(),
+            digest=request.headers.get("X-Chunk-SHA256", ""),
+        )
+        return Response(UploadSessionSerializer(session).data)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path=r"uploads/(?P<session_id>[0-9a-f-]+)/complete",
+        permission_classes=[permissions.IsAuthenticated, IsCreatorOrAdmin],
+    )
+    def finish_upload(self, request, pk=None, session_id=None):
+        session = self.get_upload_session(self.get_object(), session_id)
+        lesson = complete_upload(session)
+        schedule_transcode(lesson)
         serializer = self.get_serializer(lesson)
         return Response(serializer.data)
 
@@ -65,7 +65,6 @@ class Command(BaseCommand):
         tags=["demo", "intro", f"batch-{slug_suffix}"],
         thumbnail_url=f"https://placehold.co/640x360?text=Demo+{course_number}",
         participants_count=random.randint(50, 2500),
-        rating_avg=random.choice([3.8, 4.2, 4.7, 5.0]),
         published_at=timezone.now() - timedelta(days=course_number),
         publisher=publisher,
         teacher=teacher,
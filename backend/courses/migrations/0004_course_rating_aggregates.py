@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:38
+
+import courses.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0003_seed_dynamic_demo_content"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_histogram",
+            field=models.JSONField(blank=True, default=courses.models.empty_rating_histogram),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_course_rating_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["-published_at", "title", "id"], name="course_published_title_idx"),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:24
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["publisher", "-published_at", "title"], name="course_publisher_published_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["teacher", "-published_at", "title"], name="course_teacher_published_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                django.db.models.functions.text.Lower("language"),
+                models.OrderBy(models.F("published_at"), descending=True),
+                models.F("title"),
+                name="course_language_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["rating_avg", "id"], name="course_rating_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["participants_count", "id"], name="course_participants_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["price_amount", "id"], name="course_price_idx"),
+        ),
+    ]
@@ -1,7 +1,16 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
+RATING_SCALE = range(1, 6)
+
+
+def empty_rating_histogram() -> list[int]:
+    return [0 for _ in RATING_SCALE]
+
+
 class Publisher(models.Model):
     name = models.CharField(max_length=255)
     slug = models.SlugField(unique=True)
@@ -40,6 +49,10 @@ class Course(models.Model):
     thumbnail_url = models.URLField(blank=True)
     participants_count = models.PositiveIntegerField(default=0)
     rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    # Denormalised review aggregates, maintained by reviews.aggregates.
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_histogram = models.JSONField(default=empty_rating_histogram, blank=True)
     published_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -48,6 +61,21 @@ class Course(models.Model):
 
     class Meta:
         ordering = ["-published_at", "title"]
+        indexes = [
+            # Keyset pagination over the default catalog ordering.
+            models.Index(fields=["-published_at", "title", "id"], name="course_published_title_idx"),
+            # The catalog filters (see courses.views.filter_courses), each followed
+            # by the default ordering so a filtered page is read straight off the index.
+            models.Index(fields=["publisher", "-published_at", "title"], name="course_publisher_published_idx"),
+            models.Index(fields=["teacher", "-published_at", "title"], name="course_teacher_published_idx"),
+            models.Index(
+                Lower("language"), F("published_at").desc(), "title", name="course_language_published_idx"
+            ),
+            # ?ordering= choices, with the primary key as the keyset tie-breaker.
+            models.Index(fields=["rating_avg", "id"], name="course_rating_idx"),
+            models.Index(fields=["participants_count", "id"], name="course_participants_idx"),
+            models.Index(fields=["price_amount", "id"], name="course_price_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
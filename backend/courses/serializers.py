@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from api.fields import SparseFieldsSerializerMixin
 from courses.models import Course, Publisher, Teacher
 
 
@@ -15,7 +16,7 @@ class TeacherSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "avatar_url")
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     publisher = PublisherSerializer(read_only=True)
     teacher = TeacherSerializer(read_only=True)
 
@@ -35,4 +36,6 @@ class CourseSerializer(serializers.ModelSerializer):
             "participants_count",
             "published_at",
             "rating_avg",
+            "rating_count",
         )
+        expandable_fields = ("publisher", "teacher")
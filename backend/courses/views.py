@@ -1,13 +1,46 @@
+from django.db.models.functions import Lower
+from django.urls import reverse
 from rest_framework import filters, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from courses.models import Course
+from api.cache import PUBLISHING, CachedResponseMixin, course_namespace
+from api.compiled import CompiledListMixin
+from api.db import ReplicaReadMixin
+from api.fields import SparseFieldsMixin
+from courses.models import RATING_SCALE, Course
 from courses.serializers import CourseSerializer
+from lessons.models import Lesson
+from lessons.serializers import LessonSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from search.backends import InvertedIndexSearchFilter
 
 
-class CourseViewSet(viewsets.ReadOnlyModelViewSet):
+def filter_courses(queryset, params):
+    """Apply the ``publisher``/``teacher``/``language`` catalog filters."""
+    publisher_slug = params.get("publisher")
+    teacher_id = params.get("teacher")
+    language = params.get("language")
+
+    if publisher_slug:
+        queryset = queryset.filter(publisher__slug=publisher_slug)
+    if teacher_id:
+        queryset = queryset.filter(teacher_id=teacher_id)
+    if language:
+        # Same expression as course_language_published_idx, so the index applies.
+        queryset = queryset.alias(language_lower=Lower("language")).filter(language_lower=language.lower())
+
+    return queryset
+
+
+class CourseViewSet(
+    ReplicaReadMixin, CachedResponseMixin, SparseFieldsMixin, CompiledListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = CourseSerializer
     queryset = Course.objects.select_related("publisher", "teacher").order_by("-published_at", "title")
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
+    filter_backends = (InvertedIndexSearchFilter, filters.OrderingFilter)
     search_fields = ("title", "description", "language", "publisher__name", "teacher__name")
     ordering_fields = (
         "title",
@@ -18,17 +51,48 @@ class CourseViewSet(viewsets.ReadOnlyModelViewSet):
         "rating_avg",
     )
 
+    cache_actions = (*CachedResponseMixin.cache_actions, "bundle")
+
     def get_queryset(self):
-        queryset = super().get_queryset()
-        publisher_slug = self.request.query_params.get("publisher")
-        teacher_id = self.request.query_params.get("teacher")
-        language = self.request.query_params.get("language")
-
-        if publisher_slug:
-            queryset = queryset.filter(publisher__slug=publisher_slug)
-        if teacher_id:
-            queryset = queryset.filter(teacher_id=teacher_id)
-        if language:
-            queryset = queryset.filter(language__iexact=language)
-
-        return queryset
+        return filter_courses(super().get_queryset(), self.request.query_params)
+
+    def get_cache_namespaces(self):
+        if self.action == "bundle":
+            # Only writes to this course (or to publishers and teachers) retire its bundle.
+            return (course_namespace(self.kwargs[self.lookup_field]), PUBLISHING)
+        return super().get_cache_namespaces()
+
+    @action(detail=True, methods=["get"])
+    def bundle(self, request, *args, **kwargs):
+        """The course page in one response: the course, its lessons and its review summary.
+
+        Three queries: the course with publisher and teacher, the lessons and
+        the newest page of reviews. The review count and rating breakdown come
+        from the denormalised aggregates on the course row.
+        """
+        return self.cached_response(self.build_bundle, request, *args, **kwargs)
+
+    def build_bundle(self, request, *args, **kwargs):
+        course = self.get_object()
+        context = self.get_serializer_context()
+        page_size = api_settings.PAGE_SIZE
+        lessons = Lesson.objects.filter(course=course).order_by("order", "id")
+        reviews = Review.objects.filter(course=course).select_related("user").order_by("-created_at", "-id")
+        next_reviews = None
+        if course.rating_count > page_size:
+            url = reverse("course-reviews-list", kwargs={"course_id": course.pk})
+            next_reviews = request.build_absolute_uri(f"{url}?page=2")
+        return Response(
+            {
+                "course": self.get_serializer(course).data,
+                "lessons": LessonSerializer(lessons, many=True, context=context).data,
+                "reviews": {
+                    "count": course.rating_count,
+                    "breakdown": {
+                        str(rating): count for rating, count in zip(RATING_SCALE, course.rating_histogram)
+                    },
+                    "next": next_reviews,
+                    "results": ReviewSerializer(reviews[:page_size], many=True, context=context).data,
+                },
+            }
+        )
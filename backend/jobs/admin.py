@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from jobs.models import Job
+from jobs.queue import retry_jobs
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "queue", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("status", "queue")
+    search_fields = ("name", "last_error")
+    actions = ("retry",)
+
+    @admin.action(description="Retry selected jobs")
+    def retry(self, request, queryset):
+        retried = retry_jobs(queryset)
+        self.message_user(request, f"Re-queued {retried} jobs.")
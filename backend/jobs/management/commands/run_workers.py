@@ -0,0 +1,29 @@
+import os
+import socket
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_pool, work
+
+
+class Command(BaseCommand):
+    help = "Run background job workers in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes; 0 runs a single worker in this process (default: CPU count).",
+        )
+        parser.add_argument("--queue", action="append", dest="queues", help="Only work these queues (repeatable).")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due instead of polling.")
+
+    def handle(self, *args, **options):
+        queues, burst = options["queues"], options["burst"]
+        if options["processes"] <= 0:
+            executed = work(f"{socket.gethostname()}:{os.getpid()}", queues, burst=burst)
+            self.stdout.write(self.style.SUCCESS(f"Executed {executed} jobs."))
+            return
+        self.stdout.write(f"Starting {options['processes']} workers on {', '.join(queues or ['all queues'])}.")
+        run_pool(options["processes"], queues, burst=burst)
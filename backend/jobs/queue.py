@@ -0,0 +1,180 @@
+"""Database-backed job queue.
+
+Work is enqueued as ``Job`` rows, usually inside the transaction that made it
+necessary, so a rolled back request never leaves orphan jobs behind::
+
+    @task(queue="media", timeout=1800)
+    def process_lesson_media(lesson_id): ...
+
+    process_lesson_media.enqueue(lesson.pk)
+    enqueue("reviews.tasks.recompute_aggregates", kwargs={"batch_size": 500})
+
+Workers (``manage.py run_workers``) claim due jobs and mark them ``running``
+until ``locked_until``, the job's visibility timeout. A worker that dies
+mid-job leaves the lock to expire, after which the job is claimed again. A
+failing job is retried with exponential backoff until ``max_attempts``. After
+that it is parked as ``dead`` (the dead letter queue) with its last traceback
+so it can be inspected and retried from the admin.
+
+Claims use ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it
+(PostgreSQL) and a compare-and-set ``UPDATE`` otherwise (SQLite), so no broker
+is needed.
+
+Defaults come from ``settings.JOBS``::
+
+    JOBS = {
+        "POLL_INTERVAL": 1.0,
+        "BATCH_SIZE": 1,
+        "MAX_ATTEMPTS": 5,
+        "TIMEOUT": 300,
+        "BACKOFF_BASE": 5,
+        "BACKOFF_MAX": 3600,
+    }
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "POLL_INTERVAL": 1.0,
+    "BATCH_SIZE": 1,
+    "MAX_ATTEMPTS": 5,
+    "TIMEOUT": 300,
+    "BACKOFF_BASE": 5,
+    "BACKOFF_MAX": 3600,
+}
+
+
+def job_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "JOBS", {})}
+
+
+def task_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def task(func: Callable | None = None, *, queue: str = "default", max_attempts: int | None = None, timeout=None):
+    """Register job defaults on a module-level function and give it ``.enqueue()``."""
+
+    def decorate(func: Callable) -> Callable:
+        func.job_options = {"queue": queue, "max_attempts": max_attempts, "timeout": timeout}
+        func.enqueue = lambda *args, **kwargs: enqueue(func, args=args, kwargs=kwargs)
+        return func
+
+    return decorate(func) if func is not None else decorate
+
+
+def enqueue(
+    func: Callable | str,
+    args=(),
+    kwargs: dict | None = None,
+    *,
+    queue: str | None = None,
+    run_at: datetime | None = None,
+    delay: float | None = None,
+    max_attempts: int | None = None,
+    timeout: int | None = None,
+) -> Job:
+    """Create a job running ``func(*args, **kwargs)``; arguments must be JSON serialisable."""
+    if isinstance(func, str):
+        func = import_string(func)
+    options = getattr(func, "job_options", {})
+    config = job_settings()
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+    return Job.objects.create(
+        name=task_name(func),
+        queue=queue or options.get("queue") or "default",
+        args=list(args),
+        kwargs=kwargs or {},
+        run_at=run_at,
+        max_attempts=max_attempts or options.get("max_attempts") or config["MAX_ATTEMPTS"],
+        timeout=timeout or options.get("timeout") or config["TIMEOUT"],
+    )
+
+
+def _due(queues, now):
+    jobs = Job.objects.filter(Q(status=Job.QUEUED, run_at__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now))
+    if queues:
+        jobs = jobs.filter(queue__in=queues)
+    return jobs
+
+
+def claim_jobs(worker_id: str, queues=None, limit: int = 1) -> list[Job]:
+    """Lock up to ``limit`` due jobs for ``worker_id`` and return them."""
+    now = timezone.now()
+    claim = {"status": Job.RUNNING, "locked_by": worker_id, "attempts": F("attempts") + 1}
+    claimed: list[int] = []
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                _due(queues, now)
+                .select_for_update(skip_locked=True)
+                .order_by("run_at", "id")
+                .values_list("id", "timeout")[:limit]
+            )
+            for job_id, timeout in ids:
+                Job.objects.filter(pk=job_id).update(locked_until=now + timedelta(seconds=timeout), **claim)
+                claimed.append(job_id)
+        else:
+            candidates = _due(queues, now).order_by("run_at", "id").values_list("id", "timeout")[: limit * 4]
+            for job_id, timeout in candidates:
+                # Whoever flips the row first wins; the others see it no longer due.
+                if _due(queues, now).filter(pk=job_id).update(locked_until=now + timedelta(seconds=timeout), **claim):
+                    claimed.append(job_id)
+                    if len(claimed) == limit:
+                        break
+    return list(Job.objects.filter(pk__in=claimed).order_by("run_at", "id"))
+
+
+def backoff(attempts: int) -> float:
+    """Seconds before retry number ``attempts``: exponential with 10% jitter."""
+    config = job_settings()
+    delay = min(config["BACKOFF_MAX"], config["BACKOFF_BASE"] * 2 ** max(attempts - 1, 0))
+    return delay * (1 + random.random() / 10)
+
+
+def execute_job(job: Job, worker_id: str) -> str:
+    """Run a claimed job and record the outcome; returns the new status."""
+    mine = Job.objects.filter(pk=job.pk, locked_by=worker_id, status=Job.RUNNING)
+    try:
+        import_string(job.name)(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) is dead after %s attempts", job.pk, job.name, job.attempts)
+            status, changes = Job.DEAD, {"finished_at": now}
+        else:
+            logger.warning("Job %s (%s) failed, attempt %s/%s", job.pk, job.name, job.attempts, job.max_attempts)
+            status, changes = Job.QUEUED, {"run_at": now + timedelta(seconds=backoff(job.attempts))}
+        mine.update(status=status, last_error=error, locked_by="", locked_until=None, **changes)
+        return status
+    mine.update(status=Job.SUCCEEDED, finished_at=timezone.now(), locked_by="", locked_until=None)
+    return Job.SUCCEEDED
+
+
+def retry_jobs(queryset) -> int:
+    """Put dead (or any finished) jobs back in the queue with a fresh attempt budget."""
+    return queryset.exclude(status=Job.RUNNING).update(
+        status=Job.QUEUED,
+        attempts=0,
+        run_at=timezone.now(),
+        finished_at=None,
+        last_error="",
+    )
@@ -0,0 +1,83 @@
+"""Worker loop and process pool behind ``manage.py run_workers``.
+
+Children are started with the ``spawn`` method, so this module must stay
+importable before Django is set up; the queue (and its models) is imported
+inside the functions.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.db import DatabaseError, close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+def work(worker_id: str, queues=None, stop=None, burst: bool = False) -> int:
+    """Claim and run jobs until ``stop`` is set (or, with ``burst``, the queue is drained).
+
+    Returns the number of jobs executed.
+    """
+    from .queue import claim_jobs, execute_job, job_settings
+
+    config = job_settings()
+    stop = stop or multiprocessing.Event()
+    executed = 0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            jobs = claim_jobs(worker_id, queues, limit=config["BATCH_SIZE"])
+        except DatabaseError:
+            # Typically a busy SQLite file; try again on the next poll.
+            logger.warning("Claiming jobs failed", exc_info=True)
+            stop.wait(config["POLL_INTERVAL"])
+            continue
+        if not jobs:
+            if burst:
+                break
+            stop.wait(config["POLL_INTERVAL"])
+            continue
+        for job in jobs:
+            execute_job(job, worker_id)
+            executed += 1
+    close_old_connections()
+    return executed
+
+
+def _child_main(worker_id: str, queues, stop, burst: bool) -> None:
+    import django
+
+    django.setup()
+    # The parent handles Ctrl-C and tells children to stop after their current job.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    work(worker_id, queues, stop, burst)
+
+
+def run_pool(processes: int, queues=None, burst: bool = False) -> None:
+    """Run ``processes`` worker processes until SIGINT/SIGTERM (or until drained with ``burst``)."""
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    # Never share database sockets with the children.
+    connections.close_all()
+    children = [
+        context.Process(target=_child_main, args=(f"{prefix}:{index}", queues, stop, burst), name=f"jobs-{index}")
+        for index in range(processes)
+    ]
+    previous = {sig: signal.signal(sig, lambda *_: stop.set()) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for child in children:
+            child.start()
+        for child in children:
+            while child.is_alive():
+                child.join(timeout=1)
+    finally:
+        stop.set()
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
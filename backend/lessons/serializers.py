@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
+from api.fields import SparseFieldsSerializerMixin
 from lessons.models import Lesson
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Lesson
         fields = (
@@ -1,10 +1,16 @@
 from rest_framework import filters, viewsets
 
+from api.cache import CachedResponseMixin
+from api.compiled import CompiledListMixin
+from api.db import ReplicaReadMixin
+from api.fields import SparseFieldsMixin
 from lessons.models import Lesson
 from lessons.serializers import LessonSerializer
 
 
-class LessonViewSet(viewsets.ReadOnlyModelViewSet):
+class LessonViewSet(
+    ReplicaReadMixin, CachedResponseMixin, SparseFieldsMixin, CompiledListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = LessonSerializer
     filter_backends = (filters.OrderingFilter,)
     ordering_fields = ("order", "id")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class MetricsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "metrics"
+
+    def ready(self):
+        from .middleware import install_query_counter
+
+        connection_created.connect(install_query_counter, dispatch_uid="metrics.install_query_counter")
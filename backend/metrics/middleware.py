@@ -0,0 +1,130 @@
+"""Request instrumentation feeding ``metrics.registry``.
+
+``RequestMetricsMiddleware`` counts and times every SQL query through an
+``execute_wrapper`` that ``MetricsConfig`` installs on each connection, times the rendering of DRF and template
+responses, and records both with the total latency under the request's route
+(the URL name, or the route pattern for unnamed URLs). Put it first in
+``MIDDLEWARE`` so the latency covers the other middleware too.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from .registry import flush, metrics_settings, registry
+
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar("request_metrics", default=None)
+
+
+def count_queries(execute, sql, params, many, context):
+    """``execute_wrapper`` charging queries to the request being measured.
+
+    It stays installed on every connection and looks the request up in a
+    context variable, which also follows async views into the threads that
+    run their ORM calls.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_counter(connection, **kwargs) -> None:
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def route_label(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route or "unmatched"
+
+
+class RequestMetrics:
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection)
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+
+    def record(self, response) -> None:
+        registry.observe(
+            route_label(self.request),
+            self.request.method,
+            response.status_code,
+            {
+                "request_duration_seconds": time.perf_counter() - self.started,
+                "db_queries": self.queries,
+                "db_duration_seconds": self.db_time,
+                "serialization_seconds": self.render_time,
+            },
+        )
+        flush()
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = metrics_settings()["ENABLED"]
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        with RequestMetrics(request) as metrics:
+            request._metrics = metrics
+            response = self.get_response(request)
+        metrics.record(response)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        with RequestMetrics(request) as metrics:
+            request._metrics = metrics
+            response = await self.get_response(request)
+        metrics.record(response)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered by the handler after the view returns.
+        metrics = getattr(request, "_metrics", None)
+        if metrics is not None:
+            render = response.render
+
+            def timed_render():
+                started = time.perf_counter()
+                try:
+                    return render()
+                finally:
+                    metrics.render_time += time.perf_counter() - started
+
+            response.render = timed_render
+        return response
@@ -0,0 +1,177 @@
+"""Per-route request metrics aggregated across worker processes.
+
+Each process keeps cumulative histograms in memory (``Registry``) and, at most
+every ``FLUSH_INTERVAL`` seconds, publishes a snapshot of them to the cache
+under its own key. The metrics endpoint merges the snapshots of every live
+worker, so a scrape sees the whole server no matter which worker answers.
+A worker's numbers vanish ``WORKER_TTL`` seconds after it exits, which
+Prometheus treats like any other counter reset.
+
+Configured through ``settings.METRICS``::
+
+    METRICS = {
+        "ENABLED": True,
+        "CACHE_ALIAS": "default",
+        "FLUSH_INTERVAL": 5,
+        "WORKER_TTL": 300,
+    }
+
+With a per-process cache (``locmem``) every worker only reports itself.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_SETTINGS = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    "FLUSH_INTERVAL": 5,
+    "WORKER_TTL": 300,
+}
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# name -> (help text, buckets)
+HISTOGRAMS = {
+    "request_duration_seconds": ("Total time spent handling the request.", SECONDS_BUCKETS),
+    "db_queries": ("SQL queries issued per request.", QUERY_BUCKETS),
+    "db_duration_seconds": ("Time spent executing SQL per request.", SECONDS_BUCKETS),
+    "serialization_seconds": ("Time spent rendering the response body.", SECONDS_BUCKETS),
+}
+PREFIX = "dunetube_http_"
+WORKERS_KEY = "metrics:workers"
+
+
+def metrics_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "METRICS", {})}
+
+
+def _worker_key(worker: str) -> str:
+    return f"metrics:worker:{worker}"
+
+
+class Registry:
+    """Cumulative histograms keyed on ``(route, method)`` plus per-status request counts."""
+
+    def __init__(self):
+        self._histograms: dict[tuple, list] = {}
+        self._requests: dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, method: str, status: int, values: dict[str, float]) -> None:
+        with self._lock:
+            self._requests[(route, method, str(status))] += 1
+            for name, value in values.items():
+                buckets = HISTOGRAMS[name][1]
+                key = (name, route, method)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    # Per-bucket counts (the last one is +Inf), then sum and count.
+                    histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+                histogram[0][bisect.bisect_left(buckets, value)] += 1
+                histogram[1] += value
+                histogram[2] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = self._histograms.items()
+            return {
+                "histograms": [[*key, list(counts), total, count] for key, (counts, total, count) in histograms],
+                "requests": [[*key, count] for key, count in self._requests.items()],
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+
+registry = Registry()
+_pid = os.getpid()
+_flushed_at = 0.0
+
+
+def flush(force: bool = False) -> None:
+    """Publish this process's snapshot if ``FLUSH_INTERVAL`` has passed."""
+    global _pid, _flushed_at
+    config = metrics_settings()
+    now = time.monotonic()
+    if not force and now - _flushed_at < config["FLUSH_INTERVAL"]:
+        return
+    _flushed_at = now
+    if _pid != os.getpid():
+        # Forked after import (preloaded app); the parent's numbers are its own.
+        _pid = os.getpid()
+        registry.clear()
+    worker = f"{socket.gethostname()}:{_pid}"
+    cache = caches[config["CACHE_ALIAS"]]
+    cache.set(_worker_key(worker), registry.snapshot(), config["WORKER_TTL"])
+    workers = set(cache.get(WORKERS_KEY) or ())
+    if worker not in workers:
+        # Racing registrations may drop a worker; it re-registers on its next flush.
+        cache.set(WORKERS_KEY, sorted(workers | {worker}), None)
+
+
+def collect() -> dict:
+    """Merge the published snapshots of every live worker."""
+    flush(force=True)
+    cache = caches[metrics_settings()["CACHE_ALIAS"]]
+    workers = cache.get(WORKERS_KEY) or []
+    snapshots = cache.get_many([_worker_key(worker) for worker in workers])
+    live = [worker for worker in workers if _worker_key(worker) in snapshots]
+    if len(live) != len(workers):
+        cache.set(WORKERS_KEY, live, None)
+
+    histograms: dict[tuple, list] = {}
+    requests: dict[tuple, int] = defaultdict(int)
+    for snapshot in snapshots.values():
+        for name, route, method, counts, total, count in snapshot["histograms"]:
+            merged = histograms.setdefault((name, route, method), [[0] * len(counts), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+        for route, method, status, count in snapshot["requests"]:
+            requests[(route, method, status)] += count
+    return {"histograms": histograms, "requests": requests}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(data: dict) -> str:
+    """Format ``collect()`` output in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {PREFIX}requests_total Requests handled, by route, method and status.",
+        f"# TYPE {PREFIX}requests_total counter",
+    ]
+    for (route, method, status), count in sorted(data["requests"].items()):
+        lines.append(f"{PREFIX}requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {PREFIX}{name} {help_text}", f"# TYPE {PREFIX}{name} histogram"]
+        for (metric, route, method), (counts, total, count) in sorted(data["histograms"].items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip([*buckets, "+Inf"], counts):
+                cumulative += bucket_count
+                labels = _labels(route=route, method=method, le=bound)
+                lines.append(f"{PREFIX}{name}_bucket{labels} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(route=route, method=method)} {total:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_labels(route=route, method=method)} {count}")
+    return "\n".join(lines) + "\n"
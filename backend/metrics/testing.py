@@ -0,0 +1,31 @@
+"""Query budgets for endpoint tests.
+
+::
+
+    def test_course_list_query_budget(client):
+        with query_budget(3):
+            client.get("/api/courses/")
+
+The block fails with every captured statement listed when it issues more
+queries than declared, which catches N+1 regressions such as a serializer
+falling back to one query per row when a prefetch is missing.
+"""
+
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, using: str = DEFAULT_DB_ALIAS):
+    """Fail when the block runs more than ``max_queries`` queries on ``using``."""
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    if len(captured) > max_queries:
+        statements = "\n".join(f"{index}. {query['sql']}" for index, query in enumerate(captured, start=1))
+        raise QueryBudgetExceeded(f"{len(captured)} queries exceed the budget of {max_queries}:\n{statements}")
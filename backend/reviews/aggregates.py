@@ -0,0 +1,142 @@
+"""Denormalised rating aggregates stored on ``courses.Course``.
+
+Course listings read ``rating_avg``/``rating_count`` straight from the course
+row. The review write paths fold each rating change into those columns inside
+the same transaction, and the bulk helpers below rebuild or audit them from the
+``Review`` table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterator
+
+from django.db import transaction
+from django.db.models import Count
+
+from courses.models import RATING_SCALE, Course, empty_rating_histogram
+from reviews.models import Review
+
+AGGREGATE_FIELDS = ["rating_count", "rating_sum", "rating_histogram", "rating_avg"]
+DEFAULT_BATCH_SIZE = 1000
+
+
+def average_rating(rating_sum: int, rating_count: int) -> Decimal:
+    if not rating_count:
+        return Decimal("0.00")
+    return (Decimal(rating_sum) / rating_count).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class RatingAggregate:
+    count: int = 0
+    total: int = 0
+    histogram: list[int] = field(default_factory=empty_rating_histogram)
+
+    @classmethod
+    def from_course(cls, course: Course) -> "RatingAggregate":
+        histogram = list(course.rating_histogram or empty_rating_histogram())
+        return cls(count=course.rating_count, total=course.rating_sum, histogram=histogram)
+
+    @property
+    def average(self) -> Decimal:
+        return average_rating(self.total, self.count)
+
+    def add(self, rating: int, times: int = 1) -> None:
+        self.count += times
+        self.total += rating * times
+        self.histogram[rating - RATING_SCALE.start] += times
+
+    def remove(self, rating: int) -> None:
+        self.add(rating, times=-1)
+
+    def matches(self, course: Course) -> bool:
+        return (
+            course.rating_count == self.count
+            and course.rating_sum == self.total
+            and list(course.rating_histogram or empty_rating_histogram()) == self.histogram
+            and course.rating_avg == self.average
+        )
+
+    def apply_to(self, course: Course) -> Course:
+        course.rating_count = self.count
+        course.rating_sum = self.total
+        course.rating_histogram = self.histogram
+        course.rating_avg = self.average
+        return course
+
+
+def apply_rating_change(course_id: int, added: int | None = None, removed: int | None = None) -> None:
+    """Fold one review rating change into the course aggregates.
+
+    The course row is locked for the rest of the surrounding transaction so
+    concurrent reviews of the same course serialise instead of losing updates.
+    The row is written with ``update()`` to keep catalog ``post_save`` hooks
+    (search indexing) off this path.
+    """
+    if added == removed:
+        return
+    with transaction.atomic():
+        course = Course.objects.select_for_update().only(*AGGREGATE_FIELDS).get(pk=course_id)
+        aggregate = RatingAggregate.from_course(course)
+        if removed is not None:
+            aggregate.remove(removed)
+        if added is not None:
+            aggregate.add(added)
+        Course.objects.filter(pk=course_id).update(
+            rating_count=aggregate.count,
+            rating_sum=aggregate.total,
+            rating_histogram=aggregate.histogram,
+            rating_avg=aggregate.average,
+        )
+
+
+def compute_aggregates(course_ids) -> dict[int, RatingAggregate]:
+    """Aggregate the reviews of ``course_ids`` with a single grouped query."""
+    aggregates = {course_id: RatingAggregate() for course_id in course_ids}
+    rows = (
+        Review.objects.filter(course_id__in=aggregates)
+        .order_by()
+        .values("course_id", "rating")
+        .annotate(total=Count("pk"))
+    )
+    for row in rows:
+        aggregates[row["course_id"]].add(row["rating"], times=row["total"])
+    return aggregates
+
+
+def _course_batches(batch_size: int) -> Iterator[list[Course]]:
+    batch: list[Course] = []
+    queryset = Course.objects.only("pk", *AGGREGATE_FIELDS).order_by("pk")
+    for course in queryset.iterator(chunk_size=batch_size):
+        batch.append(course)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def recompute_course_aggregates(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Rebuild the aggregates of every course, ``batch_size`` courses at a time.
+
+    Returns the number of courses whose stored aggregates changed.
+    """
+    updated = 0
+    for courses in _course_batches(batch_size):
+        expected = compute_aggregates([course.pk for course in courses])
+        stale = [expected[course.pk].apply_to(course) for course in courses if not expected[course.pk].matches(course)]
+        if stale:
+            Course.objects.bulk_update(stale, AGGREGATE_FIELDS)
+            updated += len(stale)
+    return updated
+
+
+def find_inconsistent_courses(batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[tuple[Course, RatingAggregate]]:
+    """Yield ``(course, expected)`` for courses whose aggregates have drifted."""
+    for courses in _course_batches(batch_size):
+        expected = compute_aggregates([course.pk for course in courses])
+        for course in courses:
+            if not expected[course.pk].matches(course):
+                yield course, expected[course.pk]
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.aggregates import DEFAULT_BATCH_SIZE, find_inconsistent_courses, recompute_course_aggregates
+from reviews.tasks import recompute_aggregates
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalised course rating aggregates from the review table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Courses processed per batch (default: {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report courses whose aggregates drifted; exit with an error if any did.",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue the rebuild as a background job for run_workers instead of running it now.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["enqueue"]:
+            job = recompute_aggregates.enqueue(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Queued job {job.pk} on {job.queue!r}."))
+            return
+        if not options["check"]:
+            updated = recompute_course_aggregates(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Recomputed aggregates, {updated} courses changed."))
+            return
+
+        drifted = 0
+        for course, expected in find_inconsistent_courses(batch_size=batch_size):
+            drifted += 1
+            self.stdout.write(
+                f"course {course.pk}: stored count={course.rating_count} sum={course.rating_sum} "
+                f"avg={course.rating_avg}, expected count={expected.count} sum={expected.total} avg={expected.average}"
+            )
+        if drifted:
+            raise CommandError(f"{drifted} courses have inconsistent rating aggregates.")
+        self.stdout.write(self.style.SUCCESS("All course rating aggregates are consistent."))
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import Count
+
+from reviews.aggregates import average_rating
+
+
+def backfill_aggregates(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Review = apps.get_model("reviews", "Review")
+
+    rows = Review.objects.order_by().values("course_id", "rating").annotate(total=Count("pk"))
+    aggregates = {}
+    for row in rows:
+        count, rating_sum, histogram = aggregates.get(row["course_id"], (0, 0, [0, 0, 0, 0, 0]))
+        histogram[row["rating"] - 1] += row["total"]
+        aggregates[row["course_id"]] = (count + row["total"], rating_sum + row["rating"] * row["total"], histogram)
+
+    courses = list(Course.objects.all())
+    for course in courses:
+        count, rating_sum, histogram = aggregates.get(course.pk, (0, 0, [0, 0, 0, 0, 0]))
+        course.rating_count = count
+        course.rating_sum = rating_sum
+        course.rating_histogram = histogram
+        course.rating_avg = average_rating(rating_sum, count)
+    Course.objects.bulk_update(courses, ["rating_count", "rating_sum", "rating_histogram", "rating_avg"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("courses", "0004_course_rating_aggregates"),
+        ("reviews", "0002_seed_reviews"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
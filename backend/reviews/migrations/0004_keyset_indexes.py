@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_keyset_indexes"),
+        ("reviews", "0003_backfill_course_rating_aggregates"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["course", "-created_at", "-id"], name="review_course_created_idx"),
+        ),
+    ]
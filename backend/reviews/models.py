@@ -12,6 +12,10 @@ class Review(models.Model):
     class Meta:
         ordering = ["-created_at"]
         unique_together = ("course", "user")
+        indexes = [
+            # Keyset pagination of a course's reviews, newest first.
+            models.Index(fields=["course", "-created_at", "-id"], name="review_course_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Review<{self.course_id}:{self.user_id}>"
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from api.fields import SparseFieldsSerializerMixin
 from reviews.models import Review
 
 User = get_user_model()
@@ -12,10 +13,11 @@ class ReviewUserSerializer(serializers.ModelSerializer):
         fields = ("id", "username", "first_name", "last_name")
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     user = ReviewUserSerializer(read_only=True)
 
     class Meta:
         model = Review
         fields = ("id", "course", "user", "rating", "text", "created_at")
         read_only_fields = ("course", "user", "created_at")
+        expandable_fields = ("user",)
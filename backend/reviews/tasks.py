@@ -0,0 +1,7 @@
+from jobs.queue import task
+from reviews.aggregates import DEFAULT_BATCH_SIZE, recompute_course_aggregates
+
+
+@task(queue="maintenance", timeout=3600)
+def recompute_aggregates(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    return recompute_course_aggregates(batch_size=batch_size)
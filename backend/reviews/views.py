@@ -1,12 +1,17 @@
+from django.db import transaction
 from rest_framework import permissions, viewsets
 from rest_framework.exceptions import NotFound
 
+from api.compiled import CompiledListMixin
+from api.db import ReplicaReadMixin
+from api.fields import SparseFieldsMixin
 from courses.models import Course
+from reviews.aggregates import apply_rating_change
 from reviews.models import Review
 from reviews.serializers import ReviewSerializer
 
 
-class CourseReviewViewSet(viewsets.ModelViewSet):
+class CourseReviewViewSet(ReplicaReadMixin, SparseFieldsMixin, CompiledListMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
@@ -21,6 +26,30 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
         course = self.get_course()
         return Review.objects.filter(course=course).select_related("user")
 
+    @transaction.atomic
     def perform_create(self, serializer):
         course = self.get_course()
-        serializer.save(course=course, user=self.request.user)
+        review = serializer.save(course=course, user=self.request.user)
+        apply_rating_change(course.pk, added=review.rating)
+
+    def locked_rating(self, review: Review) -> int:
+        """The stored rating of ``review``, locked until the transaction ends.
+
+        ``serializer.instance`` was read without a lock, so a concurrent edit may
+        have changed the rating since; the aggregate delta must use this one.
+        """
+        try:
+            return Review.objects.select_for_update().values_list("rating", flat=True).get(pk=review.pk)
+        except Review.DoesNotExist as exc:
+            raise NotFound("Review not found") from exc
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_rating = self.locked_rating(serializer.instance)
+        review = serializer.save()
+        apply_rating_change(review.course_id, added=review.rating, removed=previous_rating)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        apply_rating_change(instance.course_id, removed=self.locked_rating(instance))
+        instance.delete()
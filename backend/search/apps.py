@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "search"
+
+    def ready(self) -> None:
+        # Keep the inverted index in step with catalog writes.
+        from search import signals  # noqa: F401
@@ -0,0 +1,89 @@
+"""DRF filter backend that answers ``?search=`` from the inverted index."""
+
+from __future__ import annotations
+
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from rest_framework import filters
+
+from search.models import SearchPosting
+from search.text import tokenize
+
+# Upper bound on query terms so a pasted paragraph cannot explode the plan.
+MAX_QUERY_TERMS = 8
+
+# Terms shorter than this only match exactly; longer ones also match as prefixes
+# so results update while the visitor is still typing.
+MIN_PREFIX_LENGTH = 2
+
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+def index_enabled() -> bool:
+    return getattr(settings, "SEARCH_BACKEND", "index") == "index"
+
+
+def _term_match(term: str) -> Q:
+    if len(term) < MIN_PREFIX_LENGTH:
+        return Q(term=term)
+    if connection.vendor == "postgresql":
+        return Q(term__startswith=term)
+    # SQLite's LIKE is case-insensitive and skips the index; a range over the
+    # binary collation selects the same prefixes and can seek on it.
+    return Q(term__gte=term, term__lt=term + _PREFIX_UPPER_BOUND)
+
+
+def ranked_course_ids(query: str):
+    """Return a ``(course_id, rank)`` values queryset or ``None`` if unusable.
+
+    Every query term has to match at least one posting of a course; the rank is
+    the summed weight of all matching postings, with exact term hits counted
+    twice so whole words beat prefixes.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+
+    matches = [_term_match(term) for term in terms]
+    hits = {f"hit_{index}": Count("pk", filter=match) for index, match in enumerate(matches)}
+    exact = Sum("weight", filter=Q(term__in=terms), default=0)
+    return (
+        SearchPosting.objects.filter(reduce(or_, matches))
+        .values("course_id")
+        .annotate(rank=Sum("weight") + exact, **hits)
+        .filter(**{f"{name}__gt": 0 for name in hits})
+    )
+
+
+class InvertedIndexSearchFilter(filters.SearchFilter):
+    """Rank ``?search=`` matches with the inverted index.
+
+    Falls back to the regular ``SearchFilter`` behaviour over the view's
+    ``search_fields`` when the index is switched off with
+    ``SEARCH_BACKEND = "database"`` or when the query has no indexable terms
+    (for example only stopwords or punctuation).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not index_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        query = request.query_params.get(self.search_param, "")
+        if not query.strip():
+            return queryset
+
+        ranked = ranked_course_ids(query)
+        if ranked is None:
+            return super().filter_queryset(request, queryset, view)
+
+        rank = Subquery(ranked.filter(course_id=OuterRef("pk")).values("rank")[:1], output_field=IntegerField())
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return (
+            queryset.filter(pk__in=ranked.values("course_id"))
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", *ordering)
+        )
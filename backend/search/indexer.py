@@ -0,0 +1,57 @@
+"""Build and maintain the course inverted index."""
+
+from __future__ import annotations
+
+from django.db import transaction
+
+from courses.models import Course
+from search.models import SearchPosting
+from search.text import course_terms
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def postings_for(course) -> list[SearchPosting]:
+    return [
+        SearchPosting(course_id=course.pk, term=term, weight=weight)
+        for term, weight in course_terms(course).items()
+    ]
+
+
+@transaction.atomic
+def index_course(course: Course) -> None:
+    """Replace the postings of a single course."""
+    SearchPosting.objects.filter(course_id=course.pk).delete()
+    SearchPosting.objects.bulk_create(postings_for(course))
+
+
+def index_courses(queryset=None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Reindex ``queryset`` (all courses by default) in batches.
+
+    Each batch replaces its postings in one transaction so readers never see a
+    course half indexed. Returns the number of courses indexed.
+    """
+    if queryset is None:
+        queryset = Course.objects.all()
+    queryset = queryset.select_related("publisher", "teacher").order_by("pk")
+
+    indexed = 0
+    batch: list[Course] = []
+    for course in queryset.iterator(chunk_size=batch_size):
+        batch.append(course)
+        if len(batch) >= batch_size:
+            indexed += _index_batch(batch)
+            batch = []
+    if batch:
+        indexed += _index_batch(batch)
+    return indexed
+
+
+@transaction.atomic
+def _index_batch(courses: list[Course]) -> int:
+    SearchPosting.objects.filter(course_id__in=[course.pk for course in courses]).delete()
+    postings = []
+    for course in courses:
+        postings.extend(postings_for(course))
+    SearchPosting.objects.bulk_create(postings, batch_size=DEFAULT_BATCH_SIZE * 10)
+    return len(courses)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import itertools
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from courses.models import Course, Publisher, Teacher
+from courses.views import CourseViewSet
+from search.models import SearchPosting
+from search.text import course_terms
+
+# Syllables per language; synthetic words drawn with a Zipfian distribution give
+# the index a realistic mix of very common and rare terms.
+SYLLABLES = {
+    "en": "ka ri mo sun dar vel tor an is ep lo gra nu fen spi zo".split(),
+    "fa": "کا ری مو سن در ول تو ان ای پی لو گر نو فن سپ زو".split(),
+    "ar": "قا رى مو سا دا ول تو ان عي بي لو غر نو فن سب زو".split(),
+}
+LEXICON_SIZE = 20_000
+PAGE_SIZE = 12
+
+
+class Command(BaseCommand):
+    help = "Compare ?search= latency of the inverted index against icontains scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000],
+            help="Catalog sizes to benchmark (default: 10000 100000 1000000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per query and backend (default: 5).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic courses instead of rolling them back.",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic catalog.")
+
+    def handle(self, *args, **options):
+        randomizer = random.Random(options["seed"])
+        lexicons = {language: self._lexicon(syllables) for language, syllables in SYLLABLES.items()}
+        queries = self._queries(lexicons)
+        with transaction.atomic():
+            publisher, _ = Publisher.objects.get_or_create(slug="bench-press", defaults={"name": "Bench Press"})
+            teacher, _ = Teacher.objects.get_or_create(name="Bench Mentor")
+            self.stdout.write(f"{'courses':>10} {'backend':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+            for size in sorted(options["sizes"]):
+                self._grow_catalog(size, publisher, teacher, lexicons, randomizer)
+                for backend in ("index", "database"):
+                    samples = self._measure(backend, queries, options["repeat"])
+                    self.stdout.write(
+                        f"{size:>10} {backend:>9} {self._percentile(samples, 50):>9.2f} "
+                        f"{self._percentile(samples, 95):>9.2f} {statistics.fmean(samples):>9.2f}"
+                    )
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def _lexicon(syllables: list[str]) -> list[str]:
+        words = []
+        for first in syllables:
+            for second in syllables:
+                for third in syllables:
+                    for fourth in ("", *syllables):
+                        words.append(first + second + third + fourth)
+        return words[:LEXICON_SIZE]
+
+    @staticmethod
+    def _queries(lexicons: dict[str, list[str]]) -> list[str]:
+        queries = []
+        for words in lexicons.values():
+            queries.extend([words[10], words[500], words[5_000], words[300][:4], f"{words[20]} {words[900]}"])
+        return queries
+
+    def _grow_catalog(self, size, publisher, teacher, lexicons, randomizer) -> None:
+        cumulative = list(itertools.accumulate(1 / rank for rank in range(1, LEXICON_SIZE + 1)))
+        missing = size - Course.objects.count()
+        batch_size = 5_000
+        while missing > 0:
+            courses = []
+            for _ in range(min(batch_size, missing)):
+                language = randomizer.choice(list(lexicons))
+                words = lexicons[language]
+                courses.append(
+                    Course(
+                        title=" ".join(randomizer.choices(words, cum_weights=cumulative, k=3)),
+                        description=" ".join(randomizer.choices(words, cum_weights=cumulative, k=30)),
+                        price_amount=Decimal("19.00"),
+                        language=language,
+                        publisher=publisher,
+                        teacher=teacher,
+                    )
+                )
+            # bulk_create skips post_save, so the postings are written here.
+            created = Course.objects.bulk_create(courses)
+            SearchPosting.objects.bulk_create(
+                [
+                    SearchPosting(course_id=course.pk, term=term, weight=weight)
+                    for course in created
+                    for term, weight in course_terms(course).items()
+                ],
+                batch_size=batch_size * 10,
+            )
+            missing -= len(created)
+
+    def _measure(self, backend: str, queries: list[str], repeat: int) -> list[float]:
+        factory = APIRequestFactory()
+        view = CourseViewSet()
+        samples = []
+        with override_settings(SEARCH_BACKEND=backend):
+            for query in queries:
+                request = Request(factory.get("/api/courses/", {"search": query}))
+                view.request = request
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    queryset = view.filter_queryset(view.get_queryset())
+                    # Mirror what the paginator does for the first page.
+                    queryset.count()
+                    list(queryset[:PAGE_SIZE])
+                    samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    @staticmethod
+    def _percentile(samples: list[float], percentile: int) -> float:
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+        return ordered[index]
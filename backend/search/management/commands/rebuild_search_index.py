@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from search.indexer import DEFAULT_BATCH_SIZE, index_courses
+
+
+class Command(BaseCommand):
+    help = "Rebuild the course search index from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Courses reindexed per transaction (default: {DEFAULT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        indexed = index_courses(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} courses."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("courses", "0003_seed_dynamic_demo_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchPosting",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.PositiveIntegerField(default=1)),
+                ("course", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="search_postings", to="courses.course")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["term"], name="search_posting_term_idx", opclasses=["varchar_pattern_ops"])],
+                "unique_together": {("course", "term")},
+            },
+        ),
+    ]
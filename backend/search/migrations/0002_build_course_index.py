@@ -0,0 +1,31 @@
+from django.db import migrations
+
+from search.text import course_terms
+
+
+def build_index(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    SearchPosting = apps.get_model("search", "SearchPosting")
+
+    postings = []
+    for course in Course.objects.select_related("publisher", "teacher").iterator():
+        postings.extend(
+            SearchPosting(course_id=course.pk, term=term, weight=weight)
+            for term, weight in course_terms(course).items()
+        )
+    SearchPosting.objects.bulk_create(postings, batch_size=1000)
+
+
+def drop_index(apps, schema_editor):
+    SearchPosting = apps.get_model("search", "SearchPosting")
+    SearchPosting.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, drop_index),
+    ]
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class SearchPosting(models.Model):
+    """One term of a course's searchable text with its ranking weight."""
+
+    course = models.ForeignKey("courses.Course", on_delete=models.CASCADE, related_name="search_postings")
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ("course", "term")
+        indexes = [
+            # varchar_pattern_ops lets PostgreSQL serve prefix (LIKE 'x%') lookups
+            # from the index; other backends ignore the operator class.
+            models.Index(fields=["term"], name="search_posting_term_idx", opclasses=["varchar_pattern_ops"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.term}->{self.course_id} ({self.weight})"
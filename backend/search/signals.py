@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from courses.models import Course, Publisher, Teacher
+from search.indexer import index_course, index_courses
+
+
+@receiver(post_save, sender=Course)
+def index_saved_course(sender, instance: Course, raw: bool = False, **kwargs):
+    if raw:
+        return
+    index_course(instance)
+
+
+@receiver(post_save, sender=Publisher)
+@receiver(post_save, sender=Teacher)
+def reindex_related_courses(sender, instance, created: bool, raw: bool = False, **kwargs):
+    # Postings of deleted courses go away with the ON DELETE CASCADE, and
+    # publishers/teachers are protected from deletion while courses use them.
+    if raw or created:
+        return
+    index_courses(instance.courses.all())
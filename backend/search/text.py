@@ -0,0 +1,133 @@
+"""Tokenisation and normalisation for the catalog search index.
+
+The same functions are used when building postings and when parsing a query so
+that both sides agree on the shape of a term. Normalisation is script aware:
+Latin text is case folded, Arabic and Persian text has diacritics, tatweel and
+letter variants (Arabic yeh/kaf vs Persian yeh/keheh, hamza-carrying alefs)
+folded to a single form, and Eastern Arabic digits become ASCII digits.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+
+MAX_TERM_LENGTH = 64
+
+# Relative importance of each indexed field when ranking matches.
+FIELD_WEIGHTS = {
+    "title": 8,
+    "publisher": 4,
+    "teacher": 4,
+    "language": 2,
+    "description": 1,
+}
+
+# Occurrences of a term beyond this count do not add to its weight.
+MAX_TERM_FREQUENCY = 5
+
+ZWNJ = "\u200c"
+
+_ARABIC_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]")
+_LETTER_FOLDS = str.maketrans(
+    {
+        "ي": "ی",  # Arabic yeh -> Persian yeh
+        "ى": "ی",  # alef maksura -> Persian yeh
+        "ك": "ک",  # Arabic kaf -> keheh
+        "أ": "ا",  # alef with hamza above -> alef
+        "إ": "ا",  # alef with hamza below -> alef
+        "آ": "ا",  # alef with madda -> alef
+        "ٱ": "ا",  # alef wasla -> alef
+        "ة": "ه",  # teh marbuta -> heh
+        "ـ": None,  # tatweel
+    }
+)
+_DIGIT_FOLDS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+_TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = {
+    "en": frozenset(
+        "a an and are as at be by for from in into is it of on or the to with".split()
+    ),
+    "fa": frozenset("و در به از که این آن با برای را تا یا هم ها های".split()),
+    "ar": frozenset("و في من إلى على عن مع هذا هذه ذلك التي الذي او ثم".translate(_LETTER_FOLDS).split()),
+}
+ALL_STOPWORDS = frozenset().union(*STOPWORDS.values())
+
+ARABIC_ARTICLE = "ال"
+
+
+def normalize(text: str) -> str:
+    """Return ``text`` folded to the canonical form used by the index."""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = _ARABIC_DIACRITICS.sub("", text)
+    text = text.translate(_LETTER_FOLDS).translate(_DIGIT_FOLDS)
+    return text.casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into normalised terms, dropping stopwords.
+
+    ZWNJ is treated as a word boundary so Persian compounds such as
+    ``کتاب‌ها`` are searchable by their stem.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(normalize(text).replace(ZWNJ, " ")):
+        if token in ALL_STOPWORDS:
+            continue
+        tokens.append(token[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def _expand(text: str, language: str) -> list[str]:
+    """Tokenise indexed text, adding the variants a reader may search for."""
+    terms = tokenize(text)
+    normalized = normalize(text)
+    if ZWNJ in normalized:
+        # Also index the compound as written without the joiner.
+        terms.extend(
+            token[:MAX_TERM_LENGTH]
+            for token in _TOKEN_RE.findall(normalized.replace(ZWNJ, ""))
+            if token not in ALL_STOPWORDS
+        )
+    if language == "ar":
+        # Arabic readers frequently omit the definite article.
+        terms.extend(
+            term[len(ARABIC_ARTICLE):]
+            for term in list(terms)
+            if term.startswith(ARABIC_ARTICLE) and len(term) > len(ARABIC_ARTICLE) + 1
+        )
+    return terms
+
+
+def document_terms(fields: dict[str, str], language: str = "") -> dict[str, int]:
+    """Return the weighted term vector for a document made of ``fields``.
+
+    ``fields`` maps keys of :data:`FIELD_WEIGHTS` to raw text; ``language`` is
+    the document's language code and enables language specific variants.
+    """
+    language = (language or "").lower()
+    weights: Counter[str] = Counter()
+    for field, text in fields.items():
+        field_weight = FIELD_WEIGHTS[field]
+        for term, frequency in Counter(_expand(text, language)).items():
+            weights[term] += field_weight * min(frequency, MAX_TERM_FREQUENCY)
+    return dict(weights)
+
+
+def course_terms(course) -> dict[str, int]:
+    """Return the term vector for a course with its publisher and teacher loaded.
+
+    Accepts historical models as well, so migrations can build the index.
+    """
+    return document_terms(
+        {
+            "title": course.title,
+            "description": course.description,
+            "language": course.language,
+            "publisher": course.publisher.name,
+            "teacher": course.teacher.name,
+        },
+        language=course.language,
+    )
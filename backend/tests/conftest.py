@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached responses would otherwise outlive the database rollback between tests.
+    cache.clear()
+    yield
+    cache.clear()
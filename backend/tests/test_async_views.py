@@ -0,0 +1,49 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from courses.models import Course
+
+
+@pytest.mark.django_db
+def test_async_course_list_matches_sync_listing():
+    sync = APIClient().get("/api/courses/", {"language": "en"}).json()
+    response = APIClient().get("/api/async/courses/", {"language": "en"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["count"] == sync["count"] == Course.objects.filter(language__iexact="en").count()
+    assert payload["results"] == sync["results"]
+    assert (payload["next"] is None) == (sync["next"] is None)
+
+
+@pytest.mark.django_db
+def test_async_course_list_rejects_out_of_range_page():
+    assert APIClient().get("/api/async/courses/", {"page": 9999}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_profile_requires_valid_token():
+    client = APIClient()
+    assert client.get("/api/async/profile/me/").status_code == 401
+
+    client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+    response = client.get("/api/async/profile/me/")
+    assert response.status_code == 401
+    assert response.json()["code"] == "token_not_valid"
+
+
+@pytest.mark.django_db
+def test_async_profile_matches_sync_profile():
+    client = APIClient()
+    tokens = client.post("/api/token/", {"username": "dev", "password": "dev123456"}, format="json").json()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    assert client.get("/api/async/profile/me/").json() == client.get("/api/profile/me/").json()
+
+
+def test_async_healthz_runs_on_event_loop():
+    response = async_to_sync(AsyncClient().get)("/api/async/healthz/")
+
+    assert response.json() == {"ok": True, "service": "dunetube-api"}
@@ -0,0 +1,96 @@
+import io
+
+import pytest
+from django.contrib.auth import authenticate
+from django.core.management import CommandError, call_command
+from django.db import transaction
+
+from benchmarks.dataset import BENCH_PASSWORD, generate_dataset, scaled
+from benchmarks.suite import Result, build_scenarios, compare, run_scenario
+from courses.models import Course
+from lessons.models import Lesson
+from reviews.aggregates import find_inconsistent_courses
+from reviews.models import Review
+from search.indexer import postings_for
+from search.models import SearchPosting
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dataset_is_seeded_in_bulk_and_scenarios_run():
+    spec = scaled("tiny", courses=20, reviews=50)
+
+    created = generate_dataset(spec)
+
+    assert created["courses"] == Course.objects.filter(publisher__slug__startswith="bench-").count() == 20
+    assert Lesson.objects.filter(course__publisher__slug__startswith="bench-").count() == 20 * spec.lessons_per_course
+    assert Review.objects.filter(user__username__startswith="bench-user-").count() == 50
+    assert SearchPosting.objects.filter(course__publisher__slug__startswith="bench-").exists()
+    reviewed = Course.objects.filter(publisher__slug__startswith="bench-", rating_count__gt=0)
+    assert sum(reviewed.values_list("rating_count", flat=True)) == 50
+
+    scenario = next(scenario for scenario in build_scenarios() if scenario.name == "course_reviews")
+    result = run_scenario(scenario, requests=6, concurrency=2)
+    assert result.errors == 0
+    assert result.requests == 6
+    assert result.queries > 0
+
+
+def test_compare_flags_slower_and_chattier_results():
+    baseline = {"p95_ms": 10.0, "rps": 100.0, "queries": 2.0, "errors": 0}
+    result = Result("course_list", 100, 0, rps=70.0, p50_ms=5.0, p95_ms=14.0, p99_ms=20.0, queries=3.0)
+
+    regressions = compare(result, baseline, tolerance=0.25)
+
+    assert regressions == [
+        "p95 10.0 -> 14.0 ms",
+        "throughput 100.0 -> 70.0 req/s",
+        "queries 2.0 -> 3.0 per request",
+    ]
+    assert compare(result, None, tolerance=0.25) == []
+
+
+@pytest.mark.django_db
+def test_generated_rows_match_what_the_models_would_write():
+    spec = scaled("tiny", users=500, courses=30, reviews=400, popularity_skew=1.2, batch_size=64)
+
+    generate_dataset(spec)
+
+    courses = Course.objects.filter(publisher__slug__startswith="bench-").select_related("publisher", "teacher")
+    assert list(find_inconsistent_courses()) == []
+    counts = sorted(courses.values_list("rating_count", flat=True), reverse=True)
+    assert sum(counts) == Review.objects.filter(user__username__startswith="bench-user-").count() == 400
+    # Zipfian popularity: the most reviewed course gets a large share.
+    assert counts[0] >= 4 * counts[len(counts) // 2]
+    course = courses.first()
+    indexed = SearchPosting.objects.filter(course=course).values_list("term", "weight")
+    assert sorted(indexed) == sorted((posting.term, posting.weight) for posting in postings_for(course))
+    assert authenticate(username="bench-user-0", password=BENCH_PASSWORD) is not None
+    last_generated = max(courses.values_list("pk", flat=True))
+    assert Course.objects.create(
+        title="After", description="", price_amount=0, publisher=course.publisher, teacher=course.teacher
+    ).pk > last_generated
+
+
+@pytest.mark.django_db
+def test_same_seed_generates_the_same_catalog():
+    def generate(seed):
+        with transaction.atomic():
+            generate_dataset(scaled("tiny", courses=10, seed=seed))
+            rows = list(Course.objects.order_by("pk").values_list("pk", "title", "rating_histogram", "participants_count"))
+            transaction.set_rollback(True)
+        return rows
+
+    assert generate(7) == generate(7)
+    assert generate(7) != generate(8)
+
+
+@pytest.mark.django_db
+def test_generate_dataset_command_refuses_a_seeded_database():
+    out = io.StringIO()
+    call_command("generate_dataset", "--scale", "tiny", "--courses", "5", "--no-search-index", stdout=out)
+
+    assert "Generated" in out.getvalue()
+    assert Course.objects.filter(publisher__slug__startswith="bench-").count() == 5
+    assert not SearchPosting.objects.filter(course__publisher__slug__startswith="bench-").exists()
+    with pytest.raises(CommandError):
+        call_command("generate_dataset", "--scale", "tiny", stdout=io.StringIO())
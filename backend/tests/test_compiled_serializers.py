@@ -0,0 +1,134 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from api.compiled import compile_serializer
+from courses.models import Course, Publisher, Teacher
+from courses.serializers import CourseSerializer
+from lessons.models import Lesson
+from lessons.serializers import LessonSerializer
+from metrics.testing import query_budget
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+
+
+def _contract(serializer_class, queryset, **selection):
+    """Compiled rows must equal DRF's output for the same objects."""
+    compiled = compile_serializer(serializer_class, **selection)
+    assert compiled is not None
+    expected = serializer_class(list(queryset), many=True, **selection).data
+    rows = compiled(queryset.values(*compiled.columns))
+    assert rows == [dict(item) for item in expected]
+    return rows
+
+
+@pytest.fixture
+def awkward_course():
+    """Values at the edges of each field's representation."""
+    return Course.objects.create(
+        publisher=Publisher.objects.create(name="Edge Press", slug="edge-press"),
+        teacher=Teacher.objects.create(name="Edge Teacher"),
+        title="Ünïcode   title",
+        description="",
+        price_amount=Decimal("7"),
+        tags=[],
+        rating_avg=Decimal("4.5"),
+        published_at=timezone.now().replace(microsecond=0) - timedelta(days=3),
+    )
+
+
+@pytest.mark.django_db
+def test_course_rows_match_the_serializer(awkward_course):
+    rows = _contract(CourseSerializer, Course.objects.order_by("pk"))
+
+    edge = next(row for row in rows if row["id"] == awkward_course.pk)
+    assert edge["price_amount"] == "7.00"
+    assert edge["rating_avg"] == "4.50"
+    assert edge["published_at"].endswith("Z")
+
+
+@pytest.mark.django_db
+def test_sparse_selections_match_the_serializer(awkward_course):
+    courses = Course.objects.order_by("pk")
+    _contract(CourseSerializer, courses, fields=["id", "title", "publisher", "price_amount"], expand=[])
+    _contract(CourseSerializer, courses, fields=["title"], expand=["teacher"])
+
+
+@pytest.mark.django_db
+def test_review_and_lesson_rows_match_the_serializer():
+    course = Course.objects.first()
+    user = get_user_model().objects.create(username="compiled-critic", first_name="Ada")
+    Review.objects.create(course=course, user=user, rating=3, text="Fine.")
+
+    _contract(ReviewSerializer, Review.objects.order_by("pk"))
+    _contract(ReviewSerializer, Review.objects.order_by("pk"), fields=["rating", "user"], expand=None)
+    _contract(LessonSerializer, Lesson.objects.order_by("pk"))
+
+
+def test_method_fields_are_not_compiled():
+    class AnnotatedCourseSerializer(CourseSerializer):
+        badge = serializers.SerializerMethodField()
+
+        class Meta(CourseSerializer.Meta):
+            fields = (*CourseSerializer.Meta.fields, "badge")
+
+        def get_badge(self, course):
+            return "new"
+
+    assert compile_serializer(AnnotatedCourseSerializer) is None
+
+
+@pytest.mark.django_db
+def test_list_endpoints_render_the_same_json_compiled_or_not(awkward_course):
+    client = APIClient()
+    course = Course.objects.first()
+    Review.objects.create(course=course, user=get_user_model().objects.create(username="either-way"), rating=5)
+    requests = [
+        ("/api/courses/", {}),
+        ("/api/courses/", {"ordering": "-price_amount", "cursor": ""}),
+        ("/api/courses/", {"search": "edge", "fields": "id,title,publisher", "expand": "publisher"}),
+        ("/api/lessons/", {"course": course.pk}),
+        (f"/api/courses/{course.pk}/reviews/", {}),
+    ]
+    for path, params in requests:
+        compiled = client.get(path, params)
+        # The response cache key does not depend on the setting.
+        cache.clear()
+        with override_settings(COMPILED_SERIALIZERS=False):
+            regular = client.get(path, params)
+        assert compiled.status_code == regular.status_code == 200
+        assert compiled.json() == regular.json(), path
+
+
+@pytest.mark.django_db
+def test_list_endpoints_skip_the_serializer(monkeypatch):
+    def refuse(self, instance):
+        raise AssertionError("serializer used on a compiled list")
+
+    monkeypatch.setattr(serializers.Serializer, "to_representation", refuse)
+    course = Course.objects.first()
+    client = APIClient()
+
+    assert client.get("/api/courses/").status_code == 200
+    assert client.get("/api/lessons/", {"course": course.pk}).status_code == 200
+    assert client.get("/api/async/courses/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_compiled_cursor_walk_covers_every_course_once():
+    client = APIClient()
+    url, params, seen = "/api/courses/", {"ordering": "rating_avg", "cursor": ""}, []
+    while url:
+        with query_budget(1):
+            body = client.get(url, params).json()
+        seen.extend(item["id"] for item in body["results"])
+        url, params = body["next"], None
+
+    assert seen == list(Course.objects.order_by("rating_avg", "pk").values_list("pk", flat=True))
@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from lessons.models import Lesson
+from metrics.testing import query_budget
+from reviews.models import Review
+
+
+def _bundle(client, course, **extra):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/api/courses/{course.pk}/bundle/", **extra)
+    return response, len(queries)
+
+
+@pytest.fixture
+def reviewed_course():
+    course, other = Course.objects.filter(reviews__isnull=True).order_by("pk")[:2]
+    User = get_user_model()
+    for index, rating in enumerate([5, 4, 4]):
+        Review.objects.create(course=course, user=User.objects.create(username=f"bundle-critic{index}"), rating=rating)
+    Course.objects.filter(pk=course.pk).update(rating_count=3, rating_sum=13, rating_histogram=[0, 0, 0, 2, 1])
+    return Course.objects.get(pk=course.pk), other
+
+
+@pytest.mark.django_db
+def test_bundle_holds_the_course_page_in_three_queries(reviewed_course):
+    course, _ = reviewed_course
+
+    with query_budget(3):
+        response = APIClient().get(f"/api/courses/{course.pk}/bundle/")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["course"]["id"] == course.pk
+    assert [lesson["id"] for lesson in body["lessons"]] == list(
+        Lesson.objects.filter(course=course).order_by("order", "id").values_list("pk", flat=True)
+    )
+    assert body["reviews"]["count"] == 3
+    assert body["reviews"]["breakdown"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1}
+    assert [review["user"]["username"] for review in body["reviews"]["results"]] == [
+        "bundle-critic2",
+        "bundle-critic1",
+        "bundle-critic0",
+    ]
+    assert body["reviews"]["next"] is None
+
+
+@pytest.mark.django_db
+def test_bundle_cache_follows_the_course_generation(reviewed_course):
+    course, other = reviewed_course
+    client = APIClient()
+    first, _ = _bundle(client, course)
+
+    Review.objects.create(course=other, user=get_user_model().objects.create(username="elsewhere"), rating=1)
+    cached, queries = _bundle(client, course)
+    assert queries == 0
+    assert cached.content == first.content
+
+    Lesson.objects.filter(course=course).first().save()
+    refreshed, queries = _bundle(client, course, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert refreshed.status_code == 200
+    assert queries == 3
+
+
+@pytest.mark.django_db
+def test_bundle_is_not_cached_for_authenticated_users(reviewed_course):
+    course, _ = reviewed_course
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create(username="bundle-reader"))
+
+    _bundle(client, course)
+    response, queries = _bundle(client, course)
+
+    assert response.status_code == 200
+    assert queries > 0
+    assert "ETag" not in response
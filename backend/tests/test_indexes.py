@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+
+from courses.models import Course
+from courses.views import CourseViewSet, filter_courses
+from reviews.models import Review
+
+CATALOG = CourseViewSet.queryset
+
+
+def _plan(queryset) -> str:
+    if connection.vendor == "postgresql":
+        # The test tables are tiny; make the planner show whether an index is usable at all.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+def _table_steps(plan: str, table: str) -> list[str]:
+    return [line for line in plan.splitlines() if table in line]
+
+
+def assert_index_scan(queryset, table: str, index: str) -> None:
+    plan = _plan(queryset)
+    if connection.vendor == "postgresql":
+        assert f"Seq Scan on {table}" not in plan, plan
+        assert index in plan, plan
+    else:
+        steps = _table_steps(plan, table)
+        assert steps and all(f"USING INDEX {index}" in step for step in steps), plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("queryset", "index"),
+    [
+        (CATALOG.all()[:20], "course_published_title_idx"),
+        (CATALOG.order_by("-published_at", "title", "pk")[:20], "course_published_title_idx"),
+        (filter_courses(CATALOG.all(), {"publisher": "arrakis"})[:20], "course_publisher_published_idx"),
+        (filter_courses(CATALOG.all(), {"teacher": "1"})[:20], "course_teacher_published_idx"),
+        (filter_courses(CATALOG.all(), {"language": "EN"})[:20], "course_language_published_idx"),
+        (CATALOG.order_by("-rating_avg", "-pk")[:20], "course_rating_idx"),
+        (CATALOG.order_by("-participants_count")[:20], "course_participants_idx"),
+        (CATALOG.order_by("price_amount", "pk")[:20], "course_price_idx"),
+    ],
+    ids=["default", "keyset", "publisher", "teacher", "language", "rating", "participants", "price"],
+)
+def test_catalog_queries_read_an_index(queryset, index):
+    assert_index_scan(queryset, Course._meta.db_table, index)
+
+
+@pytest.mark.django_db
+def test_course_reviews_read_an_index():
+    queryset = Review.objects.filter(course_id=1).order_by("-created_at", "-id")[:20]
+
+    assert_index_scan(queryset, Review._meta.db_table, "review_course_created_idx")
+
+
+@pytest.mark.django_db
+def test_language_filter_is_case_insensitive(client):
+    course = Course.objects.first()
+    Course.objects.filter(pk=course.pk).update(language="Fa")
+
+    response = client.get("/api/courses/", {"language": "FA"})
+
+    assert course.pk in [item["id"] for item in response.json()["results"]]
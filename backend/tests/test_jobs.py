@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, enqueue, execute_job, retry_jobs, task
+from reviews.tasks import recompute_aggregates
+
+CALLS = []
+
+
+@task(queue="test", max_attempts=2)
+def record_call(value):
+    CALLS.append(value)
+
+
+@task(queue="test", max_attempts=2)
+def always_fail():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+@pytest.mark.django_db
+def test_enqueued_job_runs_once_and_succeeds():
+    job = record_call.enqueue("hello")
+
+    claimed = claim_jobs("worker-a", ["test"])
+    assert [item.pk for item in claimed] == [job.pk]
+    assert claim_jobs("worker-b", ["test"]) == []
+
+    assert execute_job(claimed[0], "worker-a") == Job.SUCCEEDED
+    job.refresh_from_db()
+    assert CALLS == ["hello"]
+    assert (job.status, job.attempts) == (Job.SUCCEEDED, 1)
+
+
+@pytest.mark.django_db
+def test_failing_job_backs_off_then_dead_letters():
+    job = always_fail.enqueue()
+
+    assert execute_job(claim_jobs("worker", ["test"])[0], "worker") == Job.QUEUED
+    job.refresh_from_db()
+    assert job.run_at > timezone.now() and "RuntimeError: boom" in job.last_error
+    assert claim_jobs("worker", ["test"]) == []
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    assert execute_job(claim_jobs("worker", ["test"])[0], "worker") == Job.DEAD
+
+    assert retry_jobs(Job.objects.filter(pk=job.pk)) == 1
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.QUEUED, 0)
+
+
+@pytest.mark.django_db
+def test_expired_visibility_timeout_lets_another_worker_reclaim():
+    job = record_call.enqueue("late")
+    claim_jobs("crashed-worker", ["test"])
+    Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+    reclaimed = claim_jobs("worker", ["test"])
+    assert [item.pk for item in reclaimed] == [job.pk]
+    # The crashed worker can no longer record an outcome over the new claim.
+    execute_job(reclaimed[0], "crashed-worker")
+    assert Job.objects.get(pk=job.pk).status == Job.RUNNING
+
+
+@pytest.mark.django_db
+def test_run_workers_burst_drains_due_jobs():
+    enqueue(record_call, args=["first"])
+    enqueue(record_call, args=["later"], delay=3600)
+    recompute_aggregates.enqueue(batch_size=50)
+
+    call_command("run_workers", processes=0, burst=True)
+
+    assert CALLS == ["first"]
+    assert Job.objects.filter(status=Job.SUCCEEDED).count() == 2
+    assert Job.objects.get(queue="maintenance").kwargs == {"batch_size": 50}
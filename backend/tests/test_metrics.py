@@ -0,0 +1,80 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from metrics.registry import registry
+from metrics.testing import QueryBudgetExceeded, query_budget
+
+# Declared query budgets of the main read endpoints; raise them deliberately.
+QUERY_BUDGETS = {
+    "/api/courses/": 2,
+    "/api/courses/{course}/": 1,
+    "/api/lessons/?course={course}": 1,
+    "/api/courses/{course}/reviews/": 3,
+    "/api/courses/{course}/bundle/": 3,
+    "/api/async/courses/": 2,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+@pytest.fixture
+def staff_client():
+    user = get_user_model().objects.create_user("metrics-admin", password="metrics-pass", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", QUERY_BUDGETS)
+def test_endpoint_stays_within_query_budget(path):
+    url = path.format(course=Course.objects.first().pk)
+
+    with query_budget(QUERY_BUDGETS[path]):
+        assert APIClient().get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_query_budget_lists_the_queries_over_budget():
+    with pytest.raises(QueryBudgetExceeded, match="2 queries exceed the budget of 1"):
+        with query_budget(1):
+            list(Course.objects.all())
+            list(Course.objects.all())
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_staff_only():
+    assert APIClient().get("/api/metrics/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_requests_are_recorded_per_route(staff_client):
+    APIClient().get("/api/courses/")
+    APIClient().get("/api/courses/")
+
+    response = staff_client.get("/api/metrics/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.content.decode()
+    assert 'dunetube_http_requests_total{route="course-list",method="GET",status="200"} 2' in body
+    assert 'dunetube_http_db_queries_count{route="course-list",method="GET"} 2' in body
+    assert 'dunetube_http_db_queries_bucket{route="course-list",method="GET",le="2"} 2' in body
+    assert 'dunetube_http_serialization_seconds_bucket{route="course-list",method="GET",le="+Inf"} 2' in body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_view_queries_are_counted(staff_client):
+    async_to_sync(AsyncClient().get)("/api/async/courses/")
+
+    body = staff_client.get("/api/metrics/").content.decode()
+    assert 'dunetube_http_db_queries_sum{route="async-course-list",method="GET"} 2.000000' in body
@@ -0,0 +1,63 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from reviews.models import Review
+
+
+def _walk(client, url, params=None):
+    """Follow ``next`` links from the first cursor page; return ids and pages."""
+    response = client.get(url, {"cursor": "", **(params or {})})
+    pages = [response.json()]
+    while pages[-1]["next"]:
+        pages.append(client.get(pages[-1]["next"]).json())
+    return [item["id"] for page in pages for item in page["results"]], pages
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", [None, "price_amount", "-rating_avg", "title"])
+def test_course_cursor_walk_matches_ordering(ordering):
+    client = APIClient()
+    params = {"ordering": ordering} if ordering else {}
+    ids, pages = _walk(client, "/api/courses/", params)
+
+    expected = Course.objects.order_by(*([ordering] if ordering else []), *Course._meta.ordering, "pk")
+    assert len(ids) == len(set(ids)) == expected.count()
+    assert len(pages) > 1
+    assert "count" not in pages[0]
+    if ordering is None:
+        assert ids == list(expected.values_list("id", flat=True))
+
+    previous = client.get(pages[1]["previous"]).json()
+    assert [item["id"] for item in previous["results"]] == [item["id"] for item in pages[0]["results"]]
+    assert previous["previous"] is None
+
+
+@pytest.mark.django_db
+def test_review_cursor_walk_and_counts():
+    course = Course.objects.first()
+    users = [get_user_model().objects.create(username=f"critic{index}") for index in range(15)]
+    Review.objects.bulk_create(Review(course=course, user=user, rating=4) for user in users)
+    client = APIClient()
+
+    ids, pages = _walk(client, f"/api/courses/{course.pk}/reviews/", {"count": "exact"})
+    assert ids == list(Review.objects.filter(course=course).order_by("-created_at", "-pk").values_list("id", flat=True))
+    assert pages[0]["count"] == len(ids)
+    assert client.get(f"/api/courses/{course.pk}/reviews/", {"cursor": "", "count": "approx"}).json()["count"] == len(ids)
+
+
+@pytest.mark.django_db
+def test_invalid_or_foreign_cursor_is_rejected():
+    client = APIClient()
+    assert client.get("/api/courses/", {"cursor": "not-a-cursor"}).status_code == 404
+
+    first = client.get("/api/courses/", {"cursor": "", "ordering": "title"}).json()
+    cursor = first["next"].split("cursor=")[1].split("&")[0]
+    assert client.get("/api/courses/", {"cursor": cursor}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_page_number_mode_is_default():
+    payload = APIClient().get("/api/courses/", {"page": 2}).json()
+    assert {"count", "next", "previous", "results"} <= payload.keys()
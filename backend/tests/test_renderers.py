@@ -0,0 +1,66 @@
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from courses.models import Course
+
+
+def test_renderer_handles_the_types_drf_encodes():
+    data = {
+        "price": Decimal("19.90"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "label": gettext_lazy("Courses"),
+        1: "numeric key",
+        "text": "line\u2028separator",
+    }
+
+    rendered = json.loads(FastJSONRenderer().render(data))
+
+    assert rendered == {
+        "price": 19.9,
+        "id": "12345678-1234-5678-1234-567812345678",
+        "at": "2026-01-02T03:04:05Z",
+        "label": "Courses",
+        "1": "numeric key",
+        "text": "line\u2028separator",
+    }
+    assert b"line\\u2028separator" in FastJSONRenderer().render(data)
+    assert json.loads(JSONRenderer().render(data)) == rendered
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_renderer_indents_on_request():
+    rendered = FastJSONRenderer().render({"a": [1]}, "application/json; indent=4")
+
+    assert rendered.decode() == '{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_parser_matches_json_and_rejects_malformed_bodies():
+    assert FastJSONParser().parse(io.BytesIO('{"text": "خوب", "rating": 5}'.encode())) == {"text": "خوب", "rating": 5}
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"rating": NaN}'))
+
+
+@pytest.mark.django_db
+def test_api_responses_use_the_fast_renderer():
+    course = Course.objects.first()
+    client = APIClient()
+
+    response = client.get(f"/api/courses/{course.pk}/")
+    malformed = client.post("/api/token/", b"{not json", content_type="application/json")
+
+    assert response["Content-Type"] == "application/json"
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.json()["price_amount"] == f"{course.price_amount:.2f}"
+    assert malformed.status_code == 400
@@ -0,0 +1,75 @@
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api import db
+from courses.models import Course
+
+# The test database stands in for a replica so routed queries still work.
+REPLICA = {"ALIASES": ["default"], "MAX_LAG": 5, "LAG_CHECK_INTERVAL": 0, "PIN_SECONDS": 5}
+
+
+@pytest.fixture(autouse=True)
+def reset_replica_health():
+    db.replica_health.reset()
+    yield
+    db.replica_health.reset()
+
+
+@pytest.fixture
+def routed_reads(monkeypatch):
+    aliases = []
+    original = db.ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        alias = original(self, model, **hints)
+        aliases.append(alias)
+        return alias
+
+    monkeypatch.setattr(db.ReplicaRouter, "db_for_read", record)
+    return aliases
+
+
+def test_router_reads_from_the_chosen_alias_and_writes_to_default():
+    router = db.ReplicaRouter()
+
+    with db.read_from("replica_0"):
+        assert router.db_for_read(Course) == "replica_0"
+        assert router.db_for_write(Course) == "default"
+    assert router.db_for_read(Course) is None
+
+
+@override_settings(REPLICA_ROUTING=REPLICA)
+def test_lagging_replicas_are_skipped(monkeypatch):
+    monkeypatch.setattr(db, "replica_lag", lambda alias: 30.0)
+    assert db.choose_replica() is None
+
+    monkeypatch.setattr(db, "replica_lag", lambda alias: 0.5)
+    assert db.choose_replica() == "default"
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_ROUTING=REPLICA)
+def test_catalog_gets_use_the_replica(routed_reads):
+    assert APIClient().get("/api/courses/").status_code == 200
+
+    assert routed_reads and set(routed_reads) == {"default"}
+
+
+@pytest.mark.django_db
+def test_reads_stay_on_the_primary_without_replicas(routed_reads):
+    APIClient().get("/api/courses/")
+
+    assert set(routed_reads) == {None}
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_ROUTING=REPLICA)
+def test_catalog_writes_pin_reads_to_the_primary(routed_reads, django_capture_on_commit_callbacks):
+    course = Course.objects.first()
+    with django_capture_on_commit_callbacks(execute=True):
+        course.save()
+
+    assert db.primary_pinned()
+    APIClient().get("/api/courses/")
+    assert set(routed_reads) == {None}
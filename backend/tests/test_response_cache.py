@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import Course, Publisher
+
+
+def _get_counting_queries(client, path, **extra):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(path, **extra)
+    return response, len(queries)
+
+
+@pytest.mark.django_db
+def test_anonymous_course_list_is_served_from_cache():
+    client = APIClient()
+    first, _ = _get_counting_queries(client, "/api/courses/", data={"ordering": "title", "language": "en"})
+    second, queries = _get_counting_queries(client, "/api/courses/?language=en&ordering=title")
+
+    assert first.status_code == second.status_code == 200
+    assert queries == 0
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+
+@pytest.mark.django_db
+def test_etag_revalidation_returns_not_modified():
+    client = APIClient()
+    course = Course.objects.first()
+    etag = client.get(f"/api/courses/{course.id}/")["ETag"]
+
+    response, queries = _get_counting_queries(client, f"/api/courses/{course.id}/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert queries == 0
+
+
+@pytest.mark.django_db
+def test_catalog_writes_invalidate_cached_responses():
+    client = APIClient()
+    course = Course.objects.first()
+    before = client.get(f"/api/courses/{course.id}/")
+
+    Publisher.objects.filter(pk=course.publisher_id).first().save()
+    course.title = "Renamed for cache test"
+    course.save()
+    after = client.get(f"/api/courses/{course.id}/", HTTP_IF_NONE_MATCH=before["ETag"])
+
+    assert after.status_code == 200
+    assert after.json()["title"] == "Renamed for cache test"
+    assert after["ETag"] != before["ETag"]
+
+
+@pytest.mark.django_db
+def test_authenticated_requests_bypass_the_cache():
+    user = get_user_model().objects.create_user(username="cache-reader", email="cache@example.com", password="pass12345")
+    client = APIClient()
+    client.get("/api/courses/")
+    client.force_authenticate(user)
+
+    response, queries = _get_counting_queries(client, "/api/courses/")
+
+    assert response.status_code == 200
+    assert "ETag" not in response
+    assert queries > 0
+
+
+@pytest.mark.django_db
+def test_etag_describes_the_body_not_the_cache_key():
+    from api.cache import CATALOG, body_etag, bump_generation
+
+    client = APIClient()
+    course = Course.objects.first()
+    first = client.get(f"/api/courses/{course.id}/")
+
+    # A new generation with the same content: the key changes, the body does not.
+    bump_generation(CATALOG)
+    second = client.get(f"/api/courses/{course.id}/")
+    revalidated = client.get(f"/api/courses/{course.id}/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert first["ETag"] == body_etag(first.content) == second["ETag"]
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.django_db
+def test_evicted_generation_does_not_revive_older_entries():
+    from api.cache import CATALOG, _generation_key, bump_generation, response_cache
+
+    client = APIClient()
+    stale = client.get("/api/courses/").content
+    bump_generation(CATALOG)
+    Course.objects.update(title="Renamed")
+    fresh = client.get("/api/courses/").content
+
+    # The counter is evicted while entries cached under it are still live.
+    response_cache().delete(_generation_key(CATALOG))
+    after_read = client.get("/api/courses/").content
+    response_cache().delete(_generation_key(CATALOG))
+    bump_generation(CATALOG)
+    after_bump = client.get("/api/courses/").content
+
+    assert fresh != stale
+    assert after_read != stale
+    assert after_bump != stale
@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from reviews.aggregates import apply_rating_change
+from reviews.models import Review
+from reviews.views import CourseReviewViewSet
+
+User = get_user_model()
+
+
+@pytest.fixture
+def course():
+    return Course.objects.filter(reviews__isnull=True).first()
+
+
+def _client_for(username):
+    user = User.objects.create_user(username=username, password="secret123")
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_review_writes_maintain_course_aggregates(course):
+    first = _client_for("reader1")
+    second = _client_for("reader2")
+    url = f"/api/courses/{course.pk}/reviews/"
+
+    assert first.post(url, {"rating": 5, "text": "Great"}, format="json").status_code == 201
+    response = second.post(url, {"rating": 2}, format="json")
+    assert response.status_code == 201
+    course.refresh_from_db()
+    assert (course.rating_count, course.rating_sum, course.rating_avg) == (2, 7, Decimal("3.50"))
+    assert course.rating_histogram == [0, 1, 0, 0, 1]
+
+    review_url = f"{url}{response.json()['id']}/"
+    assert second.patch(review_url, {"rating": 4}, format="json").status_code == 200
+    course.refresh_from_db()
+    assert course.rating_histogram == [0, 0, 0, 1, 1]
+    assert course.rating_avg == Decimal("4.50")
+
+    assert second.delete(review_url).status_code == 204
+    course.refresh_from_db()
+    assert (course.rating_count, course.rating_sum, course.rating_avg) == (1, 5, Decimal("5.00"))
+
+
+@pytest.mark.django_db
+def test_review_update_uses_the_stored_rating_not_the_stale_instance(course, monkeypatch):
+    client = _client_for("racer")
+    url = f"/api/courses/{course.pk}/reviews/"
+    review_id = client.post(url, {"rating": 5}, format="json").json()["id"]
+    get_object = CourseReviewViewSet.get_object
+
+    def stale_get_object(view):
+        # A concurrent edit lands between this request's read and its write.
+        review = get_object(view)
+        Review.objects.filter(pk=review.pk).update(rating=2)
+        apply_rating_change(course.pk, added=2, removed=5)
+        return review
+
+    monkeypatch.setattr(CourseReviewViewSet, "get_object", stale_get_object)
+    assert client.patch(f"{url}{review_id}/", {"rating": 4}, format="json").status_code == 200
+
+    course.refresh_from_db()
+    assert (course.rating_count, course.rating_sum) == (1, 4)
+    assert course.rating_histogram == [0, 0, 0, 1, 0]
+
+
+@pytest.mark.django_db
+def test_recompute_command_repairs_drift(course):
+    Review.objects.create(course=course, user=User.objects.create_user(username="ghost"), rating=3)
+
+    with pytest.raises(CommandError):
+        call_command("recompute_course_aggregates", "--check")
+
+    call_command("recompute_course_aggregates", "--batch-size", "2")
+    course.refresh_from_db()
+    assert (course.rating_count, course.rating_avg) == (1, Decimal("3.00"))
+    call_command("recompute_course_aggregates", "--check")
+
+
+@pytest.mark.django_db
+def test_course_list_orders_by_rating_without_aggregate_queries(django_assert_max_num_queries):
+    with django_assert_max_num_queries(2):
+        response = APIClient().get("/api/courses/", {"ordering": "-rating_avg"})
+    ratings = [Decimal(item["rating_avg"]) for item in response.json()["results"]]
+    assert ratings == sorted(ratings, reverse=True)
@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import RoleAssignment, UserProfile
+
+
+def _login(client, username="dev", password="dev123456"):
+    tokens = client.post("/api/token/", {"username": username, "password": password}, format="json").json()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    return tokens
+
+
+@pytest.mark.django_db
+def test_access_token_carries_role_claims():
+    tokens = _login(APIClient())
+
+    access = AccessToken(tokens["access"])
+
+    assert access["active_role"] == UserProfile.objects.get(user__username="dev").active_role
+    assert access["roles"] == list(RoleAssignment.objects.filter(user__username="dev").values_list("role", flat=True))
+
+
+@pytest.mark.django_db
+def test_role_list_is_cached_until_assignments_change():
+    client = APIClient()
+    _login(client)
+    client.get("/api/auth/roles/")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/auth/roles/")
+    assert response.json()["active_role"] == UserProfile.objects.get(user__username="dev").active_role
+    assert not [query for query in queries if "users_roleassignment" in query["sql"]]
+
+    RoleAssignment.objects.filter(user__username="dev", role="creator").delete()
+    assert "creator" not in client.get("/api/auth/roles/").json()["available_roles"]
+
+
+@pytest.mark.django_db
+def test_role_activation_returns_refreshed_claims():
+    user = get_user_model().objects.create_user(username="role-switcher", password="secret123")
+    RoleAssignment.objects.create(user=user, role="creator")
+    client = APIClient()
+    _login(client, "role-switcher", "secret123")
+
+    response = client.post("/api/auth/roles/activate/", {"role": "creator"}, format="json")
+
+    assert response.status_code == 200
+    assert AccessToken(response.json()["access"])["active_role"] == "creator"
+    assert client.get("/api/auth/roles/").json()["active_role"] == "creator"
+    assert client.post("/api/auth/roles/activate/", {"role": "admin"}, format="json").status_code == 400
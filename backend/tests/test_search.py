@@ -0,0 +1,82 @@
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from courses.models import Course, Publisher, Teacher
+from search.models import SearchPosting
+from search.text import tokenize
+
+
+def _create_course(title, language="en", description="", publisher=None, teacher=None):
+    publisher = publisher or Publisher.objects.create(name="Search Guild", slug=f"search-guild-{Publisher.objects.count()}")
+    teacher = teacher or Teacher.objects.create(name="Search Mentor")
+    return Course.objects.create(
+        title=title,
+        description=description,
+        price_amount=10,
+        language=language,
+        publisher=publisher,
+        teacher=teacher,
+    )
+
+
+def _search_titles(query):
+    response = APIClient().get("/api/courses/", {"search": query})
+    assert response.status_code == 200
+    return [item["title"] for item in response.json()["results"]]
+
+
+def test_tokenize_folds_arabic_and_persian_variants():
+    assert tokenize("كتاب عربي") == tokenize("کتاب عربی")
+    assert tokenize("کتاب‌های ۱۲") == ["کتاب", "12"]
+    assert tokenize("The Spice of Life") == ["spice", "life"]
+
+
+@pytest.mark.django_db
+def test_seeded_courses_are_indexed():
+    assert SearchPosting.objects.filter(course=Course.objects.first()).exists()
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first():
+    _create_course("Quasar Basics", description="An introduction.")
+    _create_course("Desert Cooking", description="Mentions quasar once.")
+
+    assert _search_titles("quasar")[:2] == ["Quasar Basics", "Desert Cooking"]
+    assert _search_titles("quas")[:2] == ["Quasar Basics", "Desert Cooking"]
+    assert _search_titles("quasar cooking") == ["Desert Cooking"]
+
+
+@pytest.mark.django_db
+def test_search_matches_arabic_without_article():
+    _create_course("الصحراء الكبرى", language="ar")
+
+    assert _search_titles("صحراء") == ["الصحراء الكبرى"]
+
+
+@pytest.mark.django_db
+def test_index_follows_course_and_teacher_changes():
+    course = _create_course("Zephyr Flight")
+    assert _search_titles("zephyr") == ["Zephyr Flight"]
+
+    course.title = "Ornithopter Flight"
+    course.save()
+    assert _search_titles("zephyr") == []
+
+    course.teacher.name = "Liet Kynesmith"
+    course.teacher.save()
+    assert _search_titles("kynesmith") == ["Ornithopter Flight"]
+
+    course.delete()
+    assert _search_titles("kynesmith") == []
+
+
+@pytest.mark.django_db
+def test_database_backend_fallback():
+    _create_course("Quasar Basics")
+
+    with override_settings(SEARCH_BACKEND="database"):
+        assert _search_titles("asar bas") == ["Quasar Basics"]
+    # Only stopwords: the index has nothing to rank, so icontains takes over.
+    _create_course("Gathering Storms")
+    assert "Gathering Storms" in _search_titles("the")
@@ -0,0 +1,45 @@
+import pytest
+from django.core.management.base import CommandError
+from django.http import JsonResponse
+from django.urls import path
+
+from api.management.commands import serve
+
+# Stands in for the project URLconf when the health check must fail.
+urlpatterns = [path("api/healthz/", lambda request: JsonResponse({"ok": False}, status=503), name="healthz")]
+
+
+def test_default_workers_follow_web_concurrency(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert serve.default_workers() == 3
+
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    monkeypatch.setattr(serve.os, "cpu_count", lambda: 4)
+    assert serve.default_workers() == 9
+
+
+def test_health_check_calls_healthz():
+    serve.check_health()
+
+
+def test_health_check_fails_on_error_status(settings):
+    settings.ROOT_URLCONF = __name__
+
+    with pytest.raises(CommandError):
+        serve.check_health()
+
+
+def test_several_workers_refuse_a_process_local_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "serve"}}
+
+    serve.check_shared_cache(1)
+    with pytest.raises(CommandError, match="DJANGO_CACHE_BACKEND"):
+        serve.check_shared_cache(3)
+
+
+def test_several_workers_accept_a_shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}
+    }
+
+    serve.check_shared_cache(3)
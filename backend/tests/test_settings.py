@@ -0,0 +1,16 @@
+import runpy
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+
+# The settings module runs again in a fresh namespace; the loaded one is left alone.
+@pytest.mark.filterwarnings("ignore:'api.settings' found in sys.modules")
+def test_connection_pool_requires_psycopg_pool(monkeypatch):
+    monkeypatch.setenv("DJANGO_DB_ENGINE", "django.db.backends.postgresql")
+    monkeypatch.setenv("DJANGO_DB_POOL", "1")
+    monkeypatch.setitem(sys.modules, "psycopg_pool", None)
+
+    with pytest.raises(ImproperlyConfigured, match="psycopg\\[binary,pool\\]"):
+        runpy.run_module("api.settings")
@@ -0,0 +1,82 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from metrics.testing import query_budget
+from reviews.models import Review
+
+CARD_FIELDS = "id,title,thumbnail_url,price_amount,rating_avg"
+
+
+@pytest.mark.django_db
+def test_course_list_returns_and_loads_only_the_selected_fields():
+    with query_budget(2) as captured:
+        response = APIClient().get("/api/courses/", {"fields": CARD_FIELDS})
+
+    assert response.status_code == 200
+    assert all(set(item) == set(CARD_FIELDS.split(",")) for item in response.json()["results"])
+    page_query = captured[-1]["sql"]
+    assert '"description"' not in page_query
+    assert "courses_publisher" not in page_query
+
+
+@pytest.mark.django_db
+def test_relations_render_as_keys_unless_expanded():
+    course = Course.objects.select_related("publisher").first()
+    client = APIClient()
+
+    flat = client.get(f"/api/courses/{course.pk}/", {"fields": "title,publisher"}).json()
+    expanded = client.get(f"/api/courses/{course.pk}/", {"fields": "title", "expand": "publisher"}).json()
+
+    assert flat == {"title": course.title, "publisher": course.publisher_id}
+    assert expanded["publisher"]["slug"] == course.publisher.slug
+    assert set(expanded) == {"title", "publisher"}
+
+
+@pytest.mark.django_db
+def test_cursor_walk_with_sparse_fields_needs_no_deferred_loads():
+    client = APIClient()
+    params = {"fields": "id,title", "ordering": "-rating_avg", "cursor": ""}
+
+    with query_budget(1):
+        first = client.get("/api/courses/", params).json()
+    second = client.get(first["next"]).json()
+
+    ids = [item["id"] for item in first["results"] + second["results"]]
+    expected = Course.objects.order_by("-rating_avg", "-pk").values_list("pk", flat=True)[: len(ids)]
+    assert ids == list(expected)
+
+
+@pytest.mark.django_db
+def test_reviews_and_lessons_accept_sparse_fields():
+    course = Course.objects.first()
+    user = get_user_model().objects.create(username="sparse-critic")
+    Review.objects.create(course=course, user=user, rating=4, text="Long enough to matter.")
+    client = APIClient()
+
+    reviews = client.get(f"/api/courses/{course.pk}/reviews/", {"fields": "rating,user"}).json()["results"]
+    lessons = client.get("/api/lessons/", {"course": course.pk, "fields": "id,title"}).json()
+
+    assert {"rating": 4, "user": user.pk} in reviews
+    assert lessons and all(set(lesson) == {"id", "title"} for lesson in lessons)
+
+
+@pytest.mark.django_db
+def test_unknown_fields_are_rejected():
+    client = APIClient()
+
+    assert client.get("/api/courses/", {"fields": "title,secret"}).status_code == 400
+    assert client.get("/api/courses/", {"fields": "title", "expand": "title"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_writes_ignore_sparse_fields():
+    course = Course.objects.first()
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create(username="sparse-writer"))
+
+    response = client.post(f"/api/courses/{course.pk}/reviews/?fields=rating", {"rating": 5}, format="json")
+
+    assert response.status_code == 201
+    assert {"id", "course", "user", "rating", "text", "created_at"} == set(response.json())
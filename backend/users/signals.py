@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from authz.roles import invalidate_roles
 from users.models import RoleAssignment, UserProfile
 
 User = get_user_model()
@@ -13,3 +15,13 @@ def create_user_profile(sender, instance: User, created: bool, **kwargs):
         return
     UserProfile.objects.get_or_create(user=instance)
     RoleAssignment.objects.get_or_create(user=instance, role="student")
+
+
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_roles(sender, instance, **kwargs):
+    invalidate_roles(instance.user_id)
+    # Drop again after commit in case a concurrent read cached the old state.
+    transaction.on_commit(lambda: invalidate_roles(instance.user_id))
@@ -3,7 +3,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from users.models import RoleAssignment, UserProfile
+from authz.roles import resolve_roles, role_settings
+from authz.tokens import access_token_for
+from users.models import UserProfile
 from users.serializers import UserSerializer
 
 
@@ -18,9 +20,8 @@ class RoleListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        roles = RoleAssignment.objects.filter(user=request.user).order_by("role").values_list("role", flat=True)
-        return Response({"active_role": profile.active_role, "available_roles": list(roles)})
+        roles = resolve_roles(request, trust_token=False)
+        return Response({"active_role": roles.active_role, "available_roles": list(roles.available_roles)})
 
 
 class RoleActivationView(APIView):
@@ -31,10 +32,14 @@ class RoleActivationView(APIView):
         if not role:
             return Response({"detail": "role is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not RoleAssignment.objects.filter(user=request.user, role=role).exists():
+        if role not in resolve_roles(request, trust_token=False).available_roles:
             return Response({"detail": "role not assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
         profile, _ = UserProfile.objects.get_or_create(user=request.user)
         profile.active_role = role
         profile.save(update_fields=["active_role", "updated_at"])
-        return Response({"active_role": profile.active_role})
+        payload = {"active_role": profile.active_role}
+        if role_settings()["TOKEN_CLAIMS"]:
+            # The caller's token still claims the previous active role.
+            payload["access"] = str(access_token_for(request.user))
+        return Response(payload)